@@ -3,7 +3,7 @@ Backend application package initialization.
 """
 from backend.app.config import get_setting
 from backend.app.db import init_db
-from backend.app.utils import logger
+from backend.app.utils import configure_logging, logger
 
 __all__ = [
     "init_app"
@@ -12,10 +12,15 @@ __all__ = [
 def init_app() -> None:
     """
     Initialize the application.
+    
+    Importing the package does no setup of its own; this reads the settings,
+    starts logging and brings the database schema up to date.
     """
+    configure_logging()
+    
     # Log application start
     environment = get_setting("ENVIRONMENT", "development")
-    logger.info(f"Starting application in {environment} mode")
+    logger.info("Starting application in %s mode", environment)
     
     # Initialize database
     init_db()
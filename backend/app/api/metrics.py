@@ -0,0 +1,108 @@
+"""
+Per-route request metrics.
+
+Requests are labelled by method and route template (``/api/items/{item_id:int}``)
+rather than by raw path, so label cardinality is bounded by the route table.
+Latency is measured until the handler returns; streamed bodies are written
+afterwards and are not included.
+"""
+import threading
+import time
+from typing import Optional
+
+from backend.app.utils.metrics import get_prometheus_client, metrics_enabled
+
+# Methods recorded as-is; anything else is labelled OTHER
+_METHODS = frozenset(["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+
+# Latency buckets from 1ms to 10s
+_DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+
+class RouteMetrics:
+    """Prometheus metrics for API requests."""
+    
+    def __init__(self) -> None:
+        prometheus_client = get_prometheus_client()
+        self.requests = prometheus_client.Counter(
+            "http_requests",
+            "Requests handled, by route and status code",
+            ["method", "route", "status"],
+        )
+        self.duration = prometheus_client.Histogram(
+            "http_request_duration_seconds",
+            "Time until the handler returned a response",
+            ["method", "route"],
+            buckets=_DURATION_BUCKETS,
+        )
+        self.in_progress = prometheus_client.Gauge(
+            "http_requests_in_progress",
+            "Requests currently being handled",
+            ["method", "route"],
+            multiprocess_mode="livesum",
+        )
+        
+    def start(self, method: str, route: str) -> float:
+        """
+        Record the start of a request.
+        
+        Args:
+            method: HTTP method
+            route: Route template, or ``unmatched``
+            
+        Returns:
+            float: Start time, to pass to ``finish``
+        """
+        self.in_progress.labels(_method_label(method), route).inc()
+        return time.perf_counter()
+        
+    def finish(self, method: str, route: str, status: int, start: float) -> None:
+        """
+        Record the end of a request.
+        
+        Args:
+            method: HTTP method
+            route: Route template, or ``unmatched``
+            status: Response status code
+            start: Value returned by ``start``
+        """
+        method = _method_label(method)
+        self.duration.labels(method, route).observe(time.perf_counter() - start)
+        self.requests.labels(method, route, str(status)).inc()
+        self.in_progress.labels(method, route).dec()
+
+def _method_label(method: str) -> str:
+    """
+    Bound the method label to the standard HTTP methods.
+    
+    Args:
+        method: HTTP method
+        
+    Returns:
+        str: Method, or ``OTHER``
+    """
+    return method if method in _METHODS else "OTHER"
+
+# Created on first use; None when metrics are disabled
+_route_metrics: Optional[RouteMetrics] = None
+_resolved = False
+_lock = threading.Lock()
+
+def get_route_metrics() -> Optional[RouteMetrics]:
+    """
+    Get the route metrics, if enabled.
+    
+    Returns:
+        Optional[RouteMetrics]: Metrics, or None when metrics are disabled
+    """
+    global _route_metrics, _resolved
+    
+    if not _resolved:
+        with _lock:
+            if not _resolved:
+                _route_metrics = RouteMetrics() if metrics_enabled() else None
+                _resolved = True
+                
+    return _route_metrics
+
@@ -0,0 +1,155 @@
+"""
+Keyset pagination helpers.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from backend.app.api.router import MAX_INT
+from backend.app.config import get_setting
+
+def _encode(payload: Dict[str, Any]) -> str:
+    """
+    Encode a cursor payload as URL-safe base64 JSON.
+    
+    Args:
+        payload: Cursor fields
+        
+    Returns:
+        str: Opaque cursor
+    """
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor payload.
+    
+    Args:
+        cursor: Cursor returned by ``_encode``
+        
+    Returns:
+        Dict[str, Any]: Cursor fields
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+        
+    if not isinstance(payload, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return payload
+
+def _is_id(value: Any) -> bool:
+    """
+    Check that a decoded cursor field is a row ID.
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_INT
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the last ID of a page as an opaque cursor.
+    
+    Args:
+        last_id: ID of the last row on the page
+        
+    Returns:
+        str: Opaque cursor
+    """
+    return _encode({"id": last_id})
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode an opaque cursor.
+    
+    Args:
+        cursor: Cursor returned by ``encode_cursor``
+        
+    Returns:
+        int: ID after which the next page starts
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    last_id = _decode(cursor).get("id")
+    if not _is_id(last_id):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return last_id
+
+def encode_search_cursor(rank: float, last_id: int) -> str:
+    """
+    Encode the position of the last hit on a page of search results.
+    
+    Args:
+        rank: Rank of the last hit
+        last_id: ID of the last hit
+        
+    Returns:
+        str: Opaque cursor
+    """
+    # repr round-trips through JSON, so the rank compares equal when decoded
+    return _encode({"rank": rank, "id": last_id})
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a search cursor.
+    
+    Args:
+        cursor: Cursor returned by ``encode_search_cursor``
+        
+    Returns:
+        Tuple[float, int]: (rank, ID) after which the next page starts
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    payload = _decode(cursor)
+    rank, last_id = payload.get("rank"), payload.get("id")
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool) or not _is_id(last_id):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return float(rank), last_id
+
+def parse_limit(params: Dict[str, str]) -> int:
+    """
+    Parse the ``limit`` query parameter.
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        int: Page size, ``API_PAGE_SIZE`` if not given
+        
+    Raises:
+        ValueError: If the limit is not a number or out of range
+    """
+    default_limit = int(get_setting("API_PAGE_SIZE", 50))
+    max_limit = int(get_setting("API_MAX_PAGE_SIZE", 1000))
+    
+    try:
+        limit = int(params.get("limit", default_limit))
+    except ValueError as e:
+        raise ValueError(f"Invalid limit: {params['limit']}") from e
+    if not 1 <= limit <= max_limit:
+        raise ValueError(f"Limit must be between 1 and {max_limit}")
+    return limit
+
+def parse_page_params(params: Dict[str, str]) -> Tuple[int, Optional[int]]:
+    """
+    Parse ``limit`` and ``after`` query parameters.
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        Tuple[int, Optional[int]]: (limit, ID to start after)
+        
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    after = params.get("after")
+    return parse_limit(params), decode_cursor(after) if after else None
+
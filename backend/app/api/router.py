@@ -0,0 +1,163 @@
+"""
+Compiled route table for the API.
+
+Routes are declared as path templates such as ``/api/items/{item_id:int}``
+with a table of handlers per method, and compiled once into a segment trie.
+Lookup is O(path segments), and unknown paths, unsupported methods and
+malformed parameters resolve to 404/405 results without raising.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Largest integer SQLite stores; larger IDs cannot exist and overflow when bound
+MAX_INT = 2**63 - 1
+
+def parse_int(value: str) -> Optional[int]:
+    """
+    Parse a non-negative integer path or query parameter.
+    
+    Args:
+        value: Parameter text
+        
+    Returns:
+        Optional[int]: Integer, or None if the text is not ASCII digits or
+        the number is larger than ``MAX_INT``
+    """
+    if not (value.isascii() and value.isdigit()):
+        return None
+    number = int(value)
+    return number if number <= MAX_INT else None
+
+# Parameter converters by type name; each returns None for invalid input
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "int": parse_int,
+    "str": lambda value: value or None,
+}
+
+class RouteMatch(NamedTuple):
+    """Result of a route lookup."""
+    
+    status: int
+    template: Optional[str] = None
+    handler: Optional[Callable[..., Dict[str, Any]]] = None
+    params: Dict[str, Any] = {}
+    allowed: Tuple[str, ...] = ()
+
+_NOT_FOUND = RouteMatch(404)
+_new_match = tuple.__new__
+
+class _Node:
+    """Trie node for one path segment."""
+    
+    __slots__ = (
+        "static", "param", "param_name", "converter", "template", "methods", "not_allowed"
+    )
+    
+    def __init__(self) -> None:
+        self.static: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.param_name: Optional[str] = None
+        self.converter: Optional[Callable[[str], Any]] = None
+        self.template: Optional[str] = None
+        self.methods: Dict[str, Callable[..., Dict[str, Any]]] = {}
+        self.not_allowed: Optional[RouteMatch] = None
+
+class Router:
+    """Segment trie mapping path templates to per-method handlers."""
+    
+    def __init__(self) -> None:
+        self._root = _Node()
+        self.templates: List[str] = []
+        
+        # Prebuilt results for parameterless routes, by path and method
+        self._static_matches: Dict[str, Dict[str, RouteMatch]] = {}
+        self._static_nodes: Dict[str, _Node] = {}
+        
+    def add(self, template: str, methods: Dict[str, Callable[..., Dict[str, Any]]]) -> None:
+        """
+        Register a route.
+        
+        Args:
+            template: Path template, e.g. ``/api/items/{item_id:int}``
+            methods: Handler per HTTP method
+            
+        Raises:
+            ValueError: If the template is invalid or conflicts with another route
+        """
+        node = self._root
+        has_params = False
+        for segment in template.strip("/").split("/"):
+            if segment.startswith("{") and segment.endswith("}"):
+                has_params = True
+                name, _, type_name = segment[1:-1].partition(":")
+                converter = _CONVERTERS.get(type_name or "str")
+                if not name or converter is None:
+                    raise ValueError(f"Invalid route parameter {segment} in {template}")
+                    
+                if node.param is None:
+                    node.param = _Node()
+                    node.param_name = name
+                    node.converter = converter
+                elif node.param_name != name or node.converter is not converter:
+                    raise ValueError(f"Conflicting route parameter {segment} in {template}")
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+                
+        if node.template is not None:
+            raise ValueError(f"Duplicate route: {template}")
+            
+        node.template = template
+        node.methods = {method.upper(): handler for method, handler in methods.items()}
+        node.not_allowed = RouteMatch(405, template, allowed=tuple(node.methods))
+        self.templates.append(template)
+        
+        if not has_params:
+            path = "/" + template.strip("/")
+            self._static_nodes[path] = node
+            self._static_matches[path] = {
+                method: RouteMatch(200, template, handler, {})
+                for method, handler in node.methods.items()
+            }
+            
+    def match(self, method: str, path: str) -> RouteMatch:
+        """
+        Look up the handler for a request.
+        
+        Args:
+            method: HTTP method
+            path: Request path, without the query string
+            
+        Returns:
+            RouteMatch: Status 200 with the handler and converted path
+                parameters, 404 if no route matches, or 405 with the allowed methods
+        """
+        # Parameterless routes resolve with a single dict lookup
+        static = self._static_matches.get(path)
+        if static is not None:
+            return static.get(method) or self._static_nodes[path].not_allowed
+            
+        node = self._root
+        params: Dict[str, Any] = {}
+        
+        for segment in path.strip("/").split("/"):
+            child = node.static.get(segment)
+            if child is None:
+                child = node.param
+                if child is None:
+                    return _NOT_FOUND
+                value = node.converter(segment)
+                if value is None:
+                    return _NOT_FOUND
+                params[node.param_name] = value
+            node = child
+            
+        if node.template is None:
+            return _NOT_FOUND
+            
+        handler = node.methods.get(method)
+        if handler is None:
+            return node.not_allowed
+            
+        # tuple.__new__ skips the generated NamedTuple constructor on the hot path
+        return _new_match(RouteMatch, (200, node.template, handler, params, ()))
+
@@ -2,19 +2,83 @@
 API routes for the backend application.
 """
 import json
-from typing import Dict, List, Optional, Any, Union
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+from urllib.parse import parse_qsl
 
+from backend.app.api.metrics import get_route_metrics
+from backend.app.api.pagination import (
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+    parse_limit,
+    parse_page_params
+)
+from backend.app.api.router import Router, parse_int
+from backend.app.api.serializers import user_serializer, item_serializer, search_hit_serializer
+from backend.app.api.streaming import is_streaming
+from backend.app.db import ConstraintViolation, get_slow_queries, get_slow_query_log, transaction
 from backend.app.models import User, Item
-from backend.app.utils import logger, validate_api_token
+from backend.app.utils import logger, metrics_enabled, render_metrics
 from backend.app.config import get_setting
 
-# API token for authentication
-API_TOKEN = get_setting("API_TOKEN")
-
 def handle_request(method: str, path: str, headers: Dict[str, str], body: Optional[str] = None) -> Dict[str, Any]:
     """
     Handle an API request.
     
+    Args:
+        method: HTTP method
+        path: Request path
+        headers: Request headers
+        body: Request body
+        
+    Returns:
+        Dict[str, Any]: Response data. ``body`` is a string, or an iterable
+            of encoded chunks for streaming responses.
+    """
+    return _observed(method, path, _dispatch, headers, body)
+
+def _observed(
+    method: str,
+    path: str,
+    dispatch: Callable[..., Dict[str, Any]],
+    *args: Any,
+) -> Dict[str, Any]:
+    """
+    Call ``dispatch(method, path, *args)``, recording route metrics if enabled.
+    
+    Args:
+        method: HTTP method
+        path: Request path
+        dispatch: Function producing the response
+        *args: Further arguments for ``dispatch``
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    metrics = get_route_metrics()
+    if metrics is None:
+        return dispatch(method, path, *args)
+        
+    route = router.match(method, path.partition("?")[0]).template or "unmatched"
+    start = metrics.start(method, route)
+    status = 500
+    try:
+        response = dispatch(method, path, *args)
+        status = response["status"]
+        return response
+    finally:
+        metrics.finish(method, route, status, start)
+
+def _dispatch(
+    method: str,
+    path: str,
+    headers: Dict[str, str],
+    body: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Authenticate, parse and route a request.
+    
     Args:
         method: HTTP method
         path: Request path
@@ -34,7 +98,7 @@ def handle_request(method: str, path: str, headers: Dict[str, str], body: Option
         }
         
     token = auth_header.replace("Bearer ", "")
-    if token != API_TOKEN:
+    if token != get_setting("API_TOKEN"):
         return {
             "status": 401,
             "content_type": "application/json",
@@ -52,57 +116,272 @@ def handle_request(method: str, path: str, headers: Dict[str, str], body: Option
                 "content_type": "application/json",
                 "body": json.dumps({"error": "Invalid JSON"})
             }
+            
+    return _route(method, path, data)
+
+def _route(method: str, path: str, data: Any) -> Dict[str, Any]:
+    """
+    Route an authenticated request with a parsed body to its handler.
+    
+    Args:
+        method: HTTP method
+        path: Request path, with the query string
+        data: Request data
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    # Split query string
+    path, _, query_string = path.partition("?")
+    params = dict(parse_qsl(query_string))
     
     # Route request
+    match = router.match(method, path)
+    if match.status == 404:
+        return {
+            "status": 404,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Not found"})
+        }
+    elif match.status == 405:
+        return {
+            "status": 405,
+            "content_type": "application/json",
+            "headers": {"Allow": ", ".join(match.allowed)},
+            "body": json.dumps({"error": "Method not allowed"})
+        }
+        
     try:
-        if path == "/api/users":
-            return handle_users(method, data)
-        elif path.startswith("/api/users/"):
-            user_id = int(path.split("/")[-1])
-            return handle_user(method, user_id, data)
-        elif path == "/api/items":
-            return handle_items(method, data)
-        elif path.startswith("/api/items/"):
-            item_id = int(path.split("/")[-1])
-            return handle_item(method, item_id, data)
-        elif path == "/api/health":
-            return {
-                "status": 200,
-                "content_type": "application/json",
-                "body": json.dumps({"status": "ok"})
-            }
-        else:
-            return {
-                "status": 404,
-                "content_type": "application/json",
-                "body": json.dumps({"error": "Not found"})
-            }
+        return match.handler(method, data=data, params=params, **match.params)
     except Exception as e:
-        logger.exception(f"Error handling request: {e}")
+        logger.exception("Error handling request: %s", e)
         return {
             "status": 500,
             "content_type": "application/json",
             "body": json.dumps({"error": "Internal server error"})
         }
 
-def handle_users(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
+def handle_health(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/health.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": json.dumps({"status": "ok"})
+    }
+
+def handle_metrics(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/metrics.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters
+        
+    Returns:
+        Dict[str, Any]: Response data with metrics in the Prometheus text format
+    """
+    if not metrics_enabled():
+        return {
+            "status": 404,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Metrics are disabled"})
+        }
+        
+    body, content_type = render_metrics()
+    return {
+        "status": 200,
+        "content_type": content_type,
+        "body": body
+    }
+
+def handle_slow_queries(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/slow-queries.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters (``limit``, ``full_scans=1``)
+        
+    Returns:
+        Dict[str, Any]: Response data with recent slow queries, newest first
+    """
+    if get_slow_query_log() is None:
+        return {
+            "status": 404,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Slow query log is disabled"})
+        }
+        
+    params = params or {}
+    try:
+        limit = int(params["limit"]) if "limit" in params else None
+    except ValueError:
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": f"Invalid limit: {params['limit']}"})
+        }
+        
+    full_scans_only = params.get("full_scans", "").lower() in ("1", "true", "yes")
+    records = get_slow_queries(limit, full_scans_only)
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": json.dumps({"data": [record.to_dict() for record in records]})
+    }
+
+def _parse_stats_range(params: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Parse the ``since`` and ``until`` days of a stats request.
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        Tuple[str, str]: (first day, last day) as ``YYYY-MM-DD``
+        
+    Raises:
+        ValueError: If a day is invalid or the range is too long
+    """
+    max_days = int(get_setting("API_STATS_MAX_DAYS", 366))
+    
+    try:
+        if "until" in params:
+            until = date.fromisoformat(params["until"])
+        else:
+            # Timestamps are stored in UTC
+            until = datetime.now(timezone.utc).date()
+            
+        if "since" in params:
+            since = date.fromisoformat(params["since"])
+        else:
+            since = until - timedelta(days=int(get_setting("API_STATS_DAYS", 30)) - 1)
+    except ValueError as e:
+        raise ValueError(f"Invalid day, expected YYYY-MM-DD: {e}") from e
+        
+    if not 0 <= (until - since).days < max_days:
+        raise ValueError(f"since must not be after until, and at most {max_days} days before it")
+    return since.isoformat(), until.isoformat()
+
+def handle_stats(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/stats.
+    
+    Every number comes from a trigger-maintained rollup table, so the cost
+    does not grow with the number of rows.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters (``user_id``, ``since``, ``until``)
+        
+    Returns:
+        Dict[str, Any]: Response data with user and item counts, items per day
+            and, with ``user_id``, that user's item count
+    """
+    params = params or {}
+    try:
+        since, until = _parse_stats_range(params)
+    except ValueError as e:
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": str(e)})
+        }
+        
+    user_id = params.get("user_id")
+    if user_id is not None and parse_int(user_id) is None:
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": f"Invalid user_id: {user_id}"})
+        }
+        
+    stats: Dict[str, Any] = {
+        "users": User.count(),
+        "items": Item.count(),
+        "daily": [count._asdict() for count in Item.get_daily_counts(since, until)],
+    }
+    
+    if user_id is not None:
+        user = User.get_by_id(int(user_id))
+        if not user:
+            return {
+                "status": 404,
+                "content_type": "application/json",
+                "body": json.dumps({"error": "User not found"})
+            }
+        stats["user"] = {"id": user.id, "items": Item.count_by_user_id(user.id)}
+        
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": json.dumps(stats)
+    }
+
+def handle_users(
+    method: str,
+    data: Dict[str, Any],
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Handle requests to /api/users.
     
     Args:
         method: HTTP method
         data: Request data
+        params: Query parameters
         
     Returns:
         Dict[str, Any]: Response data
     """
     if method == "GET":
-        # Get all users
-        users = User.get_all()
+        # Get a page of users
+        try:
+            limit, after = parse_page_params(params or {})
+        except ValueError as e:
+            return {
+                "status": 400,
+                "content_type": "application/json",
+                "body": json.dumps({"error": str(e)})
+            }
+            
+        users, next_after = User.get_page(limit, after)
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps([user.to_dict() for user in users])
+            "body": user_serializer.encode_page(
+                users,
+                encode_cursor(next_after) if next_after else None
+            )
         }
     elif method == "POST":
         # Create a new user
@@ -113,35 +392,24 @@ def handle_users(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
                 "body": json.dumps({"error": "Missing required fields"})
             }
             
-        # Check if user already exists
-        if User.get_by_username(data["username"]):
-            return {
-                "status": 409,
-                "content_type": "application/json",
-                "body": json.dumps({"error": "Username already exists"})
-            }
-            
-        if User.get_by_email(data["email"]):
-            return {
-                "status": 409,
-                "content_type": "application/json",
-                "body": json.dumps({"error": "Email already exists"})
-            }
+        # Create user; the UNIQUE constraints reject duplicates
+        try:
+            user = User.create(
+                username=data["username"],
+                email=data["email"],
+                password=data["password"],
+                is_active=data.get("is_active", True),
+                is_admin=data.get("is_admin", False)
+            )
+        except ConstraintViolation as e:
+            if e.kind != "unique":
+                raise
+            return _user_conflict(e)
             
-        # Create user
-        user = User(
-            username=data["username"],
-            email=data["email"],
-            password_hash=User.hash_password(data["password"]),
-            is_active=data.get("is_active", True),
-            is_admin=data.get("is_admin", False)
-        )
-        user.save()
-        
         return {
             "status": 201,
             "content_type": "application/json",
-            "body": json.dumps(user.to_dict())
+            "body": user_serializer.encode_object(user)
         }
     else:
         return {
@@ -150,7 +418,66 @@ def handle_users(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
             "body": json.dumps({"error": "Method not allowed"})
         }
 
-def handle_user(method: str, user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+def _user_conflict(error: ConstraintViolation) -> Dict[str, Any]:
+    """
+    Build the response for a user write rejected by a UNIQUE constraint.
+    
+    Args:
+        error: Constraint violation
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    if "username" in error.columns:
+        message = "Username already exists"
+    elif "email" in error.columns:
+        message = "Email already exists"
+    else:
+        message = "User already exists"
+        
+    return {
+        "status": 409,
+        "content_type": "application/json",
+        "body": json.dumps({"error": message})
+    }
+
+def handle_users_export(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/users/export.
+    
+    Streams every user as a JSON array, fetching rows in batches.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters
+        
+    Returns:
+        Dict[str, Any]: Response data with a streaming body
+    """
+    if method != "GET":
+        return {
+            "status": 405,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Method not allowed"})
+        }
+        
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": user_serializer.stream_rows(User.iter_rows())
+    }
+
+def handle_user(
+    method: str,
+    user_id: int,
+    data: Dict[str, Any],
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Handle requests to /api/users/{user_id}.
     
@@ -158,6 +485,7 @@ def handle_user(method: str, user_id: int, data: Dict[str, Any]) -> Dict[str, An
         method: HTTP method
         user_id: User ID
         data: Request data
+        params: Query parameters
         
     Returns:
         Dict[str, Any]: Response data
@@ -176,27 +504,27 @@ def handle_user(method: str, user_id: int, data: Dict[str, Any]) -> Dict[str, An
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps(user.to_dict())
+            "body": user_serializer.encode_object(user)
         }
     elif method == "PUT":
         # Update user
-        if "username" in data:
-            user.username = data["username"]
-        if "email" in data:
-            user.email = data["email"]
-        if "password" in data:
-            user.password_hash = User.hash_password(data["password"])
-        if "is_active" in data:
-            user.is_active = data["is_active"]
-        if "is_admin" in data:
-            user.is_admin = data["is_admin"]
-            
-        user.save()
-        
+        fields = {
+            key: data[key]
+            for key in ("username", "email", "password", "is_active", "is_admin")
+            if key in data
+        }
+        if fields:
+            try:
+                user.update(**fields)
+            except ConstraintViolation as e:
+                if e.kind != "unique":
+                    raise
+                return _user_conflict(e)
+                
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps(user.to_dict())
+            "body": user_serializer.encode_object(user)
         }
     elif method == "DELETE":
         # Delete user
@@ -214,24 +542,41 @@ def handle_user(method: str, user_id: int, data: Dict[str, Any]) -> Dict[str, An
             "body": json.dumps({"error": "Method not allowed"})
         }
 
-def handle_items(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
+def handle_items(
+    method: str,
+    data: Dict[str, Any],
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Handle requests to /api/items.
     
     Args:
         method: HTTP method
         data: Request data
+        params: Query parameters
         
     Returns:
         Dict[str, Any]: Response data
     """
     if method == "GET":
-        # Get all items
-        items = Item.get_all()
+        # Get a page of items
+        try:
+            limit, after = parse_page_params(params or {})
+        except ValueError as e:
+            return {
+                "status": 400,
+                "content_type": "application/json",
+                "body": json.dumps({"error": str(e)})
+            }
+            
+        items, next_after = Item.get_page(limit, after)
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps([item.to_dict() for item in items])
+            "body": item_serializer.encode_page(
+                items,
+                encode_cursor(next_after) if next_after else None
+            )
         }
     elif method == "POST":
         # Create a new item
@@ -242,27 +587,26 @@ def handle_items(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
                 "body": json.dumps({"error": "Missing required fields"})
             }
             
-        # Check if user exists
-        user = User.get_by_id(data["user_id"])
-        if not user:
+        # Create item; the foreign key rejects unknown users
+        try:
+            item = Item.create(
+                name=data["name"],
+                description=data.get("description"),
+                user_id=data["user_id"]
+            )
+        except ConstraintViolation as e:
+            if e.kind != "foreign key":
+                raise
             return {
                 "status": 404,
                 "content_type": "application/json",
                 "body": json.dumps({"error": "User not found"})
             }
             
-        # Create item
-        item = Item(
-            name=data["name"],
-            description=data.get("description"),
-            user_id=data["user_id"]
-        )
-        item.save()
-        
         return {
             "status": 201,
             "content_type": "application/json",
-            "body": json.dumps(item.to_dict())
+            "body": item_serializer.encode_object(item)
         }
     else:
         return {
@@ -271,7 +615,81 @@ def handle_items(method: str, data: Dict[str, Any]) -> Dict[str, Any]:
             "body": json.dumps({"error": "Method not allowed"})
         }
 
-def handle_item(method: str, item_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+def handle_items_export(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/items/export.
+    
+    Streams every item as a JSON array, fetching rows in batches.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters
+        
+    Returns:
+        Dict[str, Any]: Response data with a streaming body
+    """
+    if method != "GET":
+        return {
+            "status": 405,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Method not allowed"})
+        }
+        
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": item_serializer.stream_rows(Item.iter_rows())
+    }
+
+def handle_items_search(
+    method: str,
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/items/search.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters (``q``, ``prefix=1``, ``limit``, ``after``)
+        
+    Returns:
+        Dict[str, Any]: Response data with a page of hits, best match first
+    """
+    params = params or {}
+    try:
+        limit = parse_limit(params)
+        after = decode_search_cursor(params["after"]) if params.get("after") else None
+        prefix = params.get("prefix", "").lower() in ("1", "true", "yes")
+        hits, next_after = Item.search(params.get("q", ""), limit, after, prefix)
+    except ValueError as e:
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": str(e)})
+        }
+        
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": search_hit_serializer.encode_page(
+            hits,
+            encode_search_cursor(*next_after) if next_after else None
+        )
+    }
+
+def handle_item(
+    method: str,
+    item_id: int,
+    data: Dict[str, Any],
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
     """
     Handle requests to /api/items/{item_id}.
     
@@ -279,6 +697,7 @@ def handle_item(method: str, item_id: int, data: Dict[str, Any]) -> Dict[str, An
         method: HTTP method
         item_id: Item ID
         data: Request data
+        params: Query parameters
         
     Returns:
         Dict[str, Any]: Response data
@@ -297,32 +716,31 @@ def handle_item(method: str, item_id: int, data: Dict[str, Any]) -> Dict[str, An
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps(item.to_dict())
+            "body": item_serializer.encode_object(item)
         }
     elif method == "PUT":
-        # Update item
-        if "name" in data:
-            item.name = data["name"]
-        if "description" in data:
-            item.description = data["description"]
-        if "user_id" in data:
-            # Check if user exists
-            user = User.get_by_id(data["user_id"])
-            if not user:
+        # Update item; the foreign key rejects unknown users
+        fields = {
+            key: data[key]
+            for key in ("name", "description", "user_id")
+            if key in data
+        }
+        if fields:
+            try:
+                item.update(**fields)
+            except ConstraintViolation as e:
+                if e.kind != "foreign key":
+                    raise
                 return {
                     "status": 404,
                     "content_type": "application/json",
                     "body": json.dumps({"error": "User not found"})
                 }
                 
-            item.user_id = data["user_id"]
-            
-        item.save()
-        
         return {
             "status": 200,
             "content_type": "application/json",
-            "body": json.dumps(item.to_dict())
+            "body": item_serializer.encode_object(item)
         }
     elif method == "DELETE":
         # Delete item
@@ -340,3 +758,197 @@ def handle_item(method: str, item_id: int, data: Dict[str, Any]) -> Dict[str, An
             "body": json.dumps({"error": "Method not allowed"})
         }
 
+class _BatchAborted(Exception):
+    """Raised to roll back an atomic batch at its first failed operation."""
+    
+    def __init__(self, index: int, response: Dict[str, Any]):
+        super().__init__(index)
+        self.index = index
+        self.response = response
+
+def _parse_operations(data: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Validate the operations of a batch request.
+    
+    Args:
+        data: Request data, an array of ``{"method", "path", "body"}`` objects
+        
+    Returns:
+        List[Tuple[str, str, Dict[str, Any]]]: (method, path, data) per operation
+        
+    Raises:
+        ValueError: If the batch or one of its operations is invalid
+    """
+    max_operations = int(get_setting("API_BATCH_MAX_OPERATIONS", 100))
+    if not isinstance(data, list) or not data:
+        raise ValueError("Expected a non-empty array of operations")
+    if len(data) > max_operations:
+        raise ValueError(f"A batch can have at most {max_operations} operations")
+        
+    operations = []
+    for index, operation in enumerate(data):
+        if not isinstance(operation, dict):
+            raise ValueError(f"Operation {index} is not an object")
+            
+        method = operation.get("method")
+        path = operation.get("path")
+        body = operation.get("body")
+        if not isinstance(method, str) or not isinstance(path, str) or not path.startswith("/api/"):
+            raise ValueError(f"Operation {index} needs a method and an /api/ path")
+        if body is not None and not isinstance(body, dict):
+            raise ValueError(f"Operation {index} body must be an object")
+            
+        method = method.upper()
+        if router.match(method, path.partition("?")[0]).template == "/api/batch":
+            raise ValueError(f"Operation {index} is a nested batch")
+        operations.append((method, path, body or {}))
+    return operations
+
+def _run_operation(method: str, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one operation of a batch through its route handler.
+    
+    Args:
+        method: HTTP method
+        path: Request path, with the query string
+        data: Request data
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    response = _observed(method, path, _route, data)
+    body = response["body"]
+    if is_streaming(body):
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": "Streaming responses cannot be batched"})
+        }
+    return response
+
+def _encode_result(response: Dict[str, Any]) -> str:
+    """
+    Encode an operation's response as an element of the batch response.
+    
+    JSON bodies are embedded as they are, without being parsed again.
+    
+    Args:
+        response: Response data
+        
+    Returns:
+        str: ``{"status": ..., "body": ...}`` JSON object
+    """
+    body = response["body"]
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if not body:
+        body = "null"
+    elif response["content_type"] != "application/json":
+        body = json.dumps(body)
+    return f'{{"status": {response["status"]}, "body": {body}}}'
+
+def handle_batch(
+    method: str,
+    data: Any = None,
+    params: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Handle requests to /api/batch.
+    
+    The body is an array of ``{"method", "path", "body"}`` operations, run
+    in order through the same handlers as separate requests. With
+    ``atomic=1`` they run in one transaction, committed with one sync, and
+    the first operation that fails rolls all of them back.
+    
+    Args:
+        method: HTTP method
+        data: Request data
+        params: Query parameters (``atomic=1``)
+        
+    Returns:
+        Dict[str, Any]: Response data with one ``{"status", "body"}`` object
+            per operation, or the failed operation of an atomic batch
+    """
+    params = params or {}
+    try:
+        operations = _parse_operations(data)
+    except ValueError as e:
+        return {
+            "status": 400,
+            "content_type": "application/json",
+            "body": json.dumps({"error": str(e)})
+        }
+        
+    if params.get("atomic", "").lower() in ("1", "true", "yes"):
+        try:
+            with transaction():
+                results = []
+                for index, operation in enumerate(operations):
+                    response = _run_operation(*operation)
+                    if response["status"] >= 400:
+                        raise _BatchAborted(index, response)
+                    results.append(_encode_result(response))
+        except _BatchAborted as e:
+            error = json.dumps(f"Operation {e.index} failed, batch rolled back")
+            return {
+                "status": e.response["status"],
+                "content_type": "application/json",
+                "body": (
+                    f'{{"error": {error}, "index": {e.index}, '
+                    f'"result": {_encode_result(e.response)}}}'
+                )
+            }
+    else:
+        results = [_encode_result(_run_operation(*operation)) for operation in operations]
+        
+    return {
+        "status": 200,
+        "content_type": "application/json",
+        "body": "[" + ", ".join(results) + "]"
+    }
+
+# Route table: path template -> handler per method
+ROUTES = [
+    ("/api/health", {"GET": handle_health}),
+    ("/api/metrics", {"GET": handle_metrics}),
+    ("/api/slow-queries", {"GET": handle_slow_queries}),
+    ("/api/stats", {"GET": handle_stats}),
+    ("/api/batch", {"POST": handle_batch}),
+    ("/api/users", {"GET": handle_users, "POST": handle_users}),
+    ("/api/users/export", {"GET": handle_users_export}),
+    ("/api/users/{user_id:int}", {
+        "GET": handle_user,
+        "PUT": handle_user,
+        "DELETE": handle_user,
+    }),
+    ("/api/items", {"GET": handle_items, "POST": handle_items}),
+    ("/api/items/export", {"GET": handle_items_export}),
+    ("/api/items/search", {"GET": handle_items_search}),
+    ("/api/items/{item_id:int}", {
+        "GET": handle_item,
+        "PUT": handle_item,
+        "DELETE": handle_item,
+    }),
+]
+
+def build_router(routes: List[Tuple[str, Dict[str, Any]]]) -> Router:
+    """
+    Compile a route table.
+    
+    Args:
+        routes: (path template, handler per method) pairs
+        
+    Returns:
+        Router: Compiled router
+    """
+    compiled = Router()
+    for template, methods in routes:
+        compiled.add(template, methods)
+    return compiled
+
+# Compiled once at import
+router = build_router(ROUTES)
+
@@ -0,0 +1,251 @@
+"""
+Row-to-JSON serializers.
+
+Each serializer precomputes a format template for one model's fields and
+encodes row tuples (or model instances) straight to JSON text without
+building an intermediate dict per row. Values are encoded a column at a
+time, so columns of a single type go through the stdlib's C string and int
+encoders in one ``map`` call. Output is byte-for-byte identical to
+``json.dumps([obj.to_dict() for obj in objects])``.
+
+Setting ``API_JSON_ENCODER=orjson`` switches to orjson when it is installed.
+orjson has no option for the stdlib's ``", "``/``": "`` separators, so that
+mode emits compact JSON and is opt-in. The choice is made on the first
+encode and again after a reload that changes the setting.
+"""
+import json
+from itertools import islice
+from json.encoder import encode_basestring_ascii
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, FrozenSet, Iterable, Iterator, List, Optional, Sequence
+
+from backend.app.api.streaming import stream_array_batches
+from backend.app.config import Settings, get_setting, get_settings, subscribe
+from backend.app.models import User, Item, SearchHit
+from backend.app.utils import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _encode_float(value: float) -> str:
+    """
+    Encode a float the way ``json.dumps`` does, including NaN and infinities.
+    """
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+class _Encoders(dict):
+    """Value encoders by exact type; other types go through ``json.dumps``."""
+    
+    def __missing__(self, key: type) -> Callable[[Any], str]:
+        return json.dumps
+
+# Encoders for the types SQLite returns, plus bool for unsaved models
+_ENCODERS = _Encoders({
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+})
+
+# Columns holding a single one of these types are encoded in one C-level map
+_COLUMN_ENCODERS = {
+    frozenset([str]): encode_basestring_ascii,
+    frozenset([int]): int.__repr__,
+}
+
+def _encode_column(values: List[Any]) -> List[str]:
+    """
+    Encode one column of values.
+    
+    Args:
+        values: Column values
+        
+    Returns:
+        List[str]: Encoded values
+    """
+    encoder = _COLUMN_ENCODERS.get(frozenset(map(type, values)))
+    if encoder is not None:
+        return list(map(encoder, values))
+    encoders = _ENCODERS
+    return [encoders[type(value)](value) for value in values]
+
+# Whether responses are encoded with orjson, decided on first use
+_orjson_selected: Optional[bool] = None
+
+def _use_orjson() -> bool:
+    """
+    Check whether the compact orjson encoder is selected and available.
+    
+    Returns:
+        bool: True if responses are encoded with orjson
+    """
+    global _orjson_selected
+    
+    selected = _orjson_selected
+    if selected is None:
+        selected = get_settings().api_json_encoder == "orjson"
+        if selected and orjson is None:
+            logger.warning("API_JSON_ENCODER=orjson but orjson is not installed, using stdlib")
+            selected = False
+        _orjson_selected = selected
+    return selected
+
+def _apply_settings(settings: Settings, changed: FrozenSet[str]) -> None:
+    """
+    Choose the encoder again after a settings reload.
+    
+    Args:
+        settings: New settings
+        changed: Names of the changed fields
+    """
+    global _orjson_selected
+    
+    if "api_json_encoder" in changed:
+        _orjson_selected = None
+
+subscribe(_apply_settings)
+
+class RowSerializer:
+    """JSON encoder for one model's public fields."""
+    
+    def __init__(self, fields: Sequence[str], columns: Sequence[str]):
+        """
+        Compile a serializer.
+        
+        Args:
+            fields: Output fields, in output order
+            columns: Row column order, e.g. the model's ``COLUMNS``
+        """
+        self.fields = tuple(fields)
+        self._row_getters = [itemgetter(columns.index(field)) for field in fields]
+        self._object_getters = [attrgetter(field) for field in fields]
+        self._template = "{" + ", ".join(f"{json.dumps(field)}: %s" for field in fields) + "}"
+        
+    def _encode_batch(self, records: Sequence[Any], getters: List[Callable[[Any], Any]]) -> str:
+        """
+        Encode records as JSON objects joined with ``", "``.
+        
+        Args:
+            records: Row tuples or model instances
+            getters: Field accessors matching ``records``
+            
+        Returns:
+            str: Encoded objects, without the enclosing brackets
+        """
+        if _use_orjson():
+            fields = self.fields
+            return ", ".join([
+                orjson.dumps(dict(zip(fields, [get(record) for get in getters]))).decode("utf-8")
+                for record in records
+            ])
+            
+        columns = [_encode_column(list(map(get, records))) for get in getters]
+        template = self._template
+        return ", ".join([template % values for values in zip(*columns)])
+        
+    def encode_row(self, row: Sequence[Any]) -> str:
+        """
+        Encode a row tuple.
+        
+        Args:
+            row: Row in column order
+            
+        Returns:
+            str: JSON object
+        """
+        return self._encode_batch([row], self._row_getters)
+        
+    def encode_object(self, obj: Any) -> str:
+        """
+        Encode a model instance.
+        
+        Args:
+            obj: Model instance
+            
+        Returns:
+            str: JSON object
+        """
+        return self._encode_batch([obj], self._object_getters)
+        
+    def encode_objects(self, objects: Sequence[Any]) -> str:
+        """
+        Encode model instances as a JSON array.
+        
+        Args:
+            objects: Model instances
+            
+        Returns:
+            str: JSON array
+        """
+        return "[" + self._encode_batch(objects, self._object_getters) + "]"
+        
+    def encode_page(self, objects: Sequence[Any], next_cursor: Optional[str]) -> str:
+        """
+        Encode a page of model instances with its pagination cursor.
+        
+        Args:
+            objects: Model instances
+            next_cursor: Cursor for the next page, or None on the last page
+            
+        Returns:
+            str: ``{"data": [...], "next_cursor": ...}``
+        """
+        return (
+            f'{{"data": {self.encode_objects(objects)}, '
+            f'"next_cursor": {json.dumps(next_cursor)}}}'
+        )
+        
+    def stream_rows(self, rows: Iterable[Sequence[Any]], batch_size: int = 0) -> Iterator[bytes]:
+        """
+        Encode row tuples as a streamed JSON array, one chunk per batch.
+        
+        Args:
+            rows: Rows in column order
+            batch_size: Rows per chunk, defaults to the ``DB_FETCH_BATCH_SIZE`` setting
+            
+        Returns:
+            Iterator[bytes]: Encoded chunks
+        """
+        batch_size = batch_size or int(get_setting("DB_FETCH_BATCH_SIZE", 500))
+        return stream_array_batches(self._iter_batches(iter(rows), batch_size))
+        
+    def _iter_batches(self, rows: Iterator[Sequence[Any]], batch_size: int) -> Iterator[str]:
+        """
+        Encode rows ``batch_size`` at a time.
+        
+        Args:
+            rows: Rows in column order
+            batch_size: Rows per batch
+            
+        Yields:
+            str: Encoded batch
+        """
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield self._encode_batch(batch, self._row_getters)
+
+# Serializers matching User.to_dict() and Item.to_dict(), and search hits
+user_serializer = RowSerializer(
+    ("id", "username", "email", "is_active", "is_admin", "created_at", "updated_at"),
+    User.COLUMNS,
+)
+item_serializer = RowSerializer(
+    ("id", "name", "description", "user_id", "created_at", "updated_at"),
+    Item.COLUMNS,
+)
+search_hit_serializer = RowSerializer(
+    ("id", "name", "description", "user_id", "created_at", "updated_at", "rank", "snippet"),
+    SearchHit._fields,
+)
+
@@ -0,0 +1,93 @@
+"""
+Streaming response helpers.
+
+A response ``body`` is either a ``str`` or an iterable of encoded ``bytes``
+chunks that the server writes out as they are produced.
+"""
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Union
+
+from backend.app.config import get_setting
+
+def stream_json_array(
+    objects: Iterable[Dict[str, Any]],
+    batch_size: int = 0,
+) -> Iterator[bytes]:
+    """
+    Encode objects as a JSON array, one chunk per batch.
+    
+    The output is identical to ``json.dumps(list(objects))``.
+    
+    Args:
+        objects: Objects to encode
+        batch_size: Objects per chunk, defaults to the ``DB_FETCH_BATCH_SIZE`` setting
+        
+    Yields:
+        bytes: Encoded chunk
+    """
+    batch_size = batch_size or int(get_setting("DB_FETCH_BATCH_SIZE", 500))
+    iterator = iter(objects)
+    separator = ""
+    
+    yield b"["
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+        yield (separator + ", ".join(json.dumps(obj) for obj in batch)).encode("utf-8")
+        separator = ", "
+    yield b"]"
+
+def stream_array_batches(batches: Iterable[str]) -> Iterator[bytes]:
+    """
+    Join batches of already-encoded values into a streamed JSON array.
+    
+    Args:
+        batches: Encoded values, each batch joined with ``", "``
+        
+    Yields:
+        bytes: Encoded chunk
+    """
+    separator = ""
+    
+    yield b"["
+    for batch in batches:
+        if batch:
+            yield (separator + batch).encode("utf-8")
+            separator = ", "
+    yield b"]"
+
+def iter_body(body: Union[str, bytes, Iterable[bytes], None]) -> Iterator[bytes]:
+    """
+    Iterate over a response body as encoded chunks.
+    
+    Args:
+        body: Response body
+        
+    Yields:
+        bytes: Encoded chunk
+    """
+    if not body:
+        return
+    if isinstance(body, str):
+        yield body.encode("utf-8")
+    elif isinstance(body, bytes):
+        yield body
+    else:
+        for chunk in body:
+            if chunk:
+                yield chunk
+
+def is_streaming(body: Any) -> bool:
+    """
+    Check whether a response body is a chunk iterable.
+    
+    Args:
+        body: Response body
+        
+    Returns:
+        bool: True if the body must be streamed
+    """
+    return body is not None and not isinstance(body, (str, bytes))
+
@@ -3,13 +3,35 @@ Configuration package initialization.
 """
 from backend.app.config.config import (
     get_setting,
-    set_setting,
-    reload_settings
+    set_setting
+)
+from backend.app.config.profiles import (
+    STORAGE_PROFILES,
+    get_storage_profile
+)
+from backend.app.config.settings import (
+    Settings,
+    get_settings,
+    subscribe,
+    unsubscribe,
+    reload_settings,
+    request_reload,
+    install_reload_handler,
+    watch_dotenv
 )
 
 __all__ = [
     "get_setting",
     "set_setting",
-    "reload_settings"
+    "STORAGE_PROFILES",
+    "get_storage_profile",
+    "Settings",
+    "get_settings",
+    "subscribe",
+    "unsubscribe",
+    "reload_settings",
+    "request_reload",
+    "install_reload_handler",
+    "watch_dotenv"
 ]
 
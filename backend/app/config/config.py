@@ -1,17 +1,63 @@
 """
 Configuration utilities.
+
+The ``.env`` file is read on the first ``get_setting`` call rather than at
+import, so importing the package has no side effects on ``os.environ``.
 """
 import os
+import threading
 from typing import Any, Dict, Optional
 
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
 # Configuration dictionary
 _config: Dict[str, Any] = {}
 
+# Whether the .env file has been read into the environment
+_dotenv_loaded = False
+_dotenv_lock = threading.Lock()
+
+def get_dotenv_path() -> str:
+    """
+    Find the ``.env`` file, searching upwards from this package.
+    
+    Returns:
+        str: Path, or an empty string if there is no ``.env`` file
+    """
+    from dotenv import find_dotenv
+    
+    return find_dotenv()
+
+def ensure_dotenv_loaded() -> None:
+    """
+    Read the ``.env`` file into the environment, once.
+    
+    Variables that are already set take precedence over the file.
+    """
+    global _dotenv_loaded
+    
+    if _dotenv_loaded:
+        return
+        
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+            
+            load_dotenv(get_dotenv_path())
+            _dotenv_loaded = True
+
+def read_dotenv() -> Dict[str, str]:
+    """
+    Parse the ``.env`` file without changing the environment.
+    
+    Returns:
+        Dict[str, str]: Variables set in the file
+    """
+    from dotenv import dotenv_values
+    
+    path = get_dotenv_path()
+    if not path:
+        return {}
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
 def get_setting(key: str, default: Optional[Any] = None) -> Any:
     """
     Get a configuration setting.
@@ -27,6 +73,8 @@ def get_setting(key: str, default: Optional[Any] = None) -> Any:
     if key in _config:
         return _config[key]
         
+    ensure_dotenv_loaded()
+    
     # Get setting from environment
     value = os.environ.get(key, default)
     
@@ -45,13 +93,11 @@ def set_setting(key: str, value: Any) -> None:
     """
     _config[key] = value
 
-def reload_settings() -> None:
+def clear_cache() -> None:
     """
-    Reload all settings from environment.
+    Forget cached settings so they are read from the environment again.
+    
+    Use ``reload_settings`` to also re-read ``.env`` and notify subscribers.
     """
-    # Clear configuration
     _config.clear()
-    
-    # Reload environment variables
-    load_dotenv(override=True)
 
@@ -0,0 +1,82 @@
+"""
+SQLite storage profiles.
+"""
+from typing import Any, Dict, Optional
+
+from backend.app.config.config import get_setting
+
+# Pragmas applied to every connection, by profile
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Full durability: every commit is fsynced, WAL keeps readers unblocked
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # Safe against application crashes, may lose the last commits on power loss
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 67108864,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Bulk loads and disposable data: no fsync, large cache and mmap
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+# Accepted values for the textual pragmas
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+def get_storage_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the pragmas for a storage profile.
+    
+    Individual pragmas can be overridden with ``DB_<PRAGMA>`` settings,
+    e.g. ``DB_SYNCHRONOUS=FULL``.
+    
+    Args:
+        name: Profile name, defaults to the ``DB_PROFILE`` setting
+        
+    Returns:
+        Dict[str, Any]: Validated pragma values
+        
+    Raises:
+        ValueError: If the profile or a pragma value is unknown
+    """
+    name = (name or get_setting("DB_PROFILE", DEFAULT_STORAGE_PROFILE)).lower()
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {name}")
+        
+    pragmas = {}
+    for pragma, default in STORAGE_PROFILES[name].items():
+        value = get_setting(f"DB_{pragma.upper()}", default)
+        
+        if pragma in _PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in _PRAGMA_CHOICES[pragma]:
+                raise ValueError(f"Invalid value for {pragma}: {value}")
+        else:
+            value = int(value)
+            
+        pragmas[pragma] = value
+        
+    return pragmas
+
@@ -0,0 +1,400 @@
+"""
+Typed runtime settings with live reload.
+
+``get_settings()`` returns an immutable ``Settings`` snapshot. A reload
+builds and validates a complete new snapshot before swapping it in, so
+readers see either the old values or the new ones, never a mix, and a bad
+edit to ``.env`` is rejected as a whole. Subsystems that copied a value when
+they were created (pool limits, cache sizes, the slow query threshold, the
+log level) subscribe to changes and apply them in place.
+
+Reloads are triggered by ``reload_settings()``, by SIGHUP once
+``install_reload_handler()`` has run, or by edits to ``.env`` with
+``watch_dotenv()``.
+"""
+import logging
+import os
+import signal
+import threading
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
+
+from backend.app.config import config
+
+# Child of the application logger; the config package cannot import utils
+logger = logging.getLogger("backend.config")
+
+class Settings(NamedTuple):
+    """Snapshot of the typed runtime settings, read from ``FIELD_NAME`` variables."""
+    
+    # Only read at startup
+    database_url: str = "sqlite:///app/data/app.db"
+    
+    # Applied live
+    log_level: str = "INFO"
+    jwt_secret: str = "dev_jwt_secret"
+    access_token_expire_minutes: int = 30
+    db_pool_size: int = 5
+    db_pool_timeout: float = 30.0
+    db_pool_max_lifetime: float = 3600.0
+    db_pool_health_check_interval: float = 30.0
+    db_slow_query_ms: float = 100.0
+    user_cache_size: int = 1024
+    user_cache_ttl: float = 60.0
+    item_cache_size: int = 4096
+    item_cache_ttl: float = 60.0
+    jwt_cache_size: int = 4096
+    jwt_cache_ttl: float = 300.0
+    jwt_negative_cache_size: int = 256
+    jwt_negative_cache_ttl: float = 30.0
+    api_json_encoder: str = "stdlib"
+    
+    @classmethod
+    def from_environ(cls, environ: Mapping[str, str]) -> "Settings":
+        """
+        Parse and validate settings.
+        
+        Unset and empty variables take the field's default.
+        
+        Args:
+            environ: Environment variables
+            
+        Returns:
+            Settings: Parsed settings
+            
+        Raises:
+            ValueError: If a value cannot be parsed or is out of range
+        """
+        values: Dict[str, Any] = {}
+        for name, kind in cls.__annotations__.items():
+            raw = environ.get(name.upper())
+            if raw is None or raw.strip() == "":
+                continue
+            try:
+                values[name] = kind(raw.strip())
+            except ValueError:
+                raise ValueError(f"Invalid {name.upper()}: {raw!r}") from None
+                
+        if "log_level" in values:
+            values["log_level"] = values["log_level"].upper()
+        if "api_json_encoder" in values:
+            values["api_json_encoder"] = values["api_json_encoder"].lower()
+            
+        settings = cls(**values)
+        settings.validate()
+        return settings
+        
+    def validate(self) -> None:
+        """
+        Check that values are in range.
+        
+        Raises:
+            ValueError: If a value is out of range
+        """
+        if not isinstance(logging.getLevelName(self.log_level), int):
+            raise ValueError(f"Unknown LOG_LEVEL: {self.log_level}")
+        if self.api_json_encoder not in ("stdlib", "orjson"):
+            raise ValueError(f"Unknown API_JSON_ENCODER: {self.api_json_encoder}")
+        if self.db_pool_size < 1:
+            raise ValueError("DB_POOL_SIZE must be at least 1")
+            
+        for name, value in zip(self._fields, self):
+            if isinstance(value, (int, float)) and value < 0:
+                raise ValueError(f"{name.upper()} must not be negative")
+                
+    def changed(self, other: "Settings") -> FrozenSet[str]:
+        """
+        Get the fields whose values differ from another snapshot.
+        
+        Args:
+            other: Settings to compare with
+            
+        Returns:
+            FrozenSet[str]: Field names
+        """
+        return frozenset(
+            name for name, old, new in zip(self._fields, other, self) if old != new
+        )
+
+# Fields that only take effect after a restart
+RESTART_REQUIRED = frozenset({"database_url"})
+
+# Callback run after a reload with the new snapshot and the changed fields
+Subscriber = Callable[[Settings, FrozenSet[str]], None]
+
+# Current snapshot, created on first use
+_settings: Optional[Settings] = None
+_subscribers: List[Subscriber] = []
+_lock = threading.RLock()
+
+def get_settings() -> Settings:
+    """
+    Get the current settings snapshot.
+    
+    Read several fields from one snapshot to see a consistent set of values.
+    
+    Returns:
+        Settings: Current settings
+        
+    Raises:
+        ValueError: If the initial settings are invalid
+    """
+    global _settings
+    
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                config.ensure_dotenv_loaded()
+                _settings = Settings.from_environ(os.environ)
+                
+    return _settings
+
+def subscribe(callback: Subscriber) -> None:
+    """
+    Run a callback after every reload that changes a setting.
+    
+    Callbacks run on the reloading thread, one reload at a time, after the
+    new snapshot is in place; an exception in one is logged and does not
+    stop the others.
+    
+    Args:
+        callback: Called with the new settings and the names of changed fields
+    """
+    with _lock:
+        _subscribers.append(callback)
+
+def unsubscribe(callback: Subscriber) -> None:
+    """
+    Stop running a callback on reload.
+    
+    Args:
+        callback: Callback passed to ``subscribe``
+    """
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+def reload_settings() -> FrozenSet[str]:
+    """
+    Re-read ``.env`` and the environment and apply any changes.
+    
+    Values in ``.env`` override the environment. If the new values are
+    invalid, nothing changes and the error is logged.
+    
+    Returns:
+        FrozenSet[str]: Names of the fields that changed
+    """
+    global _settings
+    
+    with _lock:
+        old = get_settings()
+        dotenv = config.read_dotenv()
+        try:
+            new = Settings.from_environ({**os.environ, **dotenv})
+        except ValueError as e:
+            logger.error("Settings reload rejected, keeping current settings: %s", e)
+            return frozenset()
+            
+        os.environ.update(dotenv)
+        config.clear_cache()
+        _settings = new
+        
+        changed = new.changed(old)
+        if not changed:
+            logger.info("Settings reloaded, no changes")
+            return changed
+            
+        logger.info("Settings reloaded, changed: %s", ", ".join(sorted(changed)))
+        for name in sorted(changed & RESTART_REQUIRED):
+            logger.warning("%s changed; restart to apply it", name.upper())
+            
+        # Still under the lock, so overlapping reloads apply in order
+        for callback in list(_subscribers):
+            try:
+                callback(new, changed)
+            except Exception as e:
+                logger.exception("Settings subscriber %r failed: %s", callback, e)
+        return changed
+
+# Reload requests from signal handlers and file watchers, served by one thread
+_reload_requested = threading.Event()
+_reloader: Optional[threading.Thread] = None
+
+def request_reload() -> None:
+    """
+    Ask the reloader thread to reload the settings.
+    
+    Safe to call from a signal handler: the reload itself takes locks the
+    interrupted code may hold, so it runs on the reloader thread. Requests
+    made while a reload is running are coalesced into one more reload.
+    """
+    _reload_requested.set()
+
+def _reload_loop() -> None:
+    """
+    Serve reload requests until the process exits.
+    """
+    while True:
+        _reload_requested.wait()
+        _reload_requested.clear()
+        try:
+            reload_settings()
+        except Exception as e:
+            logger.exception("Settings reload failed: %s", e)
+
+def _start_reloader() -> None:
+    """
+    Start the reloader thread if it is not running in this process.
+    """
+    global _reloader
+    
+    with _lock:
+        if _reloader is None or not _reloader.is_alive():
+            _reloader = threading.Thread(target=_reload_loop, name="settings-reload", daemon=True)
+            _reloader.start()
+
+def install_reload_handler() -> None:
+    """
+    Reload the settings on SIGHUP.
+    
+    Starts the reloader thread; call it again in a forked child, since
+    threads do not survive ``fork``. Must be called from the main thread.
+    """
+    _start_reloader()
+    signal.signal(signal.SIGHUP, lambda signum, frame: request_reload())
+
+class _DotenvEventHandler:
+    """Watchdog event handler that fires on changes to one file."""
+    
+    def __init__(self, path: str, callback: Callable[[], None]):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        
+    def dispatch(self, event: Any) -> None:
+        """
+        Handle a file system event.
+        
+        Editors often save by writing a temporary file and renaming it over
+        the original, so the destination of a move counts too.
+        
+        Args:
+            event: Watchdog event
+        """
+        # Reading the file on reload raises opened/closed events; ignore those
+        if event.is_directory or event.event_type not in ("created", "modified", "moved"):
+            return
+        if self.path in (event.src_path, getattr(event, "dest_path", None)):
+            self.callback()
+
+class DotenvWatcher:
+    """Watches ``.env`` and calls back when it changes."""
+    
+    def __init__(self, path: str, callback: Callable[[], None], interval: float = 2.0):
+        """
+        Create a watcher; call ``start()`` to begin watching.
+        
+        Uses watchdog when it is installed, and polls the file's modification
+        time every ``interval`` seconds otherwise.
+        
+        Args:
+            path: File to watch
+            callback: Called after each change
+            interval: Polling interval without watchdog
+        """
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.interval = interval
+        self._observer: Any = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the file's identity, size and modification time.
+        
+        Returns:
+            Optional[Tuple[int, int, int]]: (inode, size, mtime), or None if missing
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        
+    def _poll(self) -> None:
+        """
+        Poll the file until stopped.
+        """
+        last = self._stat()
+        while not self._stopped.wait(self.interval):
+            current = self._stat()
+            if current != last:
+                last = current
+                self.callback()
+                
+    def start(self) -> "DotenvWatcher":
+        """
+        Start watching.
+        
+        Returns:
+            DotenvWatcher: This watcher
+        """
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            Observer = None
+            
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(
+                _DotenvEventHandler(self.path, self.callback),
+                os.path.dirname(self.path),
+                recursive=False,
+            )
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._thread = threading.Thread(target=self._poll, name="dotenv-watch", daemon=True)
+            self._thread.start()
+            
+        logger.info(
+            "Watching %s for settings changes (%s)",
+            self.path,
+            "watchdog" if self._observer is not None else f"polling every {self.interval}s",
+        )
+        return self
+        
+    def stop(self) -> None:
+        """
+        Stop watching.
+        """
+        self._stopped.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+
+def watch_dotenv(callback: Optional[Callable[[], None]] = None) -> Optional[DotenvWatcher]:
+    """
+    Reload the settings when ``.env`` changes.
+    
+    The polling interval without watchdog is ``SETTINGS_WATCH_INTERVAL``.
+    
+    Args:
+        callback: Called after each change, by default ``request_reload``
+        
+    Returns:
+        Optional[DotenvWatcher]: Running watcher, or None if there is no ``.env`` file
+    """
+    path = config.get_dotenv_path()
+    if not path:
+        logger.warning("No .env file found; settings are only reloaded on SIGHUP")
+        return None
+        
+    if callback is None:
+        _start_reloader()
+        callback = request_reload
+        
+    interval = float(config.get_setting("SETTINGS_WATCH_INTERVAL", 2))
+    return DotenvWatcher(path, callback, interval).start()
+
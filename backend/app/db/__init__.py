@@ -2,14 +2,67 @@
 Database package initialization.
 """
 from backend.app.db.database import (
+    ConnectionPool,
+    PoolTimeoutError,
+    ConstraintViolation,
     get_connection,
+    get_pool,
+    get_pool_stats,
+    close_pool,
+    pooled_connection,
+    get_storage_report,
+    transaction,
+    on_commit,
+    in_transaction,
     execute_query,
+    iter_query,
+    execute_many,
+    bulk_insert,
     init_db
 )
+from backend.app.db.generations import Generation, Generations, get_generations
+from backend.app.db.slow_queries import SlowQuery, get_slow_query_log, get_slow_queries
+from backend.app.db.search import (
+    SEARCH_INDEXES,
+    build_match_query,
+    rebuild_search_index,
+    optimize_search_index,
+    check_search_index
+)
+from backend.app.db.rollups import ROLLUPS, get_row_count, check_rollups, rebuild_rollups
 
 __all__ = [
+    "ConnectionPool",
+    "PoolTimeoutError",
+    "ConstraintViolation",
     "get_connection",
+    "get_pool",
+    "get_pool_stats",
+    "close_pool",
+    "pooled_connection",
+    "get_storage_report",
+    "transaction",
+    "on_commit",
+    "in_transaction",
     "execute_query",
-    "init_db"
+    "iter_query",
+    "execute_many",
+    "bulk_insert",
+    "init_db",
+    "Generation",
+    "Generations",
+    "get_generations",
+    "SlowQuery",
+    "get_slow_query_log",
+    "get_slow_queries",
+    "SEARCH_INDEXES",
+    "build_match_query",
+    "rebuild_search_index",
+    "optimize_search_index",
+    "check_search_index",
+    "ROLLUPS",
+    "get_row_count",
+    "check_rollups",
+    "rebuild_rollups"
 ]
 
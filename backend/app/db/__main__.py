@@ -0,0 +1,120 @@
+"""
+Database maintenance commands.
+
+    python -m backend.app.db search rebuild|optimize|check [index ...]
+    python -m backend.app.db rollups check|rebuild [table ...]
+
+The database named by ``DATABASE_URL`` is brought up to the current schema
+first. The run exits with status 1 if a check fails.
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from backend.app import init_app
+from backend.app.db.rollups import ROLLUPS, check_rollups, rebuild_rollups
+from backend.app.db.search import (
+    SEARCH_INDEXES,
+    check_search_index,
+    optimize_search_index,
+    rebuild_search_index
+)
+
+# Search index commands by name; checks return False on failure
+SEARCH_COMMANDS: Dict[str, Callable[[str], Optional[bool]]] = {
+    "rebuild": rebuild_search_index,
+    "optimize": optimize_search_index,
+    "check": check_search_index,
+}
+
+def run_search(command: str, indexes: List[str]) -> bool:
+    """
+    Run a search index command.
+    
+    Args:
+        command: Command name from ``SEARCH_COMMANDS``
+        indexes: Indexes to process, or empty for all
+        
+    Returns:
+        bool: False if a check failed
+    """
+    ok = True
+    for index in indexes or SEARCH_INDEXES:
+        start = time.perf_counter()
+        result = SEARCH_COMMANDS[command](index)
+        ok = ok and result is not False
+        status = "FAIL" if result is False else "ok"
+        print(f"search {command} {index}: {status} ({time.perf_counter() - start:.2f}s)")
+    return ok
+
+def run_rollups(command: str, tables: List[str]) -> bool:
+    """
+    Run a rollup command.
+    
+    Args:
+        command: ``check`` or ``rebuild``
+        tables: Rollup tables to process, or empty for all
+        
+    Returns:
+        bool: False if a check found mismatches
+    """
+    start = time.perf_counter()
+    if command == "rebuild":
+        rebuild_rollups(tables or None)
+        print(f"rollups rebuild: ok ({time.perf_counter() - start:.2f}s)")
+        return True
+        
+    mismatches = check_rollups(tables or None)
+    for table, count in mismatches.items():
+        print(f"rollups check {table}: {f'FAIL ({count} rows)' if count else 'ok'}")
+    print(f"rollups check: {time.perf_counter() - start:.2f}s")
+    return not any(mismatches.values())
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a maintenance command from the command line.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.app.db")
+    subparsers = parser.add_subparsers(dest="target", required=True)
+    
+    search = subparsers.add_parser("search", help="full-text search indexes")
+    search.add_argument("command", choices=tuple(SEARCH_COMMANDS))
+    search.add_argument(
+        "indexes",
+        nargs="*",
+        help=f"indexes to process (default: {', '.join(SEARCH_INDEXES)})",
+    )
+    
+    rollups = subparsers.add_parser("rollups", help="trigger-maintained count tables")
+    rollups.add_argument("command", choices=("check", "rebuild"))
+    rollups.add_argument(
+        "tables",
+        nargs="*",
+        help=f"rollup tables to process (default: {', '.join(ROLLUPS)})",
+    )
+    args = parser.parse_args(argv)
+    
+    if args.target == "search":
+        unknown = [index for index in args.indexes if index not in SEARCH_INDEXES]
+    else:
+        unknown = [table for table in args.tables if table not in ROLLUPS]
+    if unknown:
+        parser.error(f"unknown {args.target} name: {', '.join(unknown)}")
+        
+    init_app()
+    if args.target == "search":
+        ok = run_search(args.command, args.indexes)
+    else:
+        ok = run_rollups(args.command, args.tables)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
+
@@ -3,14 +3,330 @@ Database utilities.
 """
 import os
 import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
 
-from backend.app.config import get_setting
+from backend.app.config import Settings, get_setting, get_settings, get_storage_profile, subscribe
+from backend.app.config.profiles import DEFAULT_STORAGE_PROFILE
+from backend.app.db.metrics import get_query_metrics
+from backend.app.db.slow_queries import get_slow_query_log
 from backend.app.utils.logging import logger
 
-# Get database settings
-DATABASE_URL = get_setting("DATABASE_URL", "sqlite:///app/data/app.db")
+# Schema DDL; statements are idempotent, so it can be reapplied at any time
+_SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# Resolved database path (parsed once)
+_db_path: Optional[str] = None
+
+# Shared connection pool
+_pool: Optional["ConnectionPool"] = None
+_pool_lock = threading.Lock()
+
+# Per-thread transaction state
+_local = threading.local()
+
+# A result row: a dict by default, or a tuple in column order when ``raw``
+Row = Union[Dict[str, Any], Tuple[Any, ...]]
+
+# Numeric codes returned when reading back textual pragmas
+_PRAGMA_CODES = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection becomes available in time."""
+
+class ConstraintViolation(Exception):
+    """
+    Raised when a statement violates a table constraint.
+    
+    Attributes:
+        kind: Constraint kind, e.g. ``unique`` or ``foreign key``
+        columns: Offending columns, when SQLite reports them
+    """
+    
+    def __init__(self, kind: str, columns: Tuple[str, ...] = (), message: str = ""):
+        super().__init__(message or f"{kind} constraint failed")
+        self.kind = kind
+        self.columns = columns
+        
+    @classmethod
+    def from_error(cls, error: sqlite3.IntegrityError) -> "ConstraintViolation":
+        """
+        Parse an SQLite integrity error.
+        
+        Args:
+            error: Error raised by SQLite, e.g.
+                ``UNIQUE constraint failed: users.username``
+                
+        Returns:
+            ConstraintViolation: Parsed violation
+        """
+        message = str(error)
+        kind, _, detail = message.partition(" constraint failed")
+        columns = tuple(
+            column.strip().rsplit(".", 1)[-1]
+            for column in detail.lstrip(":").split(",")
+            if column.strip()
+        )
+        return cls(kind.lower(), columns, message)
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that tracks its age for the pool."""
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of reusable SQLite connections."""
+    
+    def __init__(
+        self,
+        db_path: str,
+        pragmas: Optional[Dict[str, Any]] = None,
+        max_size: int = 5,
+        max_lifetime: float = 3600.0,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        
+        self._idle: List[PooledConnection] = []
+        self._size = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "expired": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+            "timeouts": 0,
+        }
+        
+    def _connect(self) -> PooledConnection:
+        """
+        Open a new connection for the pool.
+        
+        Returns:
+            PooledConnection: New database connection
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=PooledConnection,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, self.pragmas)
+        return conn
+        
+    def _is_usable(self, conn: PooledConnection) -> bool:
+        """
+        Check whether an idle connection can be handed out again.
+        
+        Args:
+            conn: Idle connection
+            
+        Returns:
+            bool: True if the connection is still usable
+        """
+        now = time.monotonic()
+        if self.max_lifetime and now - conn.created_at > self.max_lifetime:
+            self._stats["expired"] += 1
+            return False
+            
+        if now - conn.last_used > self.health_check_interval:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error as e:
+                logger.warning("Discarding unhealthy pooled connection: %s", e)
+                self._stats["health_check_failures"] += 1
+                return False
+                
+        return True
+        
+    def acquire(self) -> PooledConnection:
+        """
+        Check a connection out of the pool.
+        
+        Returns:
+            PooledConnection: Database connection
+            
+        Raises:
+            PoolTimeoutError: If no connection becomes available within the timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        
+        with self._condition:
+            while True:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if self._is_usable(conn):
+                        self._stats["reused"] += 1
+                        return conn
+                    self._size -= 1
+                    conn.close()
+                    
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._stats["created"] += 1
+                    break
+                    
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"Timed out waiting for a database connection after {self.timeout}s"
+                    )
+                self._stats["waits"] += 1
+                self._condition.wait(remaining)
+                
+        # Open the new connection outside the lock
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+            
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Return a connection to the pool.
+        
+        Args:
+            conn: Connection to return
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning("Discarding pooled connection after failed rollback: %s", e)
+            conn.close()
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            return
+            
+        conn.last_used = time.monotonic()
+        with self._condition:
+            # Over the limit after a shrink: retire the connection
+            surplus = self._size > self.max_size
+            if surplus:
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+            
+        if surplus:
+            conn.close()
+            
+    def configure(
+        self,
+        max_size: Optional[int] = None,
+        max_lifetime: Optional[float] = None,
+        timeout: Optional[float] = None,
+        health_check_interval: Optional[float] = None,
+    ) -> None:
+        """
+        Change the pool limits while it is in use.
+        
+        Growing the pool wakes threads waiting for a connection. Shrinking it
+        closes surplus idle connections now and checked-out ones as they are
+        released.
+        
+        Args:
+            max_size: Maximum number of connections
+            max_lifetime: Seconds after which a connection is replaced
+            timeout: Seconds to wait for a free connection
+            health_check_interval: Idle seconds after which a connection is checked
+        """
+        surplus = []
+        with self._condition:
+            if max_lifetime is not None:
+                self.max_lifetime = max_lifetime
+            if timeout is not None:
+                self.timeout = timeout
+            if health_check_interval is not None:
+                self.health_check_interval = health_check_interval
+            if max_size is not None:
+                self.max_size = max_size
+                
+                # Least recently used first
+                while self._idle and self._size > self.max_size:
+                    surplus.append(self._idle.pop(0))
+                    self._size -= 1
+                self._condition.notify_all()
+                
+        for conn in surplus:
+            conn.close()
+            
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """
+        Borrow a connection for the duration of a ``with`` block.
+        
+        Yields:
+            PooledConnection: Database connection
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+            
+    def close(self) -> None:
+        """
+        Close all idle connections.
+        """
+        with self._condition:
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+                
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+        
+        Returns:
+            Dict[str, Any]: Pool size, usage and lifetime counters
+        """
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+            }
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any]) -> None:
+    """
+    Apply storage pragmas to a connection.
+    
+    Foreign keys are always enabled, since they are per-connection in SQLite.
+    
+    Args:
+        conn: Database connection
+        pragmas: Validated pragma values, see ``get_storage_profile()``
+    """
+    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma, value in pragmas.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
 
 def get_db_path() -> str:
     """
@@ -19,22 +335,31 @@ def get_db_path() -> str:
     Returns:
         str: Database path
     """
+    global _db_path
+    
+    if _db_path is not None:
+        return _db_path
+        
     # Parse database URL
-    if DATABASE_URL.startswith("sqlite:///"):
-        db_path = DATABASE_URL[10:]
+    database_url = get_settings().database_url
+    if database_url.startswith("sqlite:///"):
+        db_path = database_url[10:]
         
         # Ensure directory exists
         db_dir = os.path.dirname(db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
             
+        _db_path = db_path
         return db_path
     else:
-        raise ValueError(f"Unsupported database URL: {DATABASE_URL}")
+        raise ValueError(f"Unsupported database URL: {database_url}")
 
 def get_connection() -> sqlite3.Connection:
     """
-    Get a database connection.
+    Get a new, unpooled database connection.
+    
+    The caller is responsible for closing it; prefer ``pooled_connection()``.
     
     Returns:
         sqlite3.Connection: Database connection
@@ -44,81 +369,570 @@ def get_connection() -> sqlite3.Connection:
     # Connect to database
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    apply_pragmas(conn, get_storage_profile())
     
     return conn
 
+def get_pool() -> ConnectionPool:
+    """
+    Get the shared connection pool, creating it on first use.
+    
+    Returns:
+        ConnectionPool: Connection pool
+    """
+    global _pool
+    
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                _pool = ConnectionPool(
+                    get_db_path(),
+                    pragmas=get_storage_profile(),
+                    max_size=settings.db_pool_size,
+                    max_lifetime=settings.db_pool_max_lifetime,
+                    timeout=settings.db_pool_timeout,
+                    health_check_interval=settings.db_pool_health_check_interval,
+                )
+    return _pool
+
+def _apply_pool_settings(settings: Settings, changed: FrozenSet[str]) -> None:
+    """
+    Apply reloaded pool settings to the shared pool.
+    
+    Args:
+        settings: New settings
+        changed: Names of the changed fields
+    """
+    pool = _pool
+    if pool is not None and any(name.startswith("db_pool_") for name in changed):
+        pool.configure(
+            max_size=settings.db_pool_size,
+            max_lifetime=settings.db_pool_max_lifetime,
+            timeout=settings.db_pool_timeout,
+            health_check_interval=settings.db_pool_health_check_interval,
+        )
+        logger.info("Connection pool resized to %d", settings.db_pool_size)
+
+subscribe(_apply_pool_settings)
+
+def close_pool() -> None:
+    """
+    Close the shared connection pool.
+    
+    A new pool is created on next use, e.g. after a fork.
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get statistics for the shared connection pool.
+    
+    Returns:
+        Dict[str, Any]: Pool statistics
+    """
+    return get_pool().stats()
+
+@contextmanager
+def pooled_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a connection from the shared pool.
+    
+    Yields:
+        sqlite3.Connection: Database connection
+    """
+    metrics = get_query_metrics()
+    start = time.perf_counter() if metrics else 0.0
+    
+    with get_pool().connection() as conn:
+        if metrics:
+            metrics.observe_acquire(time.perf_counter() - start)
+        yield conn
+
+def get_storage_report() -> Dict[str, Any]:
+    """
+    Read back the storage settings in effect on a pooled connection.
+    
+    Returns:
+        Dict[str, Any]: Effective pragma values
+    """
+    pragmas = ["foreign_keys", *get_pool().pragmas]
+    
+    with pooled_connection() as conn:
+        return {
+            pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in pragmas
+        }
+
+@contextmanager
+def transaction(immediate: bool = True) -> Iterator[sqlite3.Connection]:
+    """
+    Run the enclosed queries in a single transaction.
+    
+    ``execute_query`` and the bulk helpers called inside the block share the
+    transaction's connection and do not commit. Nested blocks use savepoints,
+    so an inner failure only rolls back the inner block.
+    
+    Args:
+        immediate: Take the write lock up front (``BEGIN IMMEDIATE``)
+        
+    Yields:
+        sqlite3.Connection: Transaction connection
+    """
+    conn = getattr(_local, "conn", None)
+    
+    if conn is not None:
+        # Nested transaction
+        _local.depth += 1
+        savepoint = f"sp_{_local.depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            raise
+        finally:
+            conn.execute(f"RELEASE {savepoint}")
+            _local.depth -= 1
+        return
+        
+    with pooled_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        _local.conn = conn
+        _local.depth = 0
+        _local.on_commit = []
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            _local.conn = None
+            callbacks, _local.on_commit = _local.on_commit, []
+            
+    for callback, args in callbacks:
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.exception("Commit callback %r failed: %s", callback, e)
+
+def on_commit(callback: Callable[..., Any], *args: Any) -> None:
+    """
+    Run a callback once the current transaction commits.
+    
+    Outside ``transaction()`` the callback runs at once. Callbacks are
+    dropped if the transaction rolls back, but still run for work rolled back
+    to a savepoint, so they should be safe to repeat, like cache invalidation.
+    
+    Args:
+        callback: Callable
+        *args: Arguments for the callback
+    """
+    if getattr(_local, "conn", None) is None:
+        callback(*args)
+    else:
+        _local.on_commit.append((callback, args))
+
+def in_transaction() -> bool:
+    """
+    Check whether the current thread is inside ``transaction()``.
+    
+    Returns:
+        bool: True if a transaction is open
+    """
+    return getattr(_local, "conn", None) is not None
+
+@contextmanager
+def _query_connection() -> Iterator[Tuple[sqlite3.Connection, bool]]:
+    """
+    Get the connection for a single statement.
+    
+    Yields:
+        Tuple[sqlite3.Connection, bool]: (connection, whether the caller owns the commit)
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn, False
+    else:
+        with pooled_connection() as conn:
+            yield conn, True
+
+@contextmanager
+def _stream_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Get the connection for a streamed query.
+    
+    Outside a transaction this is a dedicated connection rather than a pooled
+    one: a stream lasts as long as its slowest consumer, and a few slow export
+    clients would otherwise hold the whole pool.
+    
+    Yields:
+        sqlite3.Connection: Database connection
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+        
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
 def execute_query(
     query: str,
     params: Optional[Tuple[Any, ...]] = None,
     fetch: bool = False,
     fetch_one: bool = False,
-) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+    raw: bool = False,
+) -> Union[Row, List[Row], None]:
     """
     Execute a database query.
     
+    Reads do not open a transaction and therefore skip the commit. Inside
+    ``transaction()`` the statement joins the open transaction instead.
+    Statements slower than ``DB_SLOW_QUERY_MS`` go to the slow query log.
+    
     Args:
         query: SQL query
         params: Query parameters
         fetch: Whether to fetch results
         fetch_one: Whether to fetch a single result
+        raw: Return rows as plain tuples in column order instead of dicts
         
     Returns:
-        Union[Dict[str, Any], List[Dict[str, Any]], None]: Query results
+        Union[Row, List[Row], None]: Query results
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    metrics = get_query_metrics()
+    slow_log = get_slow_query_log()
+    timed = metrics is not None or slow_log is not None
     
-    try:
-        # Execute query
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-            
-        # Fetch results
-        if fetch_one:
-            result = cursor.fetchone()
-            if result:
-                return dict(result)
-            return None
-        elif fetch:
-            results = cursor.fetchall()
-            return [dict(row) for row in results]
-        else:
-            # For INSERT, get the last inserted ID
-            if query.strip().upper().startswith("INSERT"):
-                return {"id": cursor.lastrowid}
-            return None
-    except Exception as e:
-        logger.error(f"Database error: {e}")
-        conn.rollback()
-        raise
-    finally:
-        conn.commit()
-        conn.close()
+    with _query_connection() as (conn, autocommit):
+        try:
+            start = time.perf_counter() if timed else 0.0
+            
+            # Execute query
+            cursor = conn.cursor()
+            if raw:
+                cursor.row_factory = None
+            cursor.execute(query, params or ())
+            
+            # Fetch results
+            if fetch_one:
+                row = cursor.fetchone()
+                result = dict(row) if row and not raw else row
+                rows = 1 if row else 0
+            elif fetch:
+                result = cursor.fetchall()
+                rows = len(result)
+                if not raw:
+                    result = [dict(row) for row in result]
+            elif query.lstrip()[:6].upper() == "INSERT":
+                # For INSERT, get the last inserted ID
+                result = {"id": cursor.lastrowid}
+                rows = cursor.rowcount
+            else:
+                result = None
+                rows = cursor.rowcount
+                
+            if autocommit and conn.in_transaction:
+                conn.commit()
+                
+            if timed:
+                elapsed = time.perf_counter() - start
+                if metrics:
+                    metrics.observe(query, elapsed, rows)
+                if slow_log and elapsed >= slow_log.threshold:
+                    slow_log.record(conn, query, params, elapsed, rows)
+                    
+            return result
+        except sqlite3.IntegrityError as e:
+            logger.warning("Constraint violation: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            if autocommit:
+                conn.rollback()
+            raise ConstraintViolation.from_error(e) from e
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            if autocommit:
+                conn.rollback()
+            raise
+
+def iter_query(
+    query: str,
+    params: Optional[Tuple[Any, ...]] = None,
+    batch_size: Optional[int] = None,
+    raw: bool = False,
+) -> Iterator[Row]:
+    """
+    Iterate over query results without loading them all at once.
+    
+    Rows are fetched ``batch_size`` at a time with ``fetchmany``. Outside a
+    transaction the query runs on its own unpooled connection, which stays
+    open until the iterator is exhausted or closed.
+    
+    Args:
+        query: SQL query
+        params: Query parameters
+        batch_size: Rows per fetch, defaults to the ``DB_FETCH_BATCH_SIZE`` setting
+        raw: Yield rows as plain tuples in column order instead of dicts
+        
+    Yields:
+        Row: Result row
+    """
+    batch_size = batch_size or int(get_setting("DB_FETCH_BATCH_SIZE", 500))
+    metrics = get_query_metrics()
+    slow_log = get_slow_query_log()
+    timed = metrics is not None or slow_log is not None
+    
+    with _stream_connection() as conn:
+        start = time.perf_counter() if timed else 0.0
+        try:
+            cursor = conn.cursor()
+            if raw:
+                cursor.row_factory = None
+            cursor.execute(query, params or ())
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            raise
+            
+        # Only time spent in SQLite counts, not time spent by the consumer
+        elapsed = time.perf_counter() - start if timed else 0.0
+        count = 0
+        try:
+            while True:
+                if timed:
+                    start = time.perf_counter()
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    count += len(rows)
+                else:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                if raw:
+                    yield from rows
+                else:
+                    for row in rows:
+                        yield dict(row)
+        finally:
+            cursor.close()
+            if metrics:
+                metrics.observe(query, elapsed, count)
+            if slow_log and elapsed >= slow_log.threshold:
+                slow_log.record(conn, query, params, elapsed, count)
+
+def _chunks(rows: Iterable[Sequence[Any]], chunk_size: int) -> Iterator[List[Sequence[Any]]]:
+    """
+    Split rows into lists of at most ``chunk_size``.
+    
+    Args:
+        rows: Parameter rows
+        chunk_size: Maximum rows per chunk
+        
+    Yields:
+        List[Sequence[Any]]: Chunk of rows
+    """
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _get_chunk_size(chunk_size: Optional[int]) -> int:
+    """
+    Resolve the bulk chunk size.
+    
+    Args:
+        chunk_size: Explicit chunk size, or None for the ``DB_BULK_CHUNK_SIZE`` setting
+        
+    Returns:
+        int: Chunk size
+    """
+    chunk_size = chunk_size or int(get_setting("DB_BULK_CHUNK_SIZE", 500))
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+    return chunk_size
+
+def execute_many(
+    query: str,
+    rows: Iterable[Sequence[Any]],
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Execute a statement for many parameter rows in one transaction.
+    
+    Args:
+        query: SQL query
+        rows: Parameter rows
+        chunk_size: Rows per ``executemany`` call
+        
+    Returns:
+        int: Number of rows affected
+    """
+    chunk_size = _get_chunk_size(chunk_size)
+    affected = 0
+    metrics = get_query_metrics()
+    start = time.perf_counter() if metrics else 0.0
+    
+    with transaction() as conn:
+        try:
+            for chunk in _chunks(rows, chunk_size):
+                affected += conn.executemany(query, chunk).rowcount
+        except sqlite3.IntegrityError as e:
+            logger.warning("Constraint violation: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            raise ConstraintViolation.from_error(e) from e
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            raise
+            
+    if metrics:
+        metrics.observe(query, time.perf_counter() - start, affected)
+        
+    return affected
 
-def init_db() -> None:
+def bulk_insert(
+    query: str,
+    rows: Iterable[Sequence[Any]],
+    chunk_size: Optional[int] = None,
+) -> List[int]:
+    """
+    Insert many rows in one transaction and return their IDs.
+    
+    The transaction holds the write lock, so each chunk is assigned a
+    contiguous block of AUTOINCREMENT IDs ending at ``last_insert_rowid()``.
+    
+    Args:
+        query: INSERT query
+        rows: Parameter rows
+        chunk_size: Rows per ``executemany`` call
+        
+    Returns:
+        List[int]: Inserted IDs, in input order
+    """
+    chunk_size = _get_chunk_size(chunk_size)
+    ids: List[int] = []
+    metrics = get_query_metrics()
+    start = time.perf_counter() if metrics else 0.0
+    
+    with transaction() as conn:
+        try:
+            for chunk in _chunks(rows, chunk_size):
+                conn.executemany(query, chunk)
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        except sqlite3.IntegrityError as e:
+            logger.warning("Constraint violation: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            raise ConstraintViolation.from_error(e) from e
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            if metrics:
+                metrics.observe_error(query, e)
+            raise
+            
+    if metrics:
+        metrics.observe(query, time.perf_counter() - start, len(ids))
+        
+    return ids
+
+def read_schema() -> Tuple[str, int]:
+    """
+    Read the schema DDL and its version.
+    
+    The version is a checksum of ``schema.sql``, so any edit to the file
+    gives a new version without a hand-maintained counter.
+    
+    Returns:
+        Tuple[str, int]: (DDL script, positive 31-bit version)
+    """
+    schema = _SCHEMA_PATH.read_text()
+    return schema, zlib.crc32(schema.encode("utf-8")) & 0x7FFFFFFF or 1
+
+def init_db(force: bool = False) -> None:
     """
     Initialize the database.
+    
+    The schema version is stored in ``PRAGMA user_version`` after the DDL
+    succeeds; when it matches the current ``schema.sql``, the DDL is skipped.
+    
+    Args:
+        force: Apply the DDL even if the stored version is current
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    schema, version = read_schema()
     
-    try:
-        # Read schema
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path, "r") as f:
-            schema = f.read()
-            
-        # Execute schema
-        cursor.executescript(schema)
-        
-        logger.info("Database initialized")
-    except Exception as e:
-        logger.error(f"Database initialization error: {e}")
-        conn.rollback()
-        raise
-    finally:
-        conn.commit()
-        conn.close()
+    with pooled_connection() as conn:
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        if current == version and not force:
+            logger.info("Database schema is current (version %d)", version)
+        else:
+            try:
+                # The version is only recorded if every statement before it succeeds
+                conn.executescript(f"{schema}\nPRAGMA user_version = {version};\n")
+                conn.commit()
+                
+                logger.info("Database initialized (schema version %d)", version)
+            except Exception as e:
+                logger.error("Database initialization error: %s", e)
+                conn.rollback()
+                raise
+                
+    log_storage_report()
+
+def log_storage_report() -> None:
+    """
+    Log the storage profile and the settings that actually took effect.
+    """
+    profile = get_setting("DB_PROFILE", DEFAULT_STORAGE_PROFILE)
+    requested = get_pool().pragmas
+    effective = get_storage_report()
+    
+    logger.info(
+        "Storage profile '%s': %s",
+        profile,
+        ", ".join(f"{key}={value}" for key, value in effective.items()),
+    )
+    
+    # SQLite silently ignores some pragmas, e.g. WAL on an in-memory database
+    for pragma in ("journal_mode", "temp_store", "synchronous"):
+        if pragma in requested and not _pragma_matches(
+            pragma, requested[pragma], effective.get(pragma)
+        ):
+            logger.warning(
+                "Requested %s=%s but got %s", pragma, requested[pragma], effective.get(pragma)
+            )
+
+def _pragma_matches(pragma: str, requested: Any, effective: Any) -> bool:
+    """
+    Compare a requested pragma value with the value read back from SQLite.
+    
+    Args:
+        pragma: Pragma name
+        requested: Requested value
+        effective: Value reported by SQLite
+        
+    Returns:
+        bool: True if the requested value took effect
+    """
+    if pragma in _PRAGMA_CODES:
+        return _PRAGMA_CODES[pragma].get(str(requested).upper()) == effective
+    return str(requested).upper() == str(effective).upper()
 
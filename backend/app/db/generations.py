@@ -0,0 +1,120 @@
+"""
+Cross-process change markers for cached rows.
+
+Every process caches rows in memory, so a write in one server worker has to
+reach the caches of the others. Each cached table has a block of 64-bit
+slots in a small file next to the database (``app.db-gen``) that every
+process maps into memory. After a write commits, the slot its key hashes to,
+or the table's own slot for writes to unknown keys, is set to a fresh
+random value. A cached row is stored with its table and key slot values from
+before it was read, and is only served while both are unchanged.
+
+Keys share slots, so a write can also expire unrelated rows, but it never
+leaves a stale one in place. Slots are overwritten rather than incremented,
+so writers need no lock: a fresh random value never repeats one a reader
+has seen.
+"""
+import mmap
+import os
+import random
+import struct
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from backend.app.db.database import get_db_path
+
+# Tables whose rows are cached by the models
+CACHED_TABLES = ("users", "items")
+
+# Key slots per table
+SLOTS = 4096
+
+# One slot value
+_SLOT = struct.Struct("Q")
+
+# Slot values a cached row was read under: (table slot, key slot)
+Generation = Tuple[int, int]
+
+class Generations:
+    """Shared change markers for the rows of some tables."""
+    
+    def __init__(self, path: Optional[str], tables: Sequence[str], slots: int = SLOTS):
+        """
+        Map the slot file, creating it if needed.
+        
+        Args:
+            path: Slot file, or None for memory shared only with forked children
+            tables: Table names
+            slots: Key slots per table
+        """
+        self.path = path
+        self.slots = slots
+        self._bases: Dict[str, int] = {
+            table: index * (slots + 1) * _SLOT.size for index, table in enumerate(tables)
+        }
+        size = len(tables) * (slots + 1) * _SLOT.size
+        
+        if path is None:
+            self._map = mmap.mmap(-1, size)
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                # Growing is safe while other processes map the file; shrinking is not
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._map = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+                
+    def get(self, table: str, key: int) -> Generation:
+        """
+        Read the slots a row depends on; read them before the row itself.
+        
+        Args:
+            table: Table name
+            key: Integer primary key
+            
+        Returns:
+            Generation: (table slot, key slot) values
+        """
+        base = self._bases[table]
+        return (
+            _SLOT.unpack_from(self._map, base)[0],
+            _SLOT.unpack_from(self._map, base + _SLOT.size * (1 + key % self.slots))[0],
+        )
+        
+    def bump(self, table: str, key: Optional[int] = None) -> None:
+        """
+        Expire cached rows after a write has committed.
+        
+        Args:
+            table: Table name
+            key: Integer primary key, or None to expire every row of the table
+        """
+        offset = self._bases[table]
+        if key is not None:
+            offset += _SLOT.size * (1 + key % self.slots)
+        _SLOT.pack_into(self._map, offset, random.getrandbits(64))
+
+# Created on first use, next to the database
+_generations: Optional[Generations] = None
+_lock = threading.Lock()
+
+def get_generations() -> Generations:
+    """
+    Get the change markers for the cached tables.
+    
+    Returns:
+        Generations: Markers shared by every process using the database
+    """
+    global _generations
+    
+    if _generations is None:
+        with _lock:
+            if _generations is None:
+                db_path = get_db_path()
+                in_memory = db_path == ":memory:" or db_path.startswith("file:")
+                _generations = Generations(None if in_memory else f"{db_path}-gen", CACHED_TABLES)
+                
+    return _generations
+
@@ -0,0 +1,123 @@
+"""
+Per-query database metrics.
+
+Statements are labelled by their normalized SQL: whitespace is collapsed and
+literals and ``IN (...)`` lists are replaced by placeholders, so every call
+site maps to one small, stable label set.
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from backend.app.utils.metrics import get_prometheus_client, metrics_enabled
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN \((?:\?, )*\?\)", re.IGNORECASE)
+
+# Latency buckets from 100us to 10s
+_DURATION_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5, 5.0, 10.0,
+)
+_ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """
+    Normalize a statement for use as a metric label.
+    
+    Args:
+        query: SQL query
+        
+    Returns:
+        str: Query with collapsed whitespace and placeholders for literals
+    """
+    query = _WHITESPACE.sub(" ", query).strip()
+    query = _LITERALS.sub("?", query)
+    return _IN_LISTS.sub("IN (?)", query)
+
+class QueryMetrics:
+    """Prometheus metrics for database statements."""
+    
+    def __init__(self) -> None:
+        prometheus_client = get_prometheus_client()
+        self.duration = prometheus_client.Histogram(
+            "db_query_duration_seconds",
+            "Time spent executing and fetching a statement",
+            ["statement"],
+            buckets=_DURATION_BUCKETS,
+        )
+        self.rows = prometheus_client.Histogram(
+            "db_query_rows",
+            "Rows returned (reads) or affected (writes) per statement",
+            ["statement"],
+            buckets=_ROW_BUCKETS,
+        )
+        self.errors = prometheus_client.Counter(
+            "db_query_errors",
+            "Statements that raised an error",
+            ["statement", "error"],
+        )
+        self.acquire = prometheus_client.Histogram(
+            "db_connection_acquire_seconds",
+            "Time spent waiting for a pooled connection",
+            buckets=_DURATION_BUCKETS,
+        )
+        
+    def observe(self, query: str, seconds: float, rows: int) -> None:
+        """
+        Record a completed statement.
+        
+        Args:
+            query: SQL query
+            seconds: Execution time
+            rows: Rows returned or affected
+        """
+        statement = normalize_sql(query)
+        self.duration.labels(statement).observe(seconds)
+        if rows >= 0:
+            self.rows.labels(statement).observe(rows)
+            
+    def observe_error(self, query: str, error: BaseException) -> None:
+        """
+        Record a failed statement.
+        
+        Args:
+            query: SQL query
+            error: Raised exception
+        """
+        self.errors.labels(normalize_sql(query), type(error).__name__).inc()
+        
+    def observe_acquire(self, seconds: float) -> None:
+        """
+        Record a connection checkout.
+        
+        Args:
+            seconds: Time spent waiting for the connection
+        """
+        self.acquire.observe(seconds)
+
+# Created on first use; None when metrics are disabled
+_query_metrics: Optional[QueryMetrics] = None
+_resolved = False
+_lock = threading.Lock()
+
+def get_query_metrics() -> Optional[QueryMetrics]:
+    """
+    Get the query metrics, if enabled.
+    
+    Returns:
+        Optional[QueryMetrics]: Metrics, or None when metrics are disabled
+    """
+    global _query_metrics, _resolved
+    
+    if not _resolved:
+        with _lock:
+            if not _resolved:
+                _query_metrics = QueryMetrics() if metrics_enabled() else None
+                _resolved = True
+                
+    return _query_metrics
+
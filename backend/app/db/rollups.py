@@ -0,0 +1,159 @@
+"""
+Trigger-maintained rollup tables.
+
+Row counts, items per user and items per day are kept up to date by the
+triggers in ``schema.sql``, so reading them is a primary key lookup rather
+than a scan. Each rollup here pairs its table with the query that recomputes
+it from the base tables, which is used to check and rebuild it, also from
+the command line:
+
+    python -m backend.app.db rollups check|rebuild
+"""
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from backend.app.db.database import execute_query, transaction
+from backend.app.utils.logging import logger
+
+class Rollup(NamedTuple):
+    """A rollup table and the query that recomputes it."""
+    
+    table: str
+    columns: Tuple[str, ...]
+    
+    # Rows in ``columns`` order, computed from the base tables
+    expected: str
+    
+    # Stored rows that carry no information, e.g. a count that dropped to 0
+    empty: Optional[str] = None
+
+# Rollups by table name
+ROLLUPS: Dict[str, Rollup] = {
+    rollup.table: rollup
+    for rollup in (
+        Rollup(
+            "table_counts",
+            ("name", "row_count"),
+            """
+                SELECT 'users', COUNT(*) FROM users
+                UNION ALL SELECT 'items', COUNT(*) FROM items
+            """,
+        ),
+        Rollup(
+            "user_item_counts",
+            ("user_id", "item_count"),
+            "SELECT user_id, COUNT(*) FROM items GROUP BY user_id",
+            empty="item_count = 0",
+        ),
+        Rollup(
+            "item_daily_counts",
+            ("day", "created", "updated"),
+            """
+                SELECT day, SUM(created), SUM(updated) FROM (
+                    SELECT date(created_at) AS day, 1 AS created, 0 AS updated FROM items
+                    UNION ALL
+                    SELECT date(updated_at), 0, 1 FROM items WHERE updated_at > created_at
+                ) GROUP BY day
+            """,
+            empty="created = 0 AND updated = 0",
+        ),
+    )
+}
+
+def _get_rollups(names: Optional[Iterable[str]]) -> Tuple[Rollup, ...]:
+    """
+    Look up rollups by table name.
+    
+    Args:
+        names: Table names, or None for all
+        
+    Returns:
+        Tuple[Rollup, ...]: Rollups
+        
+    Raises:
+        ValueError: If a name is not a rollup table
+    """
+    if names is None:
+        return tuple(ROLLUPS.values())
+        
+    rollups = []
+    for name in names:
+        if name not in ROLLUPS:
+            raise ValueError(f"Unknown rollup: {name}")
+        rollups.append(ROLLUPS[name])
+    return tuple(rollups)
+
+def get_row_count(table: str) -> int:
+    """
+    Get a table's row count from ``table_counts``.
+    
+    Args:
+        table: Table name
+        
+    Returns:
+        int: Number of rows
+    """
+    row = execute_query(
+        "SELECT row_count FROM table_counts WHERE name = ?",
+        (table,),
+        fetch_one=True,
+        raw=True,
+    )
+    return row[0] if row else 0
+
+def check_rollups(names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Compare rollup tables with counts recomputed from the base tables.
+    
+    Each recount scans its base table. All of them read one snapshot, so
+    writes made during the check do not show up as mismatches.
+    
+    Args:
+        names: Rollup tables to check, or None for all
+        
+    Returns:
+        Dict[str, int]: Number of keys whose row is missing, stale or extra, by table
+    """
+    mismatches = {}
+    with transaction(immediate=False):
+        for rollup in _get_rollups(names):
+            columns = ", ".join(rollup.columns)
+            stored = f"SELECT {columns} FROM {rollup.table}"
+            if rollup.empty:
+                stored += f" WHERE NOT ({rollup.empty})"
+                
+            key = rollup.columns[0]
+            query = f"""
+                WITH expected ({columns}) AS ({rollup.expected}),
+                    stored ({columns}) AS ({stored})
+                SELECT COUNT(DISTINCT {key}) FROM (
+                    SELECT {key} FROM (SELECT * FROM expected EXCEPT SELECT * FROM stored)
+                    UNION ALL
+                    SELECT {key} FROM (SELECT * FROM stored EXCEPT SELECT * FROM expected)
+                )
+            """
+            mismatches[rollup.table] = execute_query(query, fetch_one=True, raw=True)[0]
+            
+    for table, count in mismatches.items():
+        if count:
+            logger.warning("Rollup %s has %d row(s) that do not match the tables", table, count)
+    return mismatches
+
+def rebuild_rollups(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Recompute rollup tables from the base tables.
+    
+    Runs in one write transaction, so no write is counted twice or missed.
+    
+    Args:
+        names: Rollup tables to rebuild, or None for all
+    """
+    rollups = _get_rollups(names)
+    with transaction():
+        for rollup in rollups:
+            execute_query(f"DELETE FROM {rollup.table}")
+            execute_query(
+                f"INSERT INTO {rollup.table} ({', '.join(rollup.columns)}) {rollup.expected}"
+            )
+            
+    logger.info("Rebuilt rollups: %s", ", ".join(rollup.table for rollup in rollups))
+
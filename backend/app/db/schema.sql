@@ -44,16 +44,136 @@ CREATE INDEX IF NOT EXISTS idx_items_user_id ON items (user_id);
 CREATE INDEX IF NOT EXISTS idx_api_tokens_token ON api_tokens (token);
 CREATE INDEX IF NOT EXISTS idx_api_tokens_user_id ON api_tokens (user_id);
 
--- Create triggers for updated_at
-CREATE TRIGGER IF NOT EXISTS users_updated_at
-AFTER UPDATE ON users
-BEGIN
-    UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+-- updated_at is set by the UPDATE statements themselves; drop the
+-- triggers that used to issue a second UPDATE per row
+DROP TRIGGER IF EXISTS users_updated_at;
+DROP TRIGGER IF EXISTS items_updated_at;
+
+-- Full-text index over item names and descriptions. The index stores no
+-- copy of the text (content='items') and is kept in sync by the triggers
+-- below. prefix='2 3' adds prefix indexes so short "term*" queries do not
+-- walk the whole term list. CREATE ... IF NOT EXISTS does not change an
+-- existing table: drop it here to change the tokenizer or columns.
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    name,
+    description,
+    content='items',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, name, description)
+    VALUES (new.id, new.name, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description)
+    VALUES ('delete', old.id, old.name, old.description);
+END;
+
+-- Only fires when the indexed text is in the SET list
+CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, description ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description)
+    VALUES ('delete', old.id, old.name, old.description);
+    INSERT INTO items_fts (rowid, name, description)
+    VALUES (new.id, new.name, new.description);
+END;
+
+-- Rank matches in the name ten times higher than in the description
+INSERT INTO items_fts (items_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+
+-- Index rows written before the index existed. This only runs when the
+-- schema version changes; see backend/app/db/search.py for a manual rebuild.
+INSERT INTO items_fts (items_fts) VALUES ('rebuild');
+
+-- Rollups maintained by the triggers below, so counts are read in O(1)
+-- instead of scanning. backend/app/db/rollups.py checks them against the
+-- tables and rebuilds them.
+
+-- Row counts by table name
+CREATE TABLE IF NOT EXISTS table_counts (
+    name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Items per user; users without items have no row
+CREATE TABLE IF NOT EXISTS user_item_counts (
+    user_id INTEGER PRIMARY KEY,
+    item_count INTEGER NOT NULL
+);
+
+-- Items by the day they were created, and by the day they were last
+-- updated (for items updated after the second they were created)
+CREATE TABLE IF NOT EXISTS item_daily_counts (
+    day TEXT PRIMARY KEY,
+    created INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON users BEGIN
+    UPDATE table_counts SET row_count = row_count + 1 WHERE name = 'users';
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON users BEGIN
+    UPDATE table_counts SET row_count = row_count - 1 WHERE name = 'users';
+    DELETE FROM user_item_counts WHERE user_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_count_insert AFTER INSERT ON items BEGIN
+    UPDATE table_counts SET row_count = row_count + 1 WHERE name = 'items';
+    INSERT INTO user_item_counts (user_id, item_count) VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET item_count = item_count + 1;
+    INSERT INTO item_daily_counts (day, created) VALUES (date(new.created_at), 1)
+        ON CONFLICT (day) DO UPDATE SET created = created + 1;
+    INSERT INTO item_daily_counts (day, updated)
+        SELECT date(new.updated_at), 1 WHERE new.updated_at > new.created_at
+        ON CONFLICT (day) DO UPDATE SET updated = updated + 1;
 END;
 
-CREATE TRIGGER IF NOT EXISTS items_updated_at
-AFTER UPDATE ON items
-BEGIN
-    UPDATE items SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+CREATE TRIGGER IF NOT EXISTS items_count_delete AFTER DELETE ON items BEGIN
+    UPDATE table_counts SET row_count = row_count - 1 WHERE name = 'items';
+    UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = old.user_id;
+    UPDATE item_daily_counts SET created = created - 1 WHERE day = date(old.created_at);
+    UPDATE item_daily_counts SET updated = updated - 1
+        WHERE day = date(old.updated_at) AND old.updated_at > old.created_at;
 END;
 
+CREATE TRIGGER IF NOT EXISTS items_count_move AFTER UPDATE OF user_id ON items
+WHEN old.user_id IS NOT new.user_id BEGIN
+    UPDATE user_item_counts SET item_count = item_count - 1 WHERE user_id = old.user_id;
+    INSERT INTO user_item_counts (user_id, item_count) VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET item_count = item_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_count_touch AFTER UPDATE OF created_at, updated_at ON items
+WHEN old.created_at IS NOT new.created_at OR old.updated_at IS NOT new.updated_at BEGIN
+    UPDATE item_daily_counts SET created = created - 1 WHERE day = date(old.created_at);
+    UPDATE item_daily_counts SET updated = updated - 1
+        WHERE day = date(old.updated_at) AND old.updated_at > old.created_at;
+    INSERT INTO item_daily_counts (day, created) VALUES (date(new.created_at), 1)
+        ON CONFLICT (day) DO UPDATE SET created = created + 1;
+    INSERT INTO item_daily_counts (day, updated)
+        SELECT date(new.updated_at), 1 WHERE new.updated_at > new.created_at
+        ON CONFLICT (day) DO UPDATE SET updated = updated + 1;
+END;
+
+-- Recount from the tables. This only runs when the schema version changes;
+-- see backend/app/db/rollups.py to check or rebuild them by hand.
+DELETE FROM table_counts;
+INSERT INTO table_counts (name, row_count)
+SELECT 'users', COUNT(*) FROM users
+UNION ALL SELECT 'items', COUNT(*) FROM items;
+
+DELETE FROM user_item_counts;
+INSERT INTO user_item_counts (user_id, item_count)
+SELECT user_id, COUNT(*) FROM items GROUP BY user_id;
+
+DELETE FROM item_daily_counts;
+INSERT INTO item_daily_counts (day, created, updated)
+SELECT day, SUM(created), SUM(updated) FROM (
+    SELECT date(created_at) AS day, 1 AS created, 0 AS updated FROM items
+    UNION ALL
+    SELECT date(updated_at), 0, 1 FROM items WHERE updated_at > created_at
+) GROUP BY day;
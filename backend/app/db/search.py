@@ -0,0 +1,108 @@
+"""
+Full-text search index maintenance.
+
+Item names and descriptions are indexed by the ``items_fts`` FTS5 table in
+``schema.sql``, which triggers keep in step with every insert, update and
+delete. The index can be rebuilt from the table, merged into fewer segments,
+or checked against the table, also from the command line:
+
+    python -m backend.app.db search rebuild|optimize|check
+"""
+import sqlite3
+
+from backend.app.db.database import execute_query
+from backend.app.utils.logging import logger
+
+# FTS5 tables maintained by triggers in schema.sql
+SEARCH_INDEXES = ("items_fts",)
+
+def build_match_query(text: str, prefix: bool = False) -> str:
+    """
+    Build an FTS5 ``MATCH`` expression from plain search text.
+    
+    Every word must match. Words are quoted, so FTS5 operators and
+    punctuation in the input are searched for as text rather than parsed. A
+    word ending in ``*`` matches any term starting with it, e.g. ``wid*``.
+    
+    Args:
+        text: Search text
+        prefix: Also treat the last word as a prefix, for search-as-you-type
+        
+    Returns:
+        str: ``MATCH`` expression
+        
+    Raises:
+        ValueError: If the text has no words
+    """
+    words = text.split()
+    terms = []
+    for index, word in enumerate(words):
+        is_prefix = word.endswith("*") or (prefix and index == len(words) - 1)
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if is_prefix else ""))
+            
+    if not terms:
+        raise ValueError("Search query is empty")
+    return " ".join(terms)
+
+def _check_index(index: str) -> None:
+    """
+    Reject names that are not search indexes, since they are interpolated into SQL.
+    
+    Args:
+        index: FTS5 table name
+        
+    Raises:
+        ValueError: If the table is not in ``SEARCH_INDEXES``
+    """
+    if index not in SEARCH_INDEXES:
+        raise ValueError(f"Unknown search index: {index}")
+
+def rebuild_search_index(index: str = "items_fts") -> None:
+    """
+    Rebuild a search index from its content table.
+    
+    Use after writing to the content table with the triggers bypassed, or if
+    ``check_search_index`` reports a mismatch.
+    
+    Args:
+        index: FTS5 table name
+    """
+    _check_index(index)
+    execute_query(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+    logger.info("Rebuilt search index %s", index)
+
+def optimize_search_index(index: str = "items_fts") -> None:
+    """
+    Merge a search index into a single b-tree.
+    
+    Many small writes leave the index in many segments, each of which a
+    query has to visit; merging them makes queries faster until the next
+    round of writes.
+    
+    Args:
+        index: FTS5 table name
+    """
+    _check_index(index)
+    execute_query(f"INSERT INTO {index} ({index}) VALUES ('optimize')")
+    logger.info("Optimized search index %s", index)
+
+def check_search_index(index: str = "items_fts") -> bool:
+    """
+    Check that a search index matches its content table.
+    
+    Args:
+        index: FTS5 table name
+        
+    Returns:
+        bool: True if the index is consistent
+    """
+    _check_index(index)
+    try:
+        execute_query(f"INSERT INTO {index} ({index}, rank) VALUES ('integrity-check', 1)")
+    except sqlite3.DatabaseError as e:
+        logger.error("Search index %s does not match its table: %s", index, e)
+        return False
+    return True
+
@@ -0,0 +1,307 @@
+"""
+Slow query log.
+
+Statements that run for longer than ``DB_SLOW_QUERY_MS`` are recorded with
+their redacted parameters and ``EXPLAIN QUERY PLAN`` output. Records are
+written as JSON lines to a dedicated rotating log and kept in an in-memory
+ring buffer, so recent slow queries can be inspected without log access.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from backend.app.config import Settings, get_setting, get_settings, subscribe
+from backend.app.db.metrics import normalize_sql
+from backend.app.utils.logging import attach_queued_handlers, logger
+
+# Plan steps that visit every row of a table, e.g. ``SCAN items``. Virtual
+# tables report their own index, e.g. ``SCAN items_fts VIRTUAL TABLE INDEX 0:M2``
+# for a full-text match; only a scan with an empty index string is full.
+_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE INDEX \d+:\S)")
+
+class SlowQuery(NamedTuple):
+    """A statement that exceeded the slow query threshold."""
+    
+    timestamp: float
+    statement: str
+    params: Tuple[Any, ...]
+    duration_ms: float
+    rows: int
+    plan: Tuple[str, ...]
+    full_scans: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to a dictionary.
+        
+        Returns:
+            Dict[str, Any]: Record data
+        """
+        return {
+            "timestamp": self.timestamp,
+            "statement": self.statement,
+            "params": list(self.params),
+            "duration_ms": self.duration_ms,
+            "rows": self.rows,
+            "plan": list(self.plan),
+            "full_scans": list(self.full_scans),
+        }
+
+def redact_params(params: Optional[Sequence[Any]]) -> Tuple[Any, ...]:
+    """
+    Redact query parameters for logging.
+    
+    Numbers and NULLs are kept, since they are IDs, limits and flags. Text and
+    blobs are replaced by their type and length.
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        Tuple[Any, ...]: Redacted parameters
+    """
+    return tuple(
+        value if value is None or isinstance(value, (int, float))
+        else f"<{type(value).__name__} len={len(value)}>" if isinstance(value, (str, bytes))
+        else f"<{type(value).__name__}>"
+        for value in params or ()
+    )
+
+def explain(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+) -> Tuple[str, ...]:
+    """
+    Get the query plan for a statement.
+    
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Query parameters
+        
+    Returns:
+        Tuple[str, ...]: Plan steps, indented by nesting depth
+    """
+    depths = {0: -1}
+    steps = []
+    for step_id, parent, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {query}", params or ()):
+        depth = depths.get(parent, -1) + 1
+        depths[step_id] = depth
+        steps.append("  " * depth + detail)
+    return tuple(steps)
+
+def find_full_scans(plan: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Find the tables a plan reads in full.
+    
+    Args:
+        plan: Plan steps from ``explain``
+        
+    Returns:
+        Tuple[str, ...]: Scanned tables
+    """
+    scans = []
+    for step in plan:
+        match = _FULL_SCAN.match(step.lstrip())
+        if match:
+            scans.append(match.group(1))
+    return tuple(scans)
+
+class SlowQueryLog:
+    """Recorder for statements that exceed a duration threshold."""
+    
+    def __init__(
+        self,
+        threshold: float,
+        buffer_size: int = 100,
+        log_file: Optional[str] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ):
+        """
+        Create a slow query log.
+        
+        Args:
+            threshold: Duration in seconds above which a statement is recorded
+            buffer_size: Number of recent records kept in memory
+            log_file: Path of the rotating JSON lines log, or None for memory only
+            max_bytes: Size at which the log file is rotated
+            backup_count: Number of rotated files kept
+        """
+        self.threshold = threshold
+        self._records: Deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._log: Optional[logging.Logger] = None
+        
+        if log_file:
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+                
+            handler = RotatingFileHandler(
+                log_file,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log = logging.getLogger("backend.slow_queries")
+            self._log.setLevel(logging.INFO)
+            self._log.propagate = False
+            attach_queued_handlers(self._log, [handler])
+            
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        query: str,
+        params: Optional[Sequence[Any]],
+        seconds: float,
+        rows: int,
+    ) -> SlowQuery:
+        """
+        Record a slow statement and capture its query plan.
+        
+        Args:
+            conn: Connection the statement ran on
+            query: SQL query
+            params: Query parameters
+            seconds: Execution time
+            rows: Rows returned or affected
+            
+        Returns:
+            SlowQuery: Recorded entry
+        """
+        try:
+            plan = explain(conn, query, params)
+        except sqlite3.Error as e:
+            plan = (f"EXPLAIN failed: {e}",)
+            
+        entry = SlowQuery(
+            timestamp=time.time(),
+            statement=normalize_sql(query),
+            params=redact_params(params),
+            duration_ms=round(seconds * 1000, 3),
+            rows=rows,
+            plan=plan,
+            full_scans=find_full_scans(plan),
+        )
+        
+        with self._lock:
+            self._records.append(entry)
+            
+        if self._log is not None:
+            self._log.info(json.dumps(entry.to_dict()))
+            
+        scans = f", full scan of {', '.join(entry.full_scans)}" if entry.full_scans else ""
+        logger.warning("Slow query (%.1f ms%s): %s", entry.duration_ms, scans, entry.statement)
+        return entry
+        
+    def recent(self, limit: Optional[int] = None, full_scans_only: bool = False) -> List[SlowQuery]:
+        """
+        Get recent slow queries, newest first.
+        
+        Args:
+            limit: Maximum number of records
+            full_scans_only: Only return statements that scanned a whole table
+            
+        Returns:
+            List[SlowQuery]: Records
+        """
+        with self._lock:
+            records = list(reversed(self._records))
+            
+        if full_scans_only:
+            records = [record for record in records if record.full_scans]
+        return records[:limit] if limit is not None else records
+        
+    def clear(self) -> None:
+        """
+        Drop all in-memory records.
+        """
+        with self._lock:
+            self._records.clear()
+
+def _default_log_file() -> str:
+    """
+    Get the default slow query log path, next to the application log.
+    
+    Returns:
+        str: Log file path
+    """
+    log_file = get_setting("LOG_FILE", "logs/backend.log")
+    return os.path.join(os.path.dirname(log_file) or ".", "slow_queries.log")
+
+# Created on first use while enabled; kept when disabled by a reload
+_slow_query_log: Optional[SlowQueryLog] = None
+_resolved = False
+_lock = threading.Lock()
+
+def get_slow_query_log() -> Optional[SlowQueryLog]:
+    """
+    Get the slow query log, if enabled.
+    
+    Returns:
+        Optional[SlowQueryLog]: Log, or None when ``DB_SLOW_QUERY_MS`` is 0
+    """
+    global _slow_query_log, _resolved
+    
+    if not _resolved:
+        with _lock:
+            if not _resolved:
+                threshold_ms = get_settings().db_slow_query_ms
+                if threshold_ms > 0:
+                    _slow_query_log = SlowQueryLog(
+                        threshold_ms / 1000,
+                        buffer_size=int(get_setting("DB_SLOW_QUERY_BUFFER", 100)),
+                        log_file=get_setting("DB_SLOW_QUERY_LOG", _default_log_file()),
+                        max_bytes=int(get_setting("DB_SLOW_QUERY_LOG_MAX_BYTES", 10485760)),
+                        backup_count=int(get_setting("DB_SLOW_QUERY_LOG_BACKUPS", 5)),
+                    )
+                _resolved = True
+                
+    slow_log = _slow_query_log
+    return slow_log if slow_log is not None and slow_log.threshold > 0 else None
+
+def _apply_settings(settings: Settings, changed: FrozenSet[str]) -> None:
+    """
+    Apply a reloaded ``DB_SLOW_QUERY_MS``; 0 disables the log.
+    
+    Args:
+        settings: New settings
+        changed: Names of the changed fields
+    """
+    global _resolved
+    
+    if "db_slow_query_ms" not in changed:
+        return
+        
+    with _lock:
+        if _slow_query_log is not None:
+            _slow_query_log.threshold = settings.db_slow_query_ms / 1000
+        else:
+            # Create it on next use if it is now enabled
+            _resolved = False
+
+subscribe(_apply_settings)
+
+def get_slow_queries(limit: Optional[int] = None, full_scans_only: bool = False) -> List[SlowQuery]:
+    """
+    Get recent slow queries from the shared log, newest first.
+    
+    Args:
+        limit: Maximum number of records
+        full_scans_only: Only return statements that scanned a whole table
+        
+    Returns:
+        List[SlowQuery]: Records, empty when the slow query log is disabled
+    """
+    slow_log = get_slow_query_log()
+    return slow_log.recent(limit, full_scans_only) if slow_log else []
+
@@ -2,10 +2,12 @@
 Models package initialization.
 """
 from backend.app.models.user import User
-from backend.app.models.item import Item
+from backend.app.models.item import Item, SearchHit, DailyCount
 
 __all__ = [
     "User",
-    "Item"
+    "Item",
+    "SearchHit",
+    "DailyCount"
 ]
 
@@ -1,14 +1,96 @@
 """
 Item model.
 """
-from typing import Dict, List, Optional, Any
+from html import escape
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
-from backend.app.db import execute_query
-from backend.app.utils import logger
+from backend.app.db import (
+    execute_query,
+    iter_query,
+    execute_many,
+    bulk_insert,
+    transaction,
+    in_transaction,
+    on_commit,
+    get_generations,
+    Generation,
+    build_match_query,
+    get_row_count
+)
+from backend.app.utils import logger, SettingsCache
+
+class SearchHit(NamedTuple):
+    """An item matching a full-text search, in ``Item.COLUMNS`` order plus rank and snippet."""
+    
+    id: int
+    name: str
+    description: Optional[str]
+    user_id: int
+    created_at: str
+    updated_at: str
+    
+    # bm25 score; lower is a better match
+    rank: float
+    
+    # Best matching fragment of the name or description, HTML-escaped, terms marked
+    snippet: str
+    
+    @property
+    def item(self) -> "Item":
+        """
+        Get the matched item.
+        
+        Returns:
+            Item: Item
+        """
+        return Item.from_row(self[:len(Item.COLUMNS)])
+
+class DailyCount(NamedTuple):
+    """Items created and last updated on one day, from the ``item_daily_counts`` rollup."""
+    
+    day: str
+    created: int
+    updated: int
 
 class Item:
     """Item model."""
     
+    # Columns in row order; instances store exactly these attributes
+    COLUMNS = ("id", "name", "description", "user_id", "created_at", "updated_at")
+    __slots__ = COLUMNS
+    
+    # Column lists matching COLUMNS, for raw row queries and writes
+    SELECT = f"SELECT {', '.join(COLUMNS)} FROM items"
+    RETURNING = f"RETURNING {', '.join(COLUMNS)}"
+    
+    # Full-text search over the items_fts index, best match first. The page is
+    # ranked first, so only its rows are joined to items and get a snippet;
+    # CROSS JOIN keeps page as the outer loop, so each snippet is a rowid seek.
+    SEARCH = f"""
+        WITH page AS (
+            SELECT rowid, rank FROM items_fts
+            WHERE items_fts MATCH ? {{after}}
+            ORDER BY rank, rowid
+            LIMIT ?
+        )
+        SELECT {', '.join(f'items.{column}' for column in COLUMNS)}, page.rank,
+            snippet(items_fts, -1, ?, ?, '...', ?)
+        FROM page CROSS JOIN items_fts CROSS JOIN items
+        WHERE items_fts MATCH ? AND items_fts.rowid = page.rowid AND items.id = page.rowid
+        ORDER BY page.rank, page.rowid
+    """
+    
+    # Markers around matched terms in search snippets, and snippet length in tokens
+    SNIPPET_MARKERS = ("<mark>", "</mark>")
+    SNIPPET_TOKENS = 16
+    
+    # What snippet() puts around terms: control characters, which HTML
+    # escaping leaves alone, replaced by SNIPPET_MARKERS after escaping
+    _SNIPPET_PLACEHOLDERS = ("\x02", "\x03")
+    
+    # Read-through cache of item row tuples by ID
+    cache = SettingsCache("items", "item_cache_size", "item_cache_ttl")
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -25,6 +107,49 @@ class Item:
         self.created_at = created_at
         self.updated_at = updated_at
         
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Item":
+        """
+        Build an item from a row in ``COLUMNS`` order.
+        
+        Args:
+            row: Row tuple
+            
+        Returns:
+            Item: Item
+        """
+        return cls.from_rows((row,))[0]
+        
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> List["Item"]:
+        """
+        Build items from rows in ``COLUMNS`` order.
+        
+        Attributes are assigned straight from the row tuples, without the
+        intermediate dict and keyword-argument call of ``cls(**row)``.
+        
+        Args:
+            rows: Row tuples
+            
+        Returns:
+            List[Item]: Items
+        """
+        new = object.__new__
+        items = []
+        append = items.append
+        for row in rows:
+            item = new(cls)
+            (
+                item.id,
+                item.name,
+                item.description,
+                item.user_id,
+                item.created_at,
+                item.updated_at,
+            ) = row
+            append(item)
+        return items
+        
     @classmethod
     def get_by_id(cls, item_id: int) -> Optional["Item"]:
         """
@@ -36,13 +161,139 @@ class Item:
         Returns:
             Optional[Item]: Item if found, None otherwise
         """
-        query = "SELECT * FROM items WHERE id = ?"
-        result = execute_query(query, (item_id,), fetch_one=True)
+        # A transaction must see its own writes, which the cache may not
+        generation = None if in_transaction() else get_generations().get("items", item_id)
+        row = cls._get_cached(item_id, generation)
         
-        if result:
-            return cls(**result)
+        if row is None:
+            query = f"{cls.SELECT} WHERE id = ?"
+            row = execute_query(query, (item_id,), fetch_one=True, raw=True)
+            if row:
+                cls._cache_row(row, generation)
+                
+        if row:
+            return cls.from_row(row)
         return None
         
+    @classmethod
+    def _get_cached(
+        cls,
+        item_id: int,
+        generation: Optional[Generation],
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        Get a cached row if no process has changed it since it was cached.
+        
+        Args:
+            item_id: Item ID
+            generation: Current generation of the row, or None to bypass the cache
+            
+        Returns:
+            Optional[Tuple[Any, ...]]: Row, or None on a miss
+        """
+        if generation is None:
+            return None
+        entry = cls.cache.get(item_id)
+        if entry is None or entry[0] != generation:
+            return None
+        return entry[1]
+        
+    @classmethod
+    def _cache_row(cls, row: Tuple[Any, ...], generation: Optional[Generation]) -> None:
+        """
+        Cache a freshly read row.
+        
+        Args:
+            row: Row in ``COLUMNS`` order
+            generation: Generation of the row read before the row itself, or
+                None inside ``transaction()``, whose rows may never commit
+        """
+        if generation is not None:
+            cls.cache.set(row[0], (generation, row))
+            
+    @classmethod
+    def invalidate(cls, item_id: int) -> None:
+        """
+        Drop an item from the cache of every process.
+        
+        Inside ``transaction()`` other processes are told on commit, since
+        until then they may cache the committed row again.
+        
+        Args:
+            item_id: Item ID
+        """
+        cls.cache.delete(item_id)
+        on_commit(get_generations().bump, "items", item_id)
+        
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        Drop every item from the cache of every process, e.g. after a cascade.
+        """
+        cls.cache.clear()
+        get_generations().bump("items")
+        
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Stats for the row cache
+        """
+        return {"rows": cls.cache.stats()}
+        
+    @classmethod
+    def count(cls) -> int:
+        """
+        Count items, from the trigger-maintained ``table_counts`` rollup.
+        
+        Returns:
+            int: Number of items
+        """
+        return get_row_count("items")
+        
+    @classmethod
+    def count_by_user_id(cls, user_id: int) -> int:
+        """
+        Count a user's items, from the trigger-maintained ``user_item_counts`` rollup.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            int: Number of items
+        """
+        query = "SELECT item_count FROM user_item_counts WHERE user_id = ?"
+        row = execute_query(query, (user_id,), fetch_one=True, raw=True)
+        
+        return row[0] if row else 0
+        
+    @classmethod
+    def get_daily_counts(cls, since: str, until: str) -> List[DailyCount]:
+        """
+        Get item counts per day, from the trigger-maintained ``item_daily_counts`` rollup.
+        
+        ``created`` counts current items by the day they were created, and
+        ``updated`` by the day they were last updated, if that was after the
+        second they were created. Days without either are omitted.
+        
+        Args:
+            since: First day, ``YYYY-MM-DD``
+            until: Last day, ``YYYY-MM-DD``
+            
+        Returns:
+            List[DailyCount]: Counts by day, oldest first
+        """
+        query = """
+            SELECT day, created, updated FROM item_daily_counts
+            WHERE day BETWEEN ? AND ? AND (created != 0 OR updated != 0)
+            ORDER BY day
+        """
+        rows = execute_query(query, (since, until), fetch=True, raw=True)
+        
+        return [DailyCount._make(row) for row in rows]
+        
     @classmethod
     def get_by_user_id(cls, user_id: int) -> List["Item"]:
         """
@@ -54,10 +305,10 @@ class Item:
         Returns:
             List[Item]: List of items
         """
-        query = "SELECT * FROM items WHERE user_id = ?"
-        results = execute_query(query, (user_id,), fetch=True)
+        query = f"{cls.SELECT} WHERE user_id = ?"
+        rows = execute_query(query, (user_id,), fetch=True, raw=True)
         
-        return [cls(**result) for result in results]
+        return cls.from_rows(rows)
         
     @classmethod
     def get_all(cls) -> List["Item"]:
@@ -67,10 +318,124 @@ class Item:
         Returns:
             List[Item]: List of items
         """
-        query = "SELECT * FROM items"
-        results = execute_query(query, fetch=True)
+        rows = execute_query(cls.SELECT, fetch=True, raw=True)
         
-        return [cls(**result) for result in results]
+        return cls.from_rows(rows)
+        
+    @classmethod
+    def iter_all(cls, batch_size: Optional[int] = None) -> Iterator["Item"]:
+        """
+        Iterate over all items in ID order.
+        
+        Memory use is bounded by ``batch_size`` rather than the table size.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Item: Item
+        """
+        for row in cls.iter_rows(batch_size):
+            yield cls.from_row(row)
+            
+    @classmethod
+    def iter_rows(cls, batch_size: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over all items as raw rows in ``COLUMNS`` order, by ID.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator[Tuple[Any, ...]]: Row tuples
+        """
+        query = f"{cls.SELECT} ORDER BY id"
+        return iter_query(query, batch_size=batch_size, raw=True)
+        
+    @classmethod
+    def get_page(
+        cls,
+        limit: int = 50,
+        after: Optional[int] = None,
+    ) -> Tuple[List["Item"], Optional[int]]:
+        """
+        Get a page of items ordered by ID.
+        
+        Args:
+            limit: Maximum number of items
+            after: Only return items with a greater ID
+            
+        Returns:
+            Tuple[List[Item], Optional[int]]: (items, ID to pass as ``after`` for the
+                next page, or None on the last page)
+        """
+        query = f"{cls.SELECT} WHERE id > ? ORDER BY id LIMIT ?"
+        rows = execute_query(query, (after or 0, limit + 1), fetch=True, raw=True)
+        
+        items = cls.from_rows(rows[:limit])
+        next_after = items[-1].id if len(rows) > limit else None
+        
+        return items, next_after
+        
+    @classmethod
+    def search(
+        cls,
+        query: str,
+        limit: int = 50,
+        cursor: Optional[Tuple[float, int]] = None,
+        prefix: bool = False,
+    ) -> Tuple[List[SearchHit], Optional[Tuple[float, int]]]:
+        """
+        Search item names and descriptions.
+        
+        Hits are ordered by bm25 rank, with matches in the name weighted above
+        matches in the description, then by ID. Only matching rows are read,
+        through the ``items_fts`` index.
+        
+        Args:
+            query: Search text, see ``build_match_query``
+            limit: Maximum number of hits
+            cursor: (rank, ID) of the last hit on the previous page
+            prefix: Treat the last word as a prefix, for search-as-you-type
+            
+        Returns:
+            Tuple[List[SearchHit], Optional[Tuple[float, int]]]: (hits, cursor for
+                the next page, or None on the last page)
+                
+        Raises:
+            ValueError: If the query has no words
+        """
+        match = build_match_query(query, prefix)
+        start, end = cls._SNIPPET_PLACEHOLDERS
+        if cursor is None:
+            sql = cls.SEARCH.format(after="")
+            params: Tuple[Any, ...] = (match,)
+        else:
+            # Ranks change as the index changes, so pages are only exact while it does not
+            sql = cls.SEARCH.format(after="AND (rank, rowid) > (?, ?)")
+            params = (match, *cursor)
+            
+        params += (limit + 1, start, end, cls.SNIPPET_TOKENS, match)
+        rows = execute_query(sql, params, fetch=True, raw=True)
+        
+        hits = [SearchHit._make((*row[:-1], cls._mark_snippet(row[-1]))) for row in rows[:limit]]
+        next_cursor = (hits[-1].rank, hits[-1].id) if len(rows) > limit else None
+        
+        return hits, next_cursor
+        
+    @classmethod
+    def _mark_snippet(cls, snippet: Optional[str]) -> str:
+        """
+        Escape a snippet for HTML and mark its matched terms.
+        
+        Args:
+            snippet: Snippet with ``_SNIPPET_PLACEHOLDERS`` around matched terms
+            
+        Returns:
+            str: Escaped snippet with ``SNIPPET_MARKERS`` around matched terms
+        """
+        (start, end), (marked_start, marked_end) = cls._SNIPPET_PLACEHOLDERS, cls.SNIPPET_MARKERS
+        return escape(snippet or "").replace(start, marked_start).replace(end, marked_end)
         
     @classmethod
     def create(
@@ -78,7 +443,7 @@ class Item:
         name: str,
         user_id: int,
         description: Optional[str] = None,
-    ) -> Optional["Item"]:
+    ) -> "Item":
         """
         Create a new item.
         
@@ -88,31 +453,145 @@ class Item:
             description: Item description
             
         Returns:
-            Optional[Item]: Created item if successful, None otherwise
+            Item: Created item
+            
+        Raises:
+            ConstraintViolation: If the user does not exist
         """
         # Insert item
-        query = """
+        query = f"""
             INSERT INTO items (name, description, user_id)
             VALUES (?, ?, ?)
+            {cls.RETURNING}
         """
-        result = execute_query(
+        row = execute_query(
             query,
             (name, description, user_id),
+            fetch_one=True,
+            raw=True,
         )
         
-        if result and "id" in result:
-            return cls.get_by_id(result["id"])
-        return None
+        # Not cached: it is read through on first use, with its generation
+        return cls.from_row(row)
+        
+    @classmethod
+    def bulk_create(
+        cls,
+        items: Iterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Create many items in a single transaction.
+        
+        Args:
+            items: Item fields (``name``, ``user_id`` and optional ``description``)
+            chunk_size: Rows per batch, defaults to the ``DB_BULK_CHUNK_SIZE`` setting
+            
+        Returns:
+            List[int]: Created item IDs, in input order
+        """
+        query = """
+            INSERT INTO items (name, description, user_id)
+            VALUES (?, ?, ?)
+        """
+        rows = (
+            (item["name"], item.get("description"), item["user_id"])
+            for item in items
+        )
+        
+        return bulk_insert(query, rows, chunk_size)
+        
+    @classmethod
+    def bulk_update(
+        cls,
+        updates: Iterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Update many items in a single transaction.
+        
+        Args:
+            updates: Item ``id`` plus the fields to update
+            chunk_size: Rows per batch, defaults to the ``DB_BULK_CHUNK_SIZE`` setting
+            
+        Returns:
+            int: Number of items updated
+            
+        Raises:
+            ValueError: If an update has no ``id``; nothing is updated
+        """
+        # Group rows by the set of fields they update
+        groups: Dict[Tuple[str, ...], List[Tuple[Any, ...]]] = {}
+        for update in updates:
+            if update.get("id") is None:
+                raise ValueError("each update requires an id")
+                
+            fields = tuple(
+                key for key in ("name", "description", "user_id") if key in update
+            )
+            if not fields:
+                logger.warning("No valid fields to update for item %s", update.get("id"))
+                continue
+            groups.setdefault(fields, []).append(
+                tuple(update[key] for key in fields) + (update["id"],)
+            )
+            
+        updated = 0
+        with transaction():
+            for fields, rows in groups.items():
+                assignments = ", ".join(f"{key} = ?" for key in fields)
+                query = (
+                    f"UPDATE items SET {assignments}, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ?"
+                )
+                updated += execute_many(query, rows, chunk_size)
+                
+        for rows in groups.values():
+            for row in rows:
+                cls.invalidate(row[-1])
+                
+        return updated
+        
+    @classmethod
+    def bulk_delete(
+        cls,
+        item_ids: Iterable[int],
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Delete many items in a single transaction.
+        
+        Args:
+            item_ids: Item IDs
+            chunk_size: Rows per batch, defaults to the ``DB_BULK_CHUNK_SIZE`` setting
+            
+        Returns:
+            int: Number of items deleted
+        """
+        query = "DELETE FROM items WHERE id = ?"
+        item_ids = list(item_ids)
+        
+        deleted = execute_many(query, ((item_id,) for item_id in item_ids), chunk_size)
+        
+        for item_id in item_ids:
+            cls.invalidate(item_id)
+            
+        return deleted
         
     def update(self, **kwargs: Any) -> bool:
         """
         Update the item.
         
+        ``updated_at`` is set and the new row read back in the same statement.
+        
         Args:
             **kwargs: Fields to update
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            ConstraintViolation: If the new user does not exist
         """
         if not self.id:
             logger.warning("Cannot update item without ID")
@@ -132,17 +611,22 @@ class Item:
             return False
             
         # Update item
-        query = f"UPDATE items SET {', '.join(fields)} WHERE id = ?"
+        query = f"""
+            UPDATE items SET {', '.join(fields)}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            {self.RETURNING}
+        """
         values.append(self.id)
         
-        execute_query(query, tuple(values))
-        
-        # Refresh item
-        updated_item = self.get_by_id(self.id)
-        if updated_item:
-            self.__dict__.update(updated_item.__dict__)
-            return True
-        return False
+        row = execute_query(query, tuple(values), fetch_one=True, raw=True)
+        self.invalidate(self.id)
+        if not row:
+            return False
+            
+        # Refresh item from the returned row
+        for name, value in zip(self.COLUMNS, row):
+            setattr(self, name, value)
+        return True
         
     def delete(self) -> bool:
         """
@@ -158,6 +642,7 @@ class Item:
         # Delete item
         query = "DELETE FROM items WHERE id = ?"
         execute_query(query, (self.id,))
+        self.invalidate(self.id)
         
         return True
         
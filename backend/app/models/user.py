@@ -1,14 +1,47 @@
 """
 User model.
 """
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from backend.app.db import execute_query
-from backend.app.utils import hash_password, verify_password, logger
+from backend.app.db import (
+    execute_query,
+    iter_query,
+    bulk_insert,
+    in_transaction,
+    on_commit,
+    get_generations,
+    Generation,
+    get_row_count
+)
+from backend.app.models.item import Item
+from backend.app.utils import logger, SettingsCache, get_password_pool
 
 class User:
     """User model."""
     
+    # Columns in row order; instances store exactly these attributes
+    COLUMNS = (
+        "id",
+        "username",
+        "email",
+        "password_hash",
+        "is_active",
+        "is_admin",
+        "created_at",
+        "updated_at",
+    )
+    __slots__ = COLUMNS
+    
+    # Column lists matching COLUMNS, for raw row queries and writes
+    SELECT = f"SELECT {', '.join(COLUMNS)} FROM users"
+    RETURNING = f"RETURNING {', '.join(COLUMNS)}"
+    
+    # Read-through cache of user row tuples by ID
+    cache = SettingsCache("users", "user_cache_size", "user_cache_ttl")
+    
+    # Username/email to ID, resolved through the row cache
+    key_cache = SettingsCache("user_keys", "user_cache_size", "user_cache_ttl")
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -29,6 +62,51 @@ class User:
         self.created_at = created_at
         self.updated_at = updated_at
         
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "User":
+        """
+        Build a user from a row in ``COLUMNS`` order.
+        
+        Args:
+            row: Row tuple
+            
+        Returns:
+            User: User
+        """
+        return cls.from_rows((row,))[0]
+        
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> List["User"]:
+        """
+        Build users from rows in ``COLUMNS`` order.
+        
+        Attributes are assigned straight from the row tuples, without the
+        intermediate dict and keyword-argument call of ``cls(**row)``.
+        
+        Args:
+            rows: Row tuples
+            
+        Returns:
+            List[User]: Users
+        """
+        new = object.__new__
+        users = []
+        append = users.append
+        for row in rows:
+            user = new(cls)
+            (
+                user.id,
+                user.username,
+                user.email,
+                user.password_hash,
+                user.is_active,
+                user.is_admin,
+                user.created_at,
+                user.updated_at,
+            ) = row
+            append(user)
+        return users
+        
     @classmethod
     def get_by_id(cls, user_id: int) -> Optional["User"]:
         """
@@ -40,12 +118,7 @@ class User:
         Returns:
             Optional[User]: User if found, None otherwise
         """
-        query = "SELECT * FROM users WHERE id = ?"
-        result = execute_query(query, (user_id,), fetch_one=True)
-        
-        if result:
-            return cls(**result)
-        return None
+        return cls._get_by_unique("id", user_id)
         
     @classmethod
     def get_by_username(cls, username: str) -> Optional["User"]:
@@ -58,12 +131,7 @@ class User:
         Returns:
             Optional[User]: User if found, None otherwise
         """
-        query = "SELECT * FROM users WHERE username = ?"
-        result = execute_query(query, (username,), fetch_one=True)
-        
-        if result:
-            return cls(**result)
-        return None
+        return cls._get_by_unique("username", username)
         
     @classmethod
     def get_by_email(cls, email: str) -> Optional["User"]:
@@ -76,12 +144,103 @@ class User:
         Returns:
             Optional[User]: User if found, None otherwise
         """
-        query = "SELECT * FROM users WHERE email = ?"
-        result = execute_query(query, (email,), fetch_one=True)
+        return cls._get_by_unique("email", email)
+        
+    @classmethod
+    def _get_by_unique(cls, field: str, value: Any) -> Optional["User"]:
+        """
+        Get a user by a unique column, reading through the cache.
+        
+        Args:
+            field: Column name (``id``, ``username`` or ``email``)
+            value: Column value
+            
+        Returns:
+            Optional[User]: User if found, None otherwise
+        """
+        # A transaction must see its own writes, which the cache may not
+        cached = not in_transaction()
+        if field == "id":
+            user_id = value
+        else:
+            user_id = cls.key_cache.get((field, value)) if cached else None
+            
+        row = None
+        generation = None
+        if cached and user_id is not None:
+            generation = get_generations().get("users", user_id)
+            entry = cls.cache.get(user_id)
+            if entry is not None and entry[0] == generation:
+                row = entry[1]
+                
+            # The alias may be stale if the user was renamed
+            if row is not None and row[cls.COLUMNS.index(field)] != value:
+                row = None
+                
+        if row is None:
+            query = f"{cls.SELECT} WHERE {field} = ?"
+            row = execute_query(query, (value,), fetch_one=True, raw=True)
+            if not row:
+                return None
+                
+            # The generation only covers the row if the alias still pointed at it
+            if cached:
+                cls._cache_row(row, generation if row[0] == user_id else None)
+                
+        return cls.from_row(row)
+        
+    @classmethod
+    def _cache_row(cls, row: Tuple[Any, ...], generation: Optional[Generation]) -> None:
+        """
+        Cache a freshly read row and its username/email aliases.
+        
+        Must not be called inside ``transaction()``, whose rows may never commit.
         
-        if result:
-            return cls(**result)
-        return None
+        Args:
+            row: Row in ``COLUMNS`` order
+            generation: Generation of the row read before the row itself, or
+                None if it was looked up by alias; then only the aliases are
+                cached, and the row is cached on the next lookup through them
+        """
+        user_id, username, email = row[0], row[1], row[2]
+        if generation is not None:
+            cls.cache.set(user_id, (generation, row))
+        cls.key_cache.set(("username", username), user_id)
+        cls.key_cache.set(("email", email), user_id)
+        
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        """
+        Drop a user from the cache of every process.
+        
+        Inside ``transaction()`` other processes are told on commit, since
+        until then they may cache the committed row again.
+        
+        Args:
+            user_id: User ID
+        """
+        cls.cache.delete(user_id)
+        on_commit(get_generations().bump, "users", user_id)
+        
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Stats for the row and key caches
+        """
+        return {"rows": cls.cache.stats(), "keys": cls.key_cache.stats()}
+        
+    @classmethod
+    def count(cls) -> int:
+        """
+        Count users, from the trigger-maintained ``table_counts`` rollup.
+        
+        Returns:
+            int: Number of users
+        """
+        return get_row_count("users")
         
     @classmethod
     def get_all(cls) -> List["User"]:
@@ -91,64 +250,177 @@ class User:
         Returns:
             List[User]: List of users
         """
-        query = "SELECT * FROM users"
-        results = execute_query(query, fetch=True)
+        rows = execute_query(cls.SELECT, fetch=True, raw=True)
+        
+        return cls.from_rows(rows)
+        
+    @classmethod
+    def iter_all(cls, batch_size: Optional[int] = None) -> Iterator["User"]:
+        """
+        Iterate over all users in ID order.
         
-        return [cls(**result) for result in results]
+        Memory use is bounded by ``batch_size`` rather than the table size.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            User: User
+        """
+        for row in cls.iter_rows(batch_size):
+            yield cls.from_row(row)
+            
+    @classmethod
+    def iter_rows(cls, batch_size: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over all users as raw rows in ``COLUMNS`` order, by ID.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator[Tuple[Any, ...]]: Row tuples
+        """
+        query = f"{cls.SELECT} ORDER BY id"
+        return iter_query(query, batch_size=batch_size, raw=True)
+        
+    @classmethod
+    def get_page(
+        cls,
+        limit: int = 50,
+        after: Optional[int] = None,
+    ) -> Tuple[List["User"], Optional[int]]:
+        """
+        Get a page of users ordered by ID.
+        
+        Args:
+            limit: Maximum number of users
+            after: Only return users with a greater ID
+            
+        Returns:
+            Tuple[List[User], Optional[int]]: (users, ID to pass as ``after`` for the
+                next page, or None on the last page)
+        """
+        query = f"{cls.SELECT} WHERE id > ? ORDER BY id LIMIT ?"
+        rows = execute_query(query, (after or 0, limit + 1), fetch=True, raw=True)
+        
+        users = cls.from_rows(rows[:limit])
+        next_after = users[-1].id if len(rows) > limit else None
+        
+        return users, next_after
         
     @classmethod
     def create(
         cls,
         username: str,
         email: str,
-        password: str,
+        password: Optional[str] = None,
         is_active: bool = True,
         is_admin: bool = False,
-    ) -> Optional["User"]:
+        password_hash: Optional[str] = None,
+    ) -> "User":
         """
         Create a new user.
         
+        Uniqueness of username and email is enforced by the table
+        constraints, so this is a single INSERT ... RETURNING statement.
+        
         Args:
             username: Username
             email: Email
             password: Password
             is_active: Whether the user is active
             is_admin: Whether the user is an admin
+            password_hash: Already hashed password, used instead of ``password``
             
         Returns:
-            Optional[User]: Created user if successful, None otherwise
-        """
-        # Check if username or email already exists
-        if cls.get_by_username(username) or cls.get_by_email(email):
-            logger.warning(f"User with username '{username}' or email '{email}' already exists")
-            return None
+            User: Created user
             
+        Raises:
+            ConstraintViolation: If the username or email already exists
+        """
         # Hash password
-        password_hash = hash_password(password)
-        
+        if password_hash is None:
+            if password is None:
+                raise ValueError("Either password or password_hash is required")
+            password_hash = get_password_pool().hash(password)
+            
         # Insert user
-        query = """
+        query = f"""
             INSERT INTO users (username, email, password_hash, is_active, is_admin)
             VALUES (?, ?, ?, ?, ?)
+            {cls.RETURNING}
         """
-        result = execute_query(
+        row = execute_query(
             query,
             (username, email, password_hash, is_active, is_admin),
+            fetch_one=True,
+            raw=True,
+        )
+        
+        # Not cached: it is read through on first use, with its generation
+        return cls.from_row(row)
+        
+    @classmethod
+    def bulk_create(
+        cls,
+        users: Iterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Create many users in a single transaction.
+        
+        Uniqueness is enforced by the table constraints: a duplicate username
+        or email rolls back the whole batch.
+        
+        Args:
+            users: User fields (``username``, ``email``, ``password`` or
+                ``password_hash``, optional ``is_active`` and ``is_admin``)
+            chunk_size: Rows per batch, defaults to the ``DB_BULK_CHUNK_SIZE`` setting
+            
+        Returns:
+            List[int]: Created user IDs, in input order
+        """
+        query = """
+            INSERT INTO users (username, email, password_hash, is_active, is_admin)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        users = list(users)
+        password_hashes = [user.get("password_hash") for user in users]
+        
+        # Hash plain-text passwords in parallel
+        plain = [i for i, password_hash in enumerate(password_hashes) if not password_hash]
+        hashes = get_password_pool().hash_many(users[i]["password"] for i in plain)
+        for i, password_hash in zip(plain, hashes):
+            password_hashes[i] = password_hash
+            
+        rows = (
+            (
+                user["username"],
+                user["email"],
+                password_hash,
+                user.get("is_active", True),
+                user.get("is_admin", False),
+            )
+            for user, password_hash in zip(users, password_hashes)
         )
         
-        if result and "id" in result:
-            return cls.get_by_id(result["id"])
-        return None
+        return bulk_insert(query, rows, chunk_size)
         
     def update(self, **kwargs: Any) -> bool:
         """
         Update the user.
         
+        ``updated_at`` is set and the new row read back in the same statement.
+        
         Args:
             **kwargs: Fields to update
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            ConstraintViolation: If the new username or email already exists
         """
         if not self.id:
             logger.warning("Cannot update user without ID")
@@ -161,8 +433,8 @@ class User:
         for key, value in kwargs.items():
             if key == "password":
                 fields.append("password_hash = ?")
-                values.append(hash_password(value))
-            elif key in ["username", "email", "is_active", "is_admin"]:
+                values.append(get_password_pool().hash(value))
+            elif key in ["username", "email", "password_hash", "is_active", "is_admin"]:
                 fields.append(f"{key} = ?")
                 values.append(value)
                 
@@ -171,17 +443,22 @@ class User:
             return False
             
         # Update user
-        query = f"UPDATE users SET {', '.join(fields)} WHERE id = ?"
+        query = f"""
+            UPDATE users SET {', '.join(fields)}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            {self.RETURNING}
+        """
         values.append(self.id)
         
-        execute_query(query, tuple(values))
-        
-        # Refresh user
-        updated_user = self.get_by_id(self.id)
-        if updated_user:
-            self.__dict__.update(updated_user.__dict__)
-            return True
-        return False
+        row = execute_query(query, tuple(values), fetch_one=True, raw=True)
+        self.invalidate(self.id)
+        if not row:
+            return False
+            
+        # Refresh user from the returned row
+        for name, value in zip(self.COLUMNS, row):
+            setattr(self, name, value)
+        return True
         
     def delete(self) -> bool:
         """
@@ -197,6 +474,11 @@ class User:
         # Delete user
         query = "DELETE FROM users WHERE id = ?"
         execute_query(query, (self.id,))
+        self.invalidate(self.id)
+        
+        # Items are removed by ON DELETE CASCADE; until a transaction commits
+        # other threads still see them, so drop cached items only then
+        on_commit(Item.invalidate_all)
         
         return True
         
@@ -213,7 +495,7 @@ class User:
         if not self.password_hash:
             return False
             
-        return verify_password(password, self.password_hash)
+        return get_password_pool().verify(password, self.password_hash)
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,412 @@
+"""
+Pre-forking HTTP server for the backend API.
+
+The parent process initializes the database once, binds the listening socket
+with ``SO_REUSEPORT`` and forks ``SERVER_WORKERS`` workers that share it. Each
+worker serves HTTP/1.1 with keep-alive on a thread per connection. Workers are
+recycled after ``SERVER_MAX_REQUESTS`` requests, and SIGTERM drains in-flight
+requests before exiting.
+
+The socket stays open in the parent, so connections queued while a worker
+recycles are picked up by the others instead of being reset, and a second
+server can bind the same port during a rolling restart.
+
+SIGHUP to the parent reloads the runtime settings in the parent and every
+worker without a restart; with ``SETTINGS_WATCH`` set, so does saving ``.env``.
+"""
+import json
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from backend.app import init_app
+from backend.app.api import api_router
+from backend.app.api.streaming import is_streaming, iter_body
+from backend.app.config import get_setting, install_reload_handler, reload_settings, watch_dotenv
+from backend.app.db import close_pool
+from backend.app.utils import logger
+from backend.app.utils.logging import stop_logging
+from backend.app.utils.metrics import mark_process_dead, reset_multiprocess_dir
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Adapts HTTP requests to ``handle_request``."""
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "MyAppBackend/1.0"
+    # Headers and body go out as separate writes; without TCP_NODELAY the body
+    # waits for the client's delayed ACK (~40ms) on every keep-alive request
+    disable_nagle_algorithm = True
+    # Largest accepted request body in bytes, set per server
+    max_body_bytes = 10 * 1024 * 1024
+    
+    def _handle(self) -> None:
+        """
+        Read the request, dispatch it and write the response.
+        """
+        response = self._read_body()
+        if isinstance(response, dict):
+            # The body may be unread, so the connection cannot be reused
+            self.close_connection = True
+        else:
+            response = api_router(self.command, self.path, self.headers, response)
+        self._send(response)
+        self.server.request_done()
+        
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+    
+    def _read_body(self) -> Any:
+        """
+        Read and decode the request body.
+        
+        Returns:
+            Any: Body text, None without a body, or an error response for a
+            bad ``Content-Length``, a body over ``max_body_bytes`` or a body
+            that is not UTF-8
+        """
+        length = (self.headers.get("Content-Length") or "0").strip()
+        if not (length.isascii() and length.isdigit()):
+            return _error_response(400, "Invalid Content-Length")
+        if int(length) > self.max_body_bytes:
+            return _error_response(413, "Request body too large")
+        if int(length) == 0:
+            return None
+            
+        try:
+            return self.rfile.read(int(length)).decode("utf-8")
+        except UnicodeDecodeError:
+            return _error_response(400, "Request body is not valid UTF-8")
+            
+    def _send(self, response: Dict[str, Any]) -> None:
+        """
+        Write a response, streaming chunked bodies when needed.
+        
+        Args:
+            response: Response data from ``handle_request``
+        """
+        status = response["status"]
+        body = response.get("body")
+        streaming = is_streaming(body)
+        chunked = streaming and self.request_version == "HTTP/1.1"
+        
+        if self.server.draining or (streaming and not chunked):
+            self.close_connection = True
+            
+        self.send_response(status)
+        self.send_header("Content-Type", response.get("content_type", "application/json"))
+        for name, value in response.get("headers", {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+            
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for chunk in iter_body(body):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            except Exception as e:
+                # Headers are already sent; all we can do is drop the connection
+                logger.exception("Error streaming response: %s", e)
+                self.close_connection = True
+            return
+            
+        if streaming:
+            self.end_headers()
+            for chunk in iter_body(body):
+                self.wfile.write(chunk)
+            return
+            
+        data = b"".join(iter_body(body))
+        if status not in (204, 304):
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data and self.command != "HEAD":
+            self.wfile.write(data)
+            
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Send access logs to the backend logger.
+        """
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+def _error_response(status: int, message: str) -> Dict[str, Any]:
+    """
+    Build a JSON error response.
+    
+    Args:
+        status: HTTP status code
+        message: Error message
+        
+    Returns:
+        Dict[str, Any]: Response data
+    """
+    return {
+        "status": status,
+        "content_type": "application/json",
+        "body": json.dumps({"error": message}),
+    }
+
+class WorkerServer(ThreadingHTTPServer):
+    """HTTP server run by a single worker process."""
+    
+    daemon_threads = False
+    block_on_close = True
+    allow_reuse_address = True
+    
+    def __init__(
+        self,
+        listen_socket: socket.socket,
+        max_requests: int = 0,
+        keepalive_timeout: float = 5.0,
+        max_body_bytes: int = RequestHandler.max_body_bytes,
+    ):
+        """
+        Create a worker server on an already listening socket.
+        
+        Args:
+            listen_socket: Socket inherited from the parent
+            max_requests: Requests served before the worker recycles, 0 for no limit
+            keepalive_timeout: Seconds an idle keep-alive connection is kept open
+            max_body_bytes: Largest accepted request body in bytes
+        """
+        self.max_requests = max_requests
+        self.draining = False
+        self.requests = 0
+        self._lock = threading.Lock()
+        
+        handler = type(
+            "Handler",
+            (RequestHandler,),
+            {"timeout": keepalive_timeout, "max_body_bytes": max_body_bytes},
+        )
+        address = listen_socket.getsockname()[:2]
+        
+        super().__init__(address, handler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listen_socket
+        self.server_address = address
+        
+    def server_close(self) -> None:
+        """
+        Wait for in-flight requests without closing the shared socket.
+        """
+        self._threads.join()
+        
+    def request_done(self) -> None:
+        """
+        Count a served request and start draining once the limit is reached.
+        """
+        with self._lock:
+            self.requests += 1
+            recycle = self.max_requests and self.requests >= self.max_requests
+            
+        if recycle and not self.draining:
+            logger.info("Worker %d recycling after %d requests", os.getpid(), self.requests)
+            self.drain()
+            
+    def drain(self) -> None:
+        """
+        Stop accepting connections and finish in-flight requests.
+        """
+        self.draining = True
+        
+        # shutdown() blocks until serve_forever() returns, so it cannot run on
+        # the serving thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+def _get_server_settings() -> Dict[str, Any]:
+    """
+    Read the server settings.
+    
+    Returns:
+        Dict[str, Any]: Server settings
+    """
+    watch_settings = str(get_setting("SETTINGS_WATCH", "false")).lower()
+    return {
+        "host": get_setting("SERVER_HOST", "0.0.0.0"),
+        "port": int(get_setting("SERVER_PORT", 5000)),
+        "workers": int(get_setting("SERVER_WORKERS") or os.cpu_count() or 1),
+        "max_requests": int(get_setting("SERVER_MAX_REQUESTS", 10000)),
+        "max_requests_jitter": int(get_setting("SERVER_MAX_REQUESTS_JITTER", 1000)),
+        "keepalive_timeout": float(get_setting("SERVER_KEEPALIVE_TIMEOUT", 5)),
+        "graceful_timeout": float(get_setting("SERVER_GRACEFUL_TIMEOUT", 30)),
+        "max_body_bytes": int(get_setting("SERVER_MAX_BODY_BYTES", 10 * 1024 * 1024)),
+        "watch_settings": watch_settings in ("1", "true", "yes"),
+    }
+
+def _create_listen_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind the listening socket shared by all workers.
+    
+    Args:
+        host: Host to listen on
+        port: Port to listen on
+        
+    Returns:
+        socket.socket: Listening socket
+    """
+    return socket.create_server(
+        (host, port),
+        backlog=int(get_setting("SERVER_BACKLOG", 1024)),
+        reuse_port=hasattr(socket, "SO_REUSEPORT"),
+    )
+
+def _run_worker(settings: Dict[str, Any], listen_socket: socket.socket) -> None:
+    """
+    Serve requests in a worker process until drained.
+    
+    Args:
+        settings: Server settings
+        listen_socket: Socket inherited from the parent
+    """
+    # Stagger recycling so workers do not all restart at once
+    max_requests = settings["max_requests"]
+    if max_requests:
+        max_requests += random.randint(0, settings["max_requests_jitter"])
+        
+    server = WorkerServer(
+        listen_socket,
+        max_requests=max_requests,
+        keepalive_timeout=settings["keepalive_timeout"],
+        max_body_bytes=settings["max_body_bytes"],
+    )
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.drain())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    install_reload_handler()
+    
+    logger.info(
+        "Worker %d listening on %s:%s", os.getpid(), settings["host"], settings["port"]
+    )
+    try:
+        server.serve_forever()
+    finally:
+        # Joins the connection threads, finishing in-flight requests
+        server.server_close()
+        logger.info("Worker %d stopped after %d requests", os.getpid(), server.requests)
+
+def _spawn_worker(settings: Dict[str, Any], listen_socket: socket.socket) -> int:
+    """
+    Fork a worker process.
+    
+    Args:
+        settings: Server settings
+        listen_socket: Socket to inherit
+        
+    Returns:
+        int: Worker PID
+    """
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            _run_worker(settings, listen_socket)
+        except Exception as e:
+            logger.exception("Worker %d crashed: %s", os.getpid(), e)
+            status = 1
+        finally:
+            # os._exit skips atexit; flush the log queue first
+            stop_logging()
+            os._exit(status)
+    return pid
+
+def serve() -> None:
+    """
+    Run the pre-forking server until SIGTERM or SIGINT.
+    """
+    # Before init_app, which may already record metrics
+    reset_multiprocess_dir()
+    init_app()
+    
+    # Connections must not be shared with forked workers
+    close_pool()
+    
+    settings = _get_server_settings()
+    
+    listen_socket = _create_listen_socket(settings["host"], settings["port"])
+    
+    stopping = False
+    reload_requested = False
+    workers: Dict[int, float] = {}
+    
+    def stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+                
+    def request_reload(*args: Any) -> None:
+        nonlocal reload_requested
+        reload_requested = True
+        
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+    
+    watcher = watch_dotenv(request_reload) if settings["watch_settings"] else None
+    
+    logger.info(
+        "Backend server starting %d workers on %s:%s",
+        settings["workers"],
+        settings["host"],
+        settings["port"],
+    )
+    for _ in range(settings["workers"]):
+        workers[_spawn_worker(settings, listen_socket)] = time.monotonic()
+        
+    deadline: Optional[float] = None
+    while workers:
+        if stopping and deadline is None:
+            deadline = time.monotonic() + settings["graceful_timeout"]
+            
+        # Reload here rather than in the handler, then pass it on; workers
+        # forked later inherit the new settings
+        if reload_requested and not stopping:
+            reload_requested = False
+            reload_settings()
+            for worker in list(workers):
+                try:
+                    os.kill(worker, signal.SIGHUP)
+                except ProcessLookupError:
+                    pass
+                    
+                    
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning("Graceful timeout reached, killing remaining workers")
+                for worker in list(workers):
+                    try:
+                        os.kill(worker, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                deadline = float("inf")
+            time.sleep(0.1)
+            continue
+            
+        started = workers.pop(pid, None)
+        mark_process_dead(pid)
+        if started is None or stopping:
+            continue
+            
+        # Replace recycled or crashed workers, backing off on crash loops
+        if os.waitstatus_to_exitcode(status) != 0:
+            logger.warning("Worker %d exited with status %d", pid, status)
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+        workers[_spawn_worker(settings, listen_socket)] = time.monotonic()
+        
+    if watcher is not None:
+        watcher.stop()
+    listen_socket.close()
+    logger.info("Backend server stopped")
+
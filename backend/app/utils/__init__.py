@@ -1,19 +1,41 @@
 """
 Utilities package initialization.
 """
-from backend.app.utils.logging import logger
+from backend.app.utils.logging import logger, configure_logging, get_log_stats, stop_logging
 from backend.app.utils.auth import (
     hash_password,
     verify_password,
     create_access_token,
-    decode_access_token
+    decode_access_token,
+    get_token_cache_stats
 )
+from backend.app.utils.cache import LRUCache, SettingsCache, get_cache_stats
+from backend.app.utils.password_pool import (
+    PasswordPool,
+    PasswordPoolFullError,
+    get_password_pool,
+    shutdown_password_pool
+)
+from backend.app.utils.metrics import metrics_enabled, render_metrics
 
 __all__ = [
     "logger",
+    "configure_logging",
+    "get_log_stats",
+    "stop_logging",
     "hash_password",
     "verify_password",
     "create_access_token",
-    "decode_access_token"
+    "decode_access_token",
+    "get_token_cache_stats",
+    "LRUCache",
+    "SettingsCache",
+    "get_cache_stats",
+    "PasswordPool",
+    "PasswordPoolFullError",
+    "get_password_pool",
+    "shutdown_password_pool",
+    "metrics_enabled",
+    "render_metrics"
 ]
 
@@ -5,17 +5,106 @@ import base64
 import hashlib
 import hmac
 import os
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, FrozenSet, Optional, Tuple
 
-import jwt
-
-from backend.app.config import get_setting
+from backend.app.config import Settings, get_settings, subscribe
+from backend.app.utils.cache import LRUCache
 from backend.app.utils.logging import logger
 
-# Get JWT settings
-JWT_SECRET = get_setting("JWT_SECRET", "dev_jwt_secret")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(get_setting("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+# Token caches, created on first use: (verified by key, malformed by key).
+# Verified tokens expire no later than their exp claim.
+_token_caches: Optional[Tuple[LRUCache, LRUCache]] = None
+_token_caches_lock = threading.Lock()
+
+# (secret, fingerprint) for the current secret. The fingerprint is part of
+# every cache key, so an entry stored by a decode that read the old secret
+# never matches once a new one is in use.
+_secret_fingerprint: Optional[Tuple[str, bytes]] = None
+_secret_lock = threading.Lock()
+
+def _get_token_caches() -> Tuple[LRUCache, LRUCache]:
+    """
+    Get the verified and invalid token caches, creating them on first use.
+    
+    Returns:
+        Tuple[LRUCache, LRUCache]: (verified token cache, invalid token cache)
+    """
+    global _token_caches
+    
+    if _token_caches is None:
+        with _token_caches_lock:
+            if _token_caches is None:
+                settings = get_settings()
+                _token_caches = (
+                    LRUCache(
+                        "jwt",
+                        maxsize=settings.jwt_cache_size,
+                        ttl=settings.jwt_cache_ttl,
+                    ),
+                    LRUCache(
+                        "jwt_invalid",
+                        maxsize=settings.jwt_negative_cache_size,
+                        ttl=settings.jwt_negative_cache_ttl,
+                    ),
+                )
+                
+    return _token_caches
+
+def _apply_cache_settings(settings: Settings, changed: FrozenSet[str]) -> None:
+    """
+    Resize the token caches after a settings reload.
+    
+    A new ``JWT_SECRET`` needs nothing here: the caches are flushed by the
+    next decode that sees it.
+    
+    Args:
+        settings: New settings
+        changed: Names of the changed fields
+    """
+    if _token_caches is None or not any(name.startswith("jwt_") for name in changed):
+        return
+        
+    token_cache, invalid_token_cache = _token_caches
+    token_cache.configure(settings.jwt_cache_size, settings.jwt_cache_ttl)
+    invalid_token_cache.configure(settings.jwt_negative_cache_size, settings.jwt_negative_cache_ttl)
+
+subscribe(_apply_cache_settings)
+
+def _get_secret_fingerprint(secret: str) -> bytes:
+    """
+    Get the cache key prefix for a secret, flushing the caches when it changes.
+    
+    Args:
+        secret: JWT secret
+        
+    Returns:
+        bytes: Fingerprint of the secret
+    """
+    global _secret_fingerprint
+    
+    current = _secret_fingerprint
+    if current is None or current[0] != secret:
+        with _secret_lock:
+            current = _secret_fingerprint
+            if current is None or current[0] != secret:
+                # Entries for the old secret can no longer match; free their space
+                for cache in _get_token_caches():
+                    cache.clear()
+                current = (secret, hashlib.sha256(secret.encode("utf-8")).digest())
+                _secret_fingerprint = current
+                
+    return current[1]
+
+def get_jwt_secret() -> str:
+    """
+    Get the current JWT signing secret.
+    
+    Returns:
+        str: JWT secret
+    """
+    return get_settings().jwt_secret
 
 def hash_password(password: str) -> str:
     """
@@ -59,13 +148,13 @@ def verify_password(password: str, password_hash: str) -> bool:
     """
     try:
         # Parse hash
-        algorithm, iterations, salt_key = password_hash.split("$", 2)
+        algorithm, salt_b64, key_b64 = password_hash.split("$", 2)
         method, hash_name, iterations = algorithm.split(":")
         iterations = int(iterations)
         
         # Decode salt and key
-        salt = base64.b64decode(salt_key.split("$")[0])
-        key = base64.b64decode(salt_key.split("$")[1])
+        salt = base64.b64decode(salt_b64)
+        key = base64.b64decode(key_b64)
         
         # Hash password
         new_key = hashlib.pbkdf2_hmac(
@@ -79,7 +168,7 @@ def verify_password(password: str, password_hash: str) -> bool:
         # Compare keys
         return hmac.compare_digest(key, new_key)
     except Exception as e:
-        logger.error(f"Password verification error: {e}")
+        logger.error("Password verification error: %s", e)
         return False
 
 def create_access_token(data: Dict, expires_delta: Optional[int] = None) -> str:
@@ -93,14 +182,17 @@ def create_access_token(data: Dict, expires_delta: Optional[int] = None) -> str:
     Returns:
         str: JWT access token
     """
+    import jwt
+    
     to_encode = data.copy()
     
     # Set expiration time
-    expire = time.time() + (expires_delta or ACCESS_TOKEN_EXPIRE_MINUTES) * 60
+    expires_minutes = expires_delta or get_settings().access_token_expire_minutes
+    expire = time.time() + expires_minutes * 60
     to_encode.update({"exp": expire})
     
     # Encode token
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm="HS256")
+    encoded_jwt = jwt.encode(to_encode, get_jwt_secret(), algorithm="HS256")
     
     return encoded_jwt
 
@@ -108,18 +200,67 @@ def decode_access_token(token: str) -> Tuple[bool, Optional[Dict], Optional[str]
     """
     Decode a JWT access token.
     
+    Verified tokens are cached until their ``exp`` claim (or the cache TTL,
+    whichever is sooner) and malformed tokens are briefly cached as invalid.
+    Cache entries are keyed by the token and the secret, and both caches are
+    flushed when the secret changes.
+    
     Args:
         token: JWT access token
         
     Returns:
         Tuple[bool, Optional[Dict], Optional[str]]: (success, payload, error)
     """
+    token_cache, invalid_token_cache = _get_token_caches()
+    secret = get_jwt_secret()
+    key = hashlib.sha256(_get_secret_fingerprint(secret) + token.encode("utf-8")).digest()
+    
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", float("inf")) > time.time():
+            return True, dict(payload), None
+        token_cache.delete(key)
+        return False, None, "Token expired"
+        
+    if invalid_token_cache.get(key) is not None:
+        return False, None, "Invalid token"
+        
+    # PyJWT is only imported once a token actually needs verifying
+    import jwt
+    
     try:
         # Decode token
-        payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-        return True, payload, None
+        payload = jwt.decode(token, secret, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         return False, None, "Token expired"
+    except jwt.InvalidSignatureError:
+        # Well-formed but not signed with this secret; only tokens that
+        # cannot be parsed at all are cached as invalid
+        return False, None, "Invalid token"
+    except jwt.DecodeError:
+        invalid_token_cache.set(key, True)
+        return False, None, "Invalid token"
     except jwt.InvalidTokenError:
         return False, None, "Invalid token"
+        
+    ttl = token_cache.ttl
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(key, dict(payload), ttl=ttl)
+        
+    return True, payload, None
+
+def get_token_cache_stats() -> Dict[str, Dict]:
+    """
+    Get statistics for the token caches.
+    
+    Returns:
+        Dict[str, Dict]: Stats for the verified and invalid token caches
+    """
+    token_cache, invalid_token_cache = _get_token_caches()
+    return {
+        "verified": token_cache.stats(),
+        "invalid": invalid_token_cache.stats(),
+    }
 
@@ -0,0 +1,222 @@
+"""
+In-process caching utilities.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple, Type
+
+from backend.app.config import Settings, get_settings, subscribe
+
+# Registry of named caches, for stats reporting
+_caches: List["LRUCache"] = []
+
+class LRUCache:
+    """Thread-safe LRU cache with per-entry expiry."""
+    
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Create a cache.
+        
+        Args:
+            name: Cache name, used in stats
+            maxsize: Maximum number of entries, 0 disables the cache
+            ttl: Default entry lifetime in seconds
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        _caches.append(self)
+        
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.maxsize > 0
+        
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            
+        Returns:
+            Any: Cached value, or ``default``
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+            self.misses += 1
+            return default
+            
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Cache a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Entry lifetime in seconds, defaults to the cache TTL
+        """
+        if not self.enabled:
+            return
+            
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+                
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a cached value.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            
+    def clear(self) -> None:
+        """
+        Remove all cached values.
+        """
+        with self._lock:
+            self._data.clear()
+            
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the maximum number of entries, evicting the oldest if needed.
+        
+        Args:
+            maxsize: Maximum number of entries, 0 disables the cache
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+                self.evictions += 1
+                
+    def configure(self, maxsize: int, ttl: float) -> None:
+        """
+        Apply new limits to the cache and the entries already in it.
+        
+        A shorter TTL also shortens the remaining lifetime of cached entries,
+        so no entry outlives the new TTL.
+        
+        Args:
+            maxsize: Maximum number of entries, 0 disables the cache
+            ttl: Default entry lifetime in seconds
+        """
+        self.resize(maxsize)
+        with self._lock:
+            shorter = ttl < self.ttl
+            self.ttl = ttl
+            if shorter:
+                expires_at = time.monotonic() + ttl
+                for key, (entry_expires_at, value) in self._data.items():
+                    if entry_expires_at > expires_at:
+                        self._data[key] = (expires_at, value)
+                        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Size and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+class SettingsCache:
+    """Class attribute holding an ``LRUCache`` sized by two settings fields."""
+    
+    def __init__(self, name: str, size_field: str, ttl_field: str):
+        """
+        Declare a cache; it is created on first access.
+        
+        Defining the class therefore reads no settings. Once created, the
+        cache is resized and given the new TTL when the settings are reloaded.
+        
+        Args:
+            name: Cache name, used in stats
+            size_field: ``Settings`` field holding the maximum number of entries
+            ttl_field: ``Settings`` field holding the entry lifetime in seconds
+        """
+        self.name = name
+        self.size_field = size_field
+        self.ttl_field = ttl_field
+        self._cache: Optional[LRUCache] = None
+        self._lock = threading.Lock()
+        
+    def __get__(self, instance: Any, owner: Type[Any]) -> LRUCache:
+        """
+        Get the cache, creating it on first use.
+        
+        Returns:
+            LRUCache: Cache
+        """
+        cache = self._cache
+        if cache is None:
+            with self._lock:
+                if self._cache is None:
+                    settings = get_settings()
+                    self._cache = LRUCache(
+                        self.name,
+                        maxsize=getattr(settings, self.size_field),
+                        ttl=getattr(settings, self.ttl_field),
+                    )
+                    subscribe(self._apply_settings)
+                cache = self._cache
+                
+        return cache
+        
+    def _apply_settings(self, settings: Settings, changed: FrozenSet[str]) -> None:
+        """
+        Resize the cache after a settings reload.
+        
+        Args:
+            settings: New settings
+            changed: Names of the changed fields
+        """
+        if self._cache is not None and changed & {self.size_field, self.ttl_field}:
+            self._cache.configure(
+                getattr(settings, self.size_field),
+                getattr(settings, self.ttl_field),
+            )
+
+def get_cache_stats() -> List[Dict[str, Any]]:
+    """
+    Get statistics for every cache.
+    
+    Returns:
+        List[Dict[str, Any]]: Stats per cache
+    """
+    return [cache.stats() for cache in _caches]
+
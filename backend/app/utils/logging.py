@@ -1,39 +1,405 @@
 """
 Logging utilities.
+
+The ``backend`` logger does not write anything on the calling thread: records
+go onto a bounded in-memory queue and a background listener thread formats
+and writes them to the console and log file. Messages logged with
+``%``-style arguments (``logger.info("user %s", user_id)``) are formatted by
+the listener, so a request only pays for creating the record. When the queue
+is full, records are dropped and counted instead of blocking the request.
+
+Optional features:
+- ``LOG_JSON``: one JSON object per line instead of ``LOG_FORMAT``
+- ``LOG_ROTATION``: ``size`` (``LOG_MAX_BYTES``) or ``time`` (``LOG_ROTATE_WHEN``)
+  rotation of ``LOG_FILE``, keeping ``LOG_BACKUP_COUNT`` files
+- ``LOG_SAMPLE_RATES``: per-level sampling, e.g. ``DEBUG=0.01,INFO=0.1``
+
+Nothing is set up at import: settings are read and the log directory, file
+and listener thread are created by ``configure_logging``, which runs on the
+first record logged if the application has not called it already.
 """
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
-from pathlib import Path
+import threading
+import time
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from backend.app.config import get_setting
+from backend.app.config import Settings, get_setting, get_settings, subscribe
 
-# Get log settings
-LOG_LEVEL = get_setting("LOG_LEVEL", "INFO")
-LOG_FORMAT = get_setting("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-LOG_FILE = get_setting("LOG_FILE", "logs/backend.log")
+# Default LOG_FORMAT
+DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-# Create logger
-logger = logging.getLogger("backend")
-logger.setLevel(getattr(logging, LOG_LEVEL))
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_FIELDS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
 
-# Create console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(getattr(logging, LOG_LEVEL))
-console_formatter = logging.Formatter(LOG_FORMAT)
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record.
+        
+        Fields passed with ``extra=`` are included as top-level keys.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            str: JSON object
+        """
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in N records per message at sampled levels.
+    
+    Records are counted per (level, message template), so a rare message is
+    still logged the first time it occurs even while a noisy one at the same
+    level is thinned out. Counts are approximate under concurrency.
+    """
+    
+    def __init__(self, rates: Dict[int, float], max_templates: int = 10000):
+        """
+        Create a filter.
+        
+        Args:
+            rates: Fraction of records to keep, by level number; 0 drops the level
+            max_templates: Distinct messages tracked before the counts are reset
+        """
+        super().__init__()
+        self._every = {
+            level: round(1 / rate) if rate > 0 else 0
+            for level, rate in rates.items()
+            if rate < 1
+        }
+        self._counts: Dict[Tuple[int, Any], int] = {}
+        self._max_templates = max_templates
+        self.sampled_out = 0
+        
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether to keep a record.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            bool: True to keep the record
+        """
+        every = self._every.get(record.levelno)
+        if every is None:
+            return True
+            
+        key = (record.levelno, record.msg)
+        count = self._counts.get(key, 0)
+        if count == 0 and len(self._counts) >= self._max_templates:
+            self._counts.clear()
+        self._counts[key] = count + 1
+        
+        if every and count % every == 0:
+            return True
+        self.sampled_out += 1
+        return False
 
-# Create file handler
-if LOG_FILE:
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that defers formatting and never waits for queue space."""
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Pass the record through unformatted.
+        
+        The queue never leaves the process, so nothing needs pickling and the
+        listener does the formatting. Arguments are therefore rendered after
+        the call returns; log immutable values.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            logging.LogRecord: The same record
+        """
+        return record
+        
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Queue a record, dropping it if the queue is full.
+        
+        Args:
+            record: Log record
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _Listener(QueueListener):
+    """Queue listener that can always be stopped."""
+    
+    def enqueue_sentinel(self) -> None:
+        """
+        Wait for queue space for the stop sentinel, which must not be dropped.
+        """
+        try:
+            self.queue.put(self._sentinel, timeout=5)
+        except queue.Full:
+            pass
+
+# Queue handlers and their listeners, restarted in forked children
+_listeners: List[Tuple[NonBlockingQueueHandler, QueueListener]] = []
+_listeners_lock = threading.Lock()
+
+def attach_queued_handlers(
+    target: logging.Logger,
+    handlers: List[logging.Handler],
+    queue_size: Optional[int] = None,
+) -> NonBlockingQueueHandler:
+    """
+    Attach handlers to a logger through a queue and a listener thread.
+    
+    Args:
+        target: Logger to attach to
+        handlers: Handlers run by the listener thread
+        queue_size: Maximum number of pending records, defaults to ``LOG_QUEUE_SIZE``
+        
+    Returns:
+        NonBlockingQueueHandler: Handler added to the logger
+    """
+    if queue_size is None:
+        queue_size = int(get_setting("LOG_QUEUE_SIZE", 10000))
+        
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    listener = _Listener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    with _listeners_lock:
+        _listeners.append((queue_handler, listener))
+    target.addHandler(queue_handler)
+    return queue_handler
+
+def _restart_listeners() -> None:
+    """
+    Give a forked child fresh queues and listener threads.
+    
+    Threads do not survive ``fork``; without this, a worker's records would
+    pile up in a queue nobody reads.
+    """
+    global _listeners_lock
+    
+    _listeners_lock = threading.Lock()
+    for index, (queue_handler, listener) in enumerate(_listeners):
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(queue_handler.queue.maxsize)
+        queue_handler.queue = log_queue
+        restarted = _Listener(log_queue, *listener.handlers, respect_handler_level=True)
+        restarted.start()
+        _listeners[index] = (queue_handler, restarted)
+
+def stop_logging() -> None:
+    """
+    Flush pending records and stop the listener threads.
+    """
+    with _listeners_lock:
+        for _, listener in _listeners:
+            listener.stop()
+        _listeners.clear()
+
+def get_log_stats() -> Dict[str, int]:
+    """
+    Get logging queue statistics.
+    
+    Returns:
+        Dict[str, int]: Records pending, dropped on a full queue, and sampled out
+    """
+    with _listeners_lock:
+        return {
+            "pending": sum(handler.queue.qsize() for handler, _ in _listeners),
+            "dropped": sum(handler.dropped for handler, _ in _listeners),
+            "sampled_out": sampling_filter.sampled_out if sampling_filter else 0,
+        }
+
+def parse_sample_rates(spec: str) -> Dict[int, float]:
+    """
+    Parse ``LOG_SAMPLE_RATES``.
+    
+    Args:
+        spec: Comma-separated ``LEVEL=rate`` pairs, e.g. ``DEBUG=0.01,INFO=0.1``
+        
+    Returns:
+        Dict[int, float]: Rate by level number
+        
+    Raises:
+        ValueError: If a level or rate is invalid
+    """
+    rates = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        level, _, rate = part.partition("=")
+        levelno = logging.getLevelName(level.strip().upper())
+        if not isinstance(levelno, int):
+            raise ValueError(f"Unknown log level in LOG_SAMPLE_RATES: {level}")
+        rates[levelno] = float(rate)
+        if not 0 <= rates[levelno] <= 1:
+            raise ValueError(f"Sample rate must be between 0 and 1: {part}")
+    return rates
+
+def _file_handler(path: str) -> logging.Handler:
+    """
+    Create the log file handler for ``LOG_ROTATION``.
+    
+    Args:
+        path: Log file path
+        
+    Returns:
+        logging.Handler: File handler
+    """
     # Ensure log directory exists
-    log_dir = os.path.dirname(LOG_FILE)
+    log_dir = os.path.dirname(path)
     if log_dir:
         os.makedirs(log_dir, exist_ok=True)
         
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setLevel(getattr(logging, LOG_LEVEL))
-    file_formatter = logging.Formatter(LOG_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    rotation = get_setting("LOG_ROTATION", "none").lower()
+    backup_count = int(get_setting("LOG_BACKUP_COUNT", 5))
+    if rotation == "size":
+        max_bytes = int(get_setting("LOG_MAX_BYTES", 10485760))
+        return RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    if rotation == "time":
+        when = get_setting("LOG_ROTATE_WHEN", "midnight")
+        return TimedRotatingFileHandler(path, when=when, backupCount=backup_count)
+    if rotation != "none":
+        raise ValueError(f"Unknown LOG_ROTATION: {rotation}")
+    return logging.FileHandler(path)
+
+class _DeferredHandler(logging.Handler):
+    """Placeholder that configures logging when the first record arrives."""
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        """
+        Configure logging, then pass the record to the real handlers.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            bool: True if the record passed the configured level
+        """
+        configure_logging()
+        if not logging.getLogger(record.name).isEnabledFor(record.levelno):
+            return False
+        return queue_handler.handle(record)
+
+# Create logger. Until it is configured, the level lets every record reach
+# the placeholder handler, which then applies LOG_LEVEL.
+logger = logging.getLogger("backend")
+logger.setLevel(logging.DEBUG)
+_deferred_handler = _DeferredHandler()
+logger.addHandler(_deferred_handler)
+
+# Set by configure_logging
+formatter: Optional[logging.Formatter] = None
+console_handler: Optional[logging.Handler] = None
+file_handler: Optional[logging.Handler] = None
+handlers: List[logging.Handler] = []
+queue_handler: Optional[NonBlockingQueueHandler] = None
+sampling_filter: Optional[SamplingFilter] = None
+_configured = False
+_configure_lock = threading.RLock()
+
+def configure_logging() -> None:
+    """
+    Create the log handlers and start the listener thread.
+    
+    Safe to call more than once; only the first call has any effect.
+    """
+    global formatter, console_handler, file_handler, queue_handler, sampling_filter, _configured
+    
+    if _configured:
+        return
+        
+    with _configure_lock:
+        if _configured:
+            return
+            
+        level = get_settings().log_level
+        log_file = get_setting("LOG_FILE", "logs/backend.log")
+        sample_rates = get_setting("LOG_SAMPLE_RATES", "")
+        
+        if str(get_setting("LOG_JSON", "false")).lower() in ("1", "true", "yes"):
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(get_setting("LOG_FORMAT", DEFAULT_LOG_FORMAT))
+            
+        # Create console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(level)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+        
+        # Create file handler
+        if log_file:
+            file_handler = _file_handler(log_file)
+            file_handler.setLevel(level)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+            
+        # Sampling runs before records are queued
+        if sample_rates:
+            sampling_filter = SamplingFilter(parse_sample_rates(sample_rates))
+            
+        # Route everything through the queue
+        logger.removeHandler(_deferred_handler)
+        logger.setLevel(level)
+        queue_handler = attach_queued_handlers(logger, handlers)
+        if sampling_filter is not None:
+            queue_handler.addFilter(sampling_filter)
+            
+        _configured = True
+
+def _apply_log_level(settings: Settings, changed: FrozenSet[str]) -> None:
+    """
+    Apply a reloaded ``LOG_LEVEL``.
+    
+    Args:
+        settings: New settings
+        changed: Names of the changed fields
+    """
+    # Before configure_logging, there is nothing to change; it reads the new level
+    if "log_level" not in changed or not _configured:
+        return
+        
+    for target in (logger, console_handler, file_handler):
+        if target is not None:
+            target.setLevel(settings.log_level)
+
+subscribe(_apply_log_level)
+os.register_at_fork(after_in_child=_restart_listeners)
+atexit.register(stop_logging)
 
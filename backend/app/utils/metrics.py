@@ -0,0 +1,119 @@
+"""
+Prometheus metrics support.
+
+Metrics are optional: they are recorded only when ``METRICS_ENABLED`` is set
+and ``prometheus_client`` is installed. Instrumented code asks for its
+metric objects once and gets ``None`` when metrics are off, so the disabled
+path costs a single ``None`` check. ``prometheus_client`` itself is only
+imported once something needs it.
+"""
+import os
+from types import ModuleType
+from typing import Optional, Tuple
+
+from backend.app.config import get_setting
+from backend.app.utils.logging import logger
+
+# Resolved once per process
+_enabled: Optional[bool] = None
+_prometheus_client: Optional[ModuleType] = None
+_imported = False
+
+def get_prometheus_client() -> Optional[ModuleType]:
+    """
+    Import ``prometheus_client`` on first use.
+    
+    Returns:
+        Optional[ModuleType]: The module, or None if it is not installed
+    """
+    global _prometheus_client, _imported
+    
+    if not _imported:
+        try:
+            import prometheus_client
+        except ImportError:
+            prometheus_client = None
+        _prometheus_client = prometheus_client
+        _imported = True
+        
+    return _prometheus_client
+
+def metrics_enabled() -> bool:
+    """
+    Check whether metrics should be recorded.
+    
+    Returns:
+        bool: True if ``METRICS_ENABLED`` is set and ``prometheus_client`` is installed
+    """
+    global _enabled
+    
+    if _enabled is None:
+        requested = str(get_setting("METRICS_ENABLED", "false")).lower() in ("1", "true", "yes")
+        installed = requested and get_prometheus_client() is not None
+        if requested and not installed:
+            logger.warning("METRICS_ENABLED is set but prometheus_client is not installed")
+        _enabled = installed
+        
+    return _enabled
+
+def _multiprocess_dir() -> Optional[str]:
+    """
+    Get the directory shared by worker processes for metric samples.
+    
+    Returns:
+        Optional[str]: ``PROMETHEUS_MULTIPROC_DIR``, or None in single-process mode
+    """
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+def reset_multiprocess_dir() -> None:
+    """
+    Remove samples left over from a previous run of the server.
+    """
+    directory = _multiprocess_dir()
+    if not directory or get_prometheus_client() is None:
+        return
+        
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Drop a dead worker's live gauges from the aggregated metrics.
+    
+    Args:
+        pid: Worker process ID
+    """
+    if _multiprocess_dir() and get_prometheus_client() is not None:
+        from prometheus_client import multiprocess
+        
+        multiprocess.mark_process_dead(pid)
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all registered metrics in the Prometheus text format.
+    
+    With ``PROMETHEUS_MULTIPROC_DIR`` set, samples written by every worker
+    process are aggregated.
+    
+    Returns:
+        Tuple[bytes, str]: (exposition body, content type)
+        
+    Raises:
+        RuntimeError: If ``prometheus_client`` is not installed
+    """
+    prometheus_client = get_prometheus_client()
+    if prometheus_client is None:
+        raise RuntimeError("prometheus_client is not installed")
+        
+    if _multiprocess_dir():
+        from prometheus_client import multiprocess
+        
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+        
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
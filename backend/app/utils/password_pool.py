@@ -0,0 +1,240 @@
+"""
+Worker pool for password hashing and verification.
+
+PBKDF2 runs for tens of milliseconds per call. Running it on a dedicated pool
+keeps it off the request path and spreads it across cores: OpenSSL's PBKDF2
+releases the GIL, so threads scale, and a process pool is available too.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from backend.app.config import get_setting
+from backend.app.utils.auth import hash_password, verify_password
+from backend.app.utils.logging import logger
+
+# Shared pool, recreated after a fork
+_pool: Optional["PasswordPool"] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+class PasswordPoolFullError(RuntimeError):
+    """Raised when the hashing queue stays full for longer than the timeout."""
+
+class PasswordPool:
+    """Bounded pool that hashes and verifies passwords off the calling thread."""
+    
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: Optional[int] = None,
+        queue_size: int = 64,
+        timeout: float = 30.0,
+    ):
+        """
+        Create a pool.
+        
+        Args:
+            kind: ``thread`` or ``process``
+            workers: Number of workers, defaults to the CPU count
+            queue_size: Maximum number of queued or running jobs
+            timeout: Seconds to wait for a free queue slot
+        """
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        
+        if kind == "process":
+            # Imported here: it pulls in multiprocessing, which thread pools never need
+            from concurrent.futures import ProcessPoolExecutor
+            
+            self._executor: Executor = ProcessPoolExecutor(max_workers=self.workers)
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password",
+            )
+        else:
+            raise ValueError(f"Unknown password pool kind: {kind}")
+            
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies: Deque[float] = deque(maxlen=1024)
+        
+    def submit(self, fn: Callable[..., Any], *args: Any, block: bool = True) -> Future:
+        """
+        Queue a job, waiting for a free slot if the queue is full.
+        
+        Args:
+            fn: ``hash_password`` or ``verify_password``
+            *args: Arguments for ``fn``
+            block: Wait up to the timeout for a slot, rather than failing at once
+            
+        Returns:
+            Future: Job result
+            
+        Raises:
+            PasswordPoolFullError: If no slot is free
+        """
+        acquired = (
+            self._slots.acquire(timeout=self.timeout) if block
+            else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            if block:
+                with self._lock:
+                    self._rejected += 1
+            raise PasswordPoolFullError(f"Password pool queue full ({self.queue_size} jobs)")
+            
+        started = time.monotonic()
+        with self._lock:
+            self._pending += 1
+            
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._finish(started)
+            raise
+            
+        future.add_done_callback(lambda _: self._finish(started))
+        return future
+        
+    def _finish(self, started: float) -> None:
+        """
+        Release a queue slot and record the job latency.
+        
+        Args:
+            started: Monotonic time the job was queued
+        """
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._latencies.append(time.monotonic() - started)
+        self._slots.release()
+        
+    def hash(self, password: str) -> str:
+        """
+        Hash a password on the pool.
+        
+        Args:
+            password: Password to hash
+            
+        Returns:
+            str: Hashed password
+        """
+        return self.submit(hash_password, password).result()
+        
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Verify a password on the pool.
+        
+        Args:
+            password: Password to verify
+            password_hash: Hashed password
+            
+        Returns:
+            bool: True if password matches hash, False otherwise
+        """
+        return self.submit(verify_password, password, password_hash).result()
+        
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """
+        Hash several passwords in parallel.
+        
+        Args:
+            passwords: Passwords to hash
+            
+        Returns:
+            List[str]: Hashed passwords, in input order
+        """
+        futures = [self.submit(hash_password, password) for password in passwords]
+        return [future.result() for future in futures]
+        
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers.
+        
+        Args:
+            wait: Whether to wait for queued jobs to finish
+        """
+        self._executor.shutdown(wait=wait)
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and latency statistics.
+        
+        Returns:
+            Dict[str, Any]: Pool statistics; latencies are in seconds
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            pending = self._pending
+            completed = self._completed
+            rejected = self._rejected
+            
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+            
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": max(pending - self.workers, 0),
+            "in_flight": pending,
+            "completed": completed,
+            "rejected": rejected,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "latency_p99": percentile(0.99),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+def get_password_pool() -> PasswordPool:
+    """
+    Get the shared password pool, creating it on first use in this process.
+    
+    Returns:
+        PasswordPool: Password pool
+    """
+    global _pool, _pool_pid
+    
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                workers = get_setting("PASSWORD_POOL_WORKERS")
+                _pool = PasswordPool(
+                    kind=get_setting("PASSWORD_POOL_KIND", "thread"),
+                    workers=int(workers) if workers else None,
+                    queue_size=int(get_setting("PASSWORD_POOL_QUEUE_SIZE", 64)),
+                    timeout=float(get_setting("PASSWORD_POOL_TIMEOUT", 30)),
+                )
+                _pool_pid = pid
+                logger.info(
+                    "Password pool started: %s, %d workers", _pool.kind, _pool.workers
+                )
+    return _pool
+
+def shutdown_password_pool(wait: bool = True) -> None:
+    """
+    Stop the shared password pool.
+    
+    Args:
+        wait: Whether to wait for queued jobs to finish
+    """
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=wait)
+        _pool = None
+
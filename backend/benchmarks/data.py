@@ -0,0 +1,246 @@
+"""
+Deterministic synthetic dataset for benchmarks.
+
+The same scale and seed always produce the same users and items, including
+their timestamps, so results from different runs and machines are
+comparable. Scales are named by item count; there is one user per ten items.
+
+Populate a scratch database with
+``DATABASE_URL=sqlite:////tmp/bench.db python -m backend.benchmarks.data 100k``.
+"""
+import base64
+import hashlib
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from backend.app import init_app
+from backend.app.db import bulk_insert, execute_query
+
+# Item counts per named scale
+SCALES = {
+    "1k": 1000,
+    "100k": 100000,
+    "1m": 1000000,
+}
+
+# Items per user
+ITEMS_PER_USER = 10
+
+# Password of every generated user
+PASSWORD = "benchmark-password"
+
+# Timestamps fall in the year before this date
+EPOCH = datetime(2024, 6, 30)
+
+# Vocabulary for names and descriptions
+WORDS = (
+    "alpha amber anchor apple arch arrow atlas aurora autumn badge bamboo banner basil beacon "
+    "berry birch blaze bloom bolt breeze brick bridge bronze brook cabin cactus canal candle "
+    "canyon carbon cedar chalk cherry cider citrus clay cliff clover cobalt comet copper coral "
+    "cotton crane crater crystal cypress dawn delta desert drift dune eagle echo ember falcon "
+    "fern field flint forest fossil frost garnet glacier granite grove harbor hazel heron "
+    "hollow horizon indigo iris island ivory jade jasper juniper kelp lagoon lantern laurel "
+    "lemon lichen linen lotus maple marble meadow mesa mint mist moss nectar nova oak ocean "
+    "olive onyx orchid pebble pepper pine plum prairie quartz rain raven reed ridge river "
+    "robin saffron sage sand shadow shore silver slate spruce stone storm summit thistle "
+    "thunder tide timber topaz tulip tundra valley velvet violet willow winter zephyr"
+).split()
+
+def resolve_scale(scale: str) -> int:
+    """
+    Get the item count for a named scale.
+    
+    Args:
+        scale: ``1k``, ``100k`` or ``1m``, or an explicit item count
+        
+    Returns:
+        int: Number of items
+        
+    Raises:
+        ValueError: If the scale is unknown
+    """
+    if scale.lower() in SCALES:
+        return SCALES[scale.lower()]
+    if scale.isdigit() and int(scale) > 0:
+        return int(scale)
+    raise ValueError(f"Unknown scale: {scale} (expected one of {', '.join(SCALES)})")
+
+def password_hash(seed: int = 0) -> str:
+    """
+    Hash ``PASSWORD`` with a salt derived from the seed.
+    
+    Produces the same format as ``hash_password``, so ``verify_password``
+    accepts it, but without a random salt.
+    
+    Args:
+        seed: Dataset seed
+        
+    Returns:
+        str: Password hash
+    """
+    salt = hashlib.sha256(f"benchmark-salt-{seed}".encode("utf-8")).digest()[:16]
+    iterations = 100000
+    key = hashlib.pbkdf2_hmac("sha256", PASSWORD.encode("utf-8"), salt, iterations, dklen=32)
+    salt_b64 = base64.b64encode(salt).decode("utf-8")
+    key_b64 = base64.b64encode(key).decode("utf-8")
+    return f"pbkdf2:sha256:{iterations}${salt_b64}${key_b64}"
+
+def _timestamp(rng: random.Random) -> str:
+    """
+    Draw a timestamp from the year before ``EPOCH``.
+    
+    Args:
+        rng: Random source
+        
+    Returns:
+        str: Timestamp in SQLite's ``CURRENT_TIMESTAMP`` format
+    """
+    moment = EPOCH - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+def generate_users(count: int, seed: int = 0) -> Iterator[Tuple[Any, ...]]:
+    """
+    Generate user rows.
+    
+    Args:
+        count: Number of users
+        seed: Dataset seed
+        
+    Yields:
+        Tuple: (username, email, password_hash, is_active, is_admin, created_at, updated_at)
+    """
+    rng = random.Random(f"users-{seed}")
+    hashed = password_hash(seed)
+    for i in range(count):
+        created_at = _timestamp(rng)
+        username = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{i}"
+        yield (
+            username,
+            f"{username}@example.com",
+            hashed,
+            rng.random() >= 0.05,
+            i % 1000 == 0,
+            created_at,
+            created_at,
+        )
+
+def generate_items(
+    count: int,
+    user_ids: Sequence[int],
+    seed: int = 0,
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Generate item rows.
+    
+    Owners are skewed: a quarter of the users own about half of the items.
+    
+    Args:
+        count: Number of items
+        user_ids: IDs of the owning users
+        seed: Dataset seed
+        
+    Yields:
+        Tuple: (name, description, user_id, created_at, updated_at)
+    """
+    rng = random.Random(f"items-{seed}")
+    heavy = user_ids[:max(len(user_ids) // 4, 1)]
+    for _ in range(count):
+        owners = heavy if rng.random() < 0.5 else user_ids
+        created_at = _timestamp(rng)
+        yield (
+            " ".join(rng.sample(WORDS, rng.randint(1, 3))).capitalize(),
+            " ".join(rng.choices(WORDS, k=rng.randint(5, 25))),
+            rng.choice(owners),
+            created_at,
+            created_at,
+        )
+
+def populate(items: int, seed: int = 0) -> Dict[str, int]:
+    """
+    Populate an empty database with the dataset for ``items`` items.
+    
+    A database that already holds exactly this dataset's row counts is left
+    as is, so repeated benchmark runs reuse it.
+    
+    Args:
+        items: Number of items
+        seed: Dataset seed
+        
+    Returns:
+        Dict[str, int]: Row counts (``users``, ``items``)
+        
+    Raises:
+        ValueError: If the database holds other data
+    """
+    users = max(items // ITEMS_PER_USER, 1)
+    counts = row_counts()
+    if counts == {"users": users, "items": items}:
+        return counts
+    if counts["users"] or counts["items"]:
+        raise ValueError(
+            f"Database already holds {counts['users']} users and {counts['items']} items; "
+            "point DATABASE_URL at an empty database"
+        )
+        
+    user_ids = bulk_insert(
+        """
+            INSERT INTO users
+                (username, email, password_hash, is_active, is_admin, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        generate_users(users, seed),
+    )
+    bulk_insert(
+        """
+            INSERT INTO items (name, description, user_id, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+        generate_items(items, user_ids, seed),
+    )
+    return row_counts()
+
+def row_counts() -> Dict[str, int]:
+    """
+    Count users and items.
+    
+    Returns:
+        Dict[str, int]: Row counts (``users``, ``items``)
+    """
+    return {
+        table: execute_query(f"SELECT COUNT(*) FROM {table}", fetch_one=True, raw=True)[0]
+        for table in ("users", "items")
+    }
+
+def main(argv: List[str]) -> int:
+    """
+    Populate the database named by ``DATABASE_URL``.
+    
+    Args:
+        argv: ``[scale, [seed]]``
+        
+    Returns:
+        int: Exit status
+    """
+    if not 1 <= len(argv) <= 2:
+        print(f"usage: python -m backend.benchmarks.data {{{'|'.join(SCALES)}|N}} [seed]")
+        return 2
+        
+    init_app()
+    start = time.perf_counter()
+    try:
+        counts = populate(resolve_scale(argv[0]), int(argv[1]) if len(argv) > 1 else 0)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"{counts['users']} users, {counts['items']} items "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
@@ -0,0 +1,169 @@
+"""
+Import-time budget check.
+
+Each target module is imported in a fresh interpreter, and the check fails
+if the import is slower than its budget. Wall-clock budgets depend on the
+machine, so this is a tool to run by hand rather than part of the tests;
+``tests/test_imports.py`` checks that imports do no setup work.
+
+    python -m backend.benchmarks.imports
+
+The fastest of ``--repeat`` imports is compared with the budget, and a
+``-X importtime`` breakdown is printed for targets over budget. The run
+exits with status 1 on any failure.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Import budget in milliseconds, by module
+BUDGETS = {
+    "backend.app": 75.0,
+    "backend.app.models": 100.0,
+    "backend.app.api": 100.0,
+}
+
+# Repository root, so the child interpreter can import the backend package
+ROOT = Path(__file__).resolve().parents[2]
+
+# Runs in the child interpreter: python -c PROBE module
+PROBE = """
+import sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+print((time.perf_counter() - start) * 1000)
+"""
+
+def _child_env(scratch: str) -> Dict[str, str]:
+    """
+    Build the environment for a child interpreter.
+    
+    Every path the backend could write to points into the scratch directory.
+    
+    Args:
+        scratch: Scratch directory
+        
+    Returns:
+        Dict[str, str]: Environment variables
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(ROOT), env.get("PYTHONPATH"))))
+    env["DATABASE_URL"] = f"sqlite:///{scratch}/data/app.db"
+    env["LOG_FILE"] = os.path.join(scratch, "logs", "backend.log")
+    env["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(scratch, "prometheus")
+    return env
+
+def probe(module: str) -> float:
+    """
+    Import a module in a fresh interpreter.
+    
+    Args:
+        module: Module name
+        
+    Returns:
+        float: Import time in milliseconds
+        
+    Raises:
+        RuntimeError: If the import fails
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE, module],
+            cwd=scratch,
+            env=_child_env(scratch),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+        return float(result.stdout.splitlines()[-1])
+
+def import_profile(module: str, limit: int = 15) -> List[str]:
+    """
+    Get the slowest imports under a module from ``-X importtime``.
+    
+    Args:
+        module: Module name
+        limit: Number of lines
+        
+    Returns:
+        List[str]: ``-X importtime`` lines, slowest cumulative time first
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=scratch,
+            env=_child_env(scratch),
+            capture_output=True,
+            text=True,
+        )
+        
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")]
+    
+    def cumulative(line: str) -> int:
+        field = line.split("|")[1].strip()
+        return int(field) if field.isdigit() else 0
+        
+    return sorted(lines, key=cumulative, reverse=True)[:limit]
+
+def check(module: str, budget_ms: float, repeat: int = 5) -> List[str]:
+    """
+    Check a module's import time.
+    
+    Args:
+        module: Module name
+        budget_ms: Import time budget in milliseconds
+        repeat: Number of fresh imports; the fastest is compared with the budget
+        
+    Returns:
+        List[str]: Failures, empty if the module passed
+    """
+    fastest = min(probe(module) for _ in range(max(repeat, 1)))
+    failures = []
+    
+    if fastest > budget_ms:
+        failures.append(f"import took {fastest:.1f} ms (budget {budget_ms:.0f} ms)")
+        
+    status = "FAIL" if failures else "ok"
+    print(f"{module:<30} {fastest:8.1f} ms  budget {budget_ms:6.0f} ms  {status}")
+    for failure in failures:
+        print(f"    {failure}")
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the check from the command line.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        int: Exit status, 1 if any module failed
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.imports")
+    parser.add_argument("modules", nargs="*", help="modules to check (default: all budgeted)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh imports per module")
+    parser.add_argument("--factor", type=float, default=1.0, help="multiply every budget")
+    args = parser.parse_args(argv)
+    
+    failed = False
+    for module in args.modules or BUDGETS:
+        if module not in BUDGETS:
+            print(f"error: no budget for {module}", file=sys.stderr)
+            return 2
+            
+        failures = check(module, BUDGETS[module] * args.factor, args.repeat)
+        if failures:
+            for line in import_profile(module):
+                print(f"    {line}")
+        failed = failed or bool(failures)
+        
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
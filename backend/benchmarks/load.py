@@ -0,0 +1,528 @@
+"""
+Load-test harness for the API.
+
+Drives a weighted mix of requests through ``handle_request`` in-process, or
+against a running server over HTTP, from N threads or processes. Each worker
+can send requests as fast as it can (closed loop), or follow a uniform or
+Poisson arrival schedule (open loop). In open loop, latency is measured from
+the scheduled send time, so a stalled server also penalises the requests
+queued behind the stall.
+
+The report gives throughput, latency percentiles and error rates per time
+interval and for the whole run. In-process runs also record the exception
+behind each 500, e.g. ``OperationalError: database is locked``. Passing
+several concurrency levels runs one step per level, which shows where
+locking errors and latency cliffs start:
+
+    DATABASE_URL=sqlite:////tmp/bench.db API_TOKEN=bench \\
+        python -m backend.benchmarks.load --scale 100k --concurrency 1,4,16,64 \\
+        --mix get_item=80,list_items=15,create_item=3,update_item=2 --duration 10
+"""
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from backend.app import init_app
+from backend.app.config import get_setting
+from backend.app.api import routes
+from backend.app.api.pagination import encode_cursor
+from backend.app.db import close_pool, execute_query
+from backend.app.utils import logger
+from backend.app.utils import logging as app_logging
+from backend.benchmarks import data
+
+DEFAULT_MIX = "get_item=80,list_items=15,create_item=3,update_item=2"
+
+# A request: (method, path, JSON body)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+class Dataset(NamedTuple):
+    """ID ranges of the populated dataset."""
+    
+    users: int
+    items: int
+
+def _get_item(rng: random.Random, dataset: Dataset) -> Request:
+    """Fetch a random item."""
+    return "GET", f"/api/items/{rng.randint(1, dataset.items)}", None
+
+def _get_user(rng: random.Random, dataset: Dataset) -> Request:
+    """Fetch a random user."""
+    return "GET", f"/api/users/{rng.randint(1, dataset.users)}", None
+
+def _list_items(rng: random.Random, dataset: Dataset) -> Request:
+    """Fetch a page of items at a random offset."""
+    return "GET", f"/api/items?limit=50&after={encode_cursor(rng.randrange(dataset.items))}", None
+
+def _list_users(rng: random.Random, dataset: Dataset) -> Request:
+    """Fetch a page of users at a random offset."""
+    return "GET", f"/api/users?limit=50&after={encode_cursor(rng.randrange(dataset.users))}", None
+
+def _search_items(rng: random.Random, dataset: Dataset) -> Request:
+    """Search items for two random words."""
+    return "GET", f"/api/items/search?q={'+'.join(rng.sample(data.WORDS, 2))}&limit=20", None
+
+def _stats(rng: random.Random, dataset: Dataset) -> Request:
+    """Fetch the dashboard counts for a random user."""
+    return "GET", f"/api/stats?user_id={rng.randint(1, dataset.users)}", None
+
+def _create_item(rng: random.Random, dataset: Dataset) -> Request:
+    """Create an item for a random user."""
+    body = {
+        "name": "Load test item",
+        "description": " ".join(rng.choices(data.WORDS, k=10)),
+        "user_id": rng.randint(1, dataset.users),
+    }
+    return "POST", "/api/items", body
+
+def _update_item(rng: random.Random, dataset: Dataset) -> Request:
+    """Update a random item's description."""
+    body = {"description": " ".join(rng.choices(data.WORDS, k=10))}
+    return "PUT", f"/api/items/{rng.randint(1, dataset.items)}", body
+
+def _create_user(rng: random.Random, dataset: Dataset) -> Request:
+    """Create a user; includes hashing the password."""
+    name = f"load_{rng.getrandbits(64):016x}"
+    body = {"username": name, "email": f"{name}@example.com", "password": data.PASSWORD}
+    return "POST", "/api/users", body
+
+# Request builders by mix name
+OPERATIONS: Dict[str, Callable[[random.Random, Dataset], Request]] = {
+    "get_item": _get_item,
+    "get_user": _get_user,
+    "list_items": _list_items,
+    "list_users": _list_users,
+    "search_items": _search_items,
+    "stats": _stats,
+    "create_item": _create_item,
+    "update_item": _update_item,
+    "create_user": _create_user,
+}
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    """
+    Parse a request mix such as ``get_item=80,list_items=20``.
+    
+    Args:
+        mix: Comma-separated ``operation=weight`` pairs
+        
+    Returns:
+        Tuple[List[str], List[float]]: (operations, weights)
+        
+    Raises:
+        ValueError: If an operation or weight is invalid
+    """
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}")
+        names.append(name)
+        weights.append(float(weight or 1))
+    if sum(weights) <= 0:
+        raise ValueError(f"Mix has no positive weights: {mix}")
+    return names, weights
+
+class _ErrorCapture(logging.Handler):
+    """Remember the exception behind the last logged error, per thread."""
+    
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self._local = threading.local()
+        
+    def emit(self, record: logging.LogRecord) -> None:
+        """Store the error for the emitting thread."""
+        if record.exc_info and record.exc_info[1] is not None:
+            error = record.exc_info[1]
+            self._local.error = f"{type(error).__name__}: {error}"
+        else:
+            self._local.error = record.getMessage()
+            
+    def pop(self) -> Optional[str]:
+        """Take the current thread's last error."""
+        error = getattr(self._local, "error", None)
+        self._local.error = None
+        return error
+
+# Installed once per process by _in_process_sender
+_capture: Optional[_ErrorCapture] = None
+_capture_lock = threading.Lock()
+
+def _in_process_sender() -> Callable[[Request], Tuple[int, Optional[str]]]:
+    """
+    Make a sender that calls ``handle_request`` directly.
+    
+    Returns:
+        Callable[[Request], Tuple[int, Optional[str]]]: Sender returning
+            (status, error)
+    """
+    global _capture
+    
+    with _capture_lock:
+        if _capture is None:
+            _capture = _ErrorCapture()
+            logger.addHandler(_capture)
+    capture = _capture
+    headers = {"Authorization": f"Bearer {get_setting('API_TOKEN')}"}
+    
+    def send(request: Request) -> Tuple[int, Optional[str]]:
+        method, path, body = request
+        capture.pop()
+        response = routes.handle_request(
+            method, path, headers, json.dumps(body) if body is not None else None
+        )
+        if not isinstance(response["body"], (str, bytes)):
+            for _ in response["body"]:
+                pass
+        status = response["status"]
+        if status >= 500:
+            return status, capture.pop() or f"HTTP {status}"
+        return status, None
+        
+    return send
+
+def _http_sender(
+    url: str,
+    token: str,
+    timeout: float,
+) -> Callable[[Request], Tuple[int, Optional[str]]]:
+    """
+    Make a sender that uses one keep-alive HTTP connection.
+    
+    Args:
+        url: Server base URL, e.g. ``http://localhost:5000``
+        token: API token
+        timeout: Socket timeout in seconds
+        
+    Returns:
+        Callable[[Request], Tuple[int, Optional[str]]]: Sender returning
+            (status, error)
+    """
+    parts = urlsplit(url)
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    conn: List[Optional[http.client.HTTPConnection]] = [None]
+    
+    def send(request: Request) -> Tuple[int, Optional[str]]:
+        method, path, body = request
+        try:
+            if conn[0] is None:
+                conn[0] = http.client.HTTPConnection(
+                    parts.hostname, parts.port or 80, timeout=timeout
+                )
+            conn[0].request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = conn[0].getresponse()
+            response.read()
+            if response.getheader("Connection", "").lower() == "close":
+                conn[0].close()
+                conn[0] = None
+        except (OSError, http.client.HTTPException) as e:
+            if conn[0] is not None:
+                conn[0].close()
+                conn[0] = None
+            return 0, type(e).__name__
+        return response.status, f"HTTP {response.status}" if response.status >= 500 else None
+        
+    return send
+
+class WorkerConfig(NamedTuple):
+    """Settings for one load worker."""
+    
+    index: int
+    url: Optional[str]
+    token: str
+    mix: str
+    rate: float
+    arrival: str
+    start_at: float
+    duration: float
+    seed: int
+    dataset: Dataset
+    timeout: float
+
+# A completed request: (scheduled offset, latency, status, error)
+Sample = Tuple[float, float, int, Optional[str]]
+
+def run_worker(config: WorkerConfig) -> List[Sample]:
+    """
+    Send requests until the run ends.
+    
+    Args:
+        config: Worker settings
+        
+    Returns:
+        List[Sample]: Completed requests
+    """
+    if config.url:
+        send = _http_sender(config.url, config.token, config.timeout)
+    else:
+        send = _in_process_sender()
+        
+    names, weights = parse_mix(config.mix)
+    operations = [OPERATIONS[name] for name in names]
+    rng = random.Random(f"{config.seed}-{config.index}")
+    end_at = config.start_at + config.duration
+    samples: List[Sample] = []
+    
+    # Stagger uniform workers so their requests interleave
+    scheduled = config.start_at
+    if config.rate and config.arrival == "uniform":
+        scheduled += rng.random() / config.rate
+        
+    while scheduled < end_at:
+        now = time.time()
+        if config.rate:
+            if scheduled > now:
+                time.sleep(scheduled - now)
+        else:
+            scheduled = max(now, config.start_at)
+            if now < config.start_at:
+                time.sleep(config.start_at - now)
+                
+        operation = rng.choices(operations, weights)[0]
+        status, error = send(operation(rng, config.dataset))
+        samples.append((scheduled - config.start_at, time.time() - scheduled, status, error))
+        
+        if config.rate:
+            if config.arrival == "poisson":
+                scheduled += rng.expovariate(config.rate)
+            else:
+                scheduled += 1 / config.rate
+                
+    return samples
+
+def _process_init() -> None:
+    """
+    Drop the connection pool inherited from the parent process.
+    """
+    close_pool()
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    
+    Args:
+        values: Sorted values
+        q: Percentile, 0 to 100
+        
+    Returns:
+        float: Percentile, or 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+def summarize(samples: Sequence[Sample], seconds: float) -> Dict[str, Any]:
+    """
+    Summarize a set of samples.
+    
+    Args:
+        samples: Completed requests
+        seconds: Length of the period the samples cover
+        
+    Returns:
+        Dict[str, Any]: Request count, throughput, latency percentiles in
+            milliseconds, error rate and error counts
+    """
+    latencies = sorted(sample[1] * 1000 for sample in samples)
+    errors = Counter(sample[3] for sample in samples if sample[3])
+    count = len(samples)
+    return {
+        "requests": count,
+        "throughput": count / seconds if seconds else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "error_rate": sum(errors.values()) / count if count else 0.0,
+        "errors": dict(errors),
+    }
+
+def run_load(
+    concurrency: int,
+    mix: str = DEFAULT_MIX,
+    duration: float = 10.0,
+    rate: float = 0.0,
+    arrival: str = "poisson",
+    mode: str = "thread",
+    url: Optional[str] = None,
+    dataset: Optional[Dataset] = None,
+    interval: float = 1.0,
+    seed: int = 0,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Run one load step.
+    
+    Args:
+        concurrency: Number of workers
+        mix: Request mix, see ``parse_mix``
+        duration: Seconds to send requests for
+        rate: Total requests per second across workers, or 0 for closed loop
+        arrival: ``poisson`` or ``uniform`` spacing of open-loop requests
+        mode: ``thread`` or ``process`` workers
+        url: Server base URL, or None to call ``handle_request`` in-process
+        dataset: ID ranges to draw from
+        interval: Seconds per reported interval
+        seed: Seed for the request streams
+        timeout: HTTP socket timeout in seconds
+        
+    Returns:
+        Dict[str, Any]: ``{"config": ..., "summary": ..., "intervals": [...]}``
+    """
+    parse_mix(mix)
+    if arrival not in ("poisson", "uniform"):
+        raise ValueError(f"Unknown arrival process: {arrival}")
+        
+    start_at = time.time() + 0.5
+    configs = [
+        WorkerConfig(
+            index, url, get_setting("API_TOKEN") or "", mix, rate / concurrency, arrival,
+            start_at, duration, seed, dataset, timeout,
+        )
+        for index in range(concurrency)
+    ]
+    
+    executor: Executor
+    if mode == "process":
+        executor = ProcessPoolExecutor(
+            concurrency,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_process_init,
+        )
+    elif mode == "thread":
+        executor = ThreadPoolExecutor(concurrency, thread_name_prefix="load")
+    else:
+        raise ValueError(f"Unknown worker mode: {mode}")
+        
+    with executor:
+        samples = list(itertools.chain.from_iterable(executor.map(run_worker, configs)))
+        
+    elapsed = max((sample[0] + sample[1] for sample in samples), default=duration)
+    buckets: Dict[int, List[Sample]] = {}
+    for sample in samples:
+        buckets.setdefault(int(sample[0] // interval), []).append(sample)
+        
+    return {
+        "config": {
+            "concurrency": concurrency,
+            "mix": mix,
+            "duration": duration,
+            "rate": rate,
+            "arrival": arrival if rate else "closed",
+            "mode": mode,
+            "target": url or "in-process",
+        },
+        "summary": summarize(samples, elapsed),
+        "intervals": [
+            {"start": index * interval, **summarize(buckets.get(index, []), interval)}
+            for index in range(int(duration // interval) + (duration % interval > 0))
+        ],
+    }
+
+def _print_row(label: str, stats: Dict[str, Any]) -> None:
+    """
+    Print one line of the report.
+    """
+    errors = ", ".join(f"{count} {error}" for error, count in stats["errors"].items())
+    print(
+        f"{label:>8} {stats['requests']:>8} {stats['throughput']:>9.1f} "
+        f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+        f"{stats['max_ms']:>9.2f} {stats['error_rate']:>7.2%}  {errors}"
+    )
+
+def print_report(result: Dict[str, Any], intervals: bool = True) -> None:
+    """
+    Print the result of one load step.
+    
+    Args:
+        result: Output of ``run_load``
+        intervals: Print a line per interval as well as the summary
+    """
+    config = result["config"]
+    print(
+        f"\nconcurrency={config['concurrency']} mode={config['mode']} "
+        f"arrival={config['arrival']} rate={config['rate'] or '-'} target={config['target']}"
+    )
+    print(
+        f"{'t (s)':>8} {'requests':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>9} {'errors':>7}"
+    )
+    if intervals:
+        for stats in result["intervals"]:
+            _print_row(f"{stats['start']:g}", stats)
+    _print_row("total", result["summary"])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the load test from the command line.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.load")
+    parser.add_argument("--concurrency", default="8", help="workers, or a list of steps: 1,4,16")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight pairs")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--rate", type=float, default=0.0, help="total req/s (0: closed loop)")
+    parser.add_argument("--arrival", choices=("poisson", "uniform"), default="poisson")
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--url", help="server URL; in-process handle_request if omitted")
+    parser.add_argument("--scale", default="1k", help="dataset scale to populate or assume")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds per report line")
+    parser.add_argument("--seed", type=int, default=0, help="request stream seed")
+    parser.add_argument("--summary-only", action="store_true", help="skip per-interval lines")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if not get_setting("API_TOKEN"):
+        print("error: set API_TOKEN", file=sys.stderr)
+        return 2
+        
+    items = data.resolve_scale(args.scale)
+    dataset = Dataset(max(items // data.ITEMS_PER_USER, 1), items)
+    if not args.url:
+        init_app()
+        # Reuse a database grown by earlier runs, drawing IDs from what it holds
+        if data.row_counts() == {"users": 0, "items": 0}:
+            data.populate(items, args.seed)
+        dataset = Dataset(*execute_query(
+            "SELECT (SELECT MAX(id) FROM users), (SELECT MAX(id) FROM items)",
+            fetch_one=True,
+            raw=True,
+        ))
+        
+        # Errors are counted in the report; keep them off the console
+        app_logging.console_handler.setLevel(logging.CRITICAL)
+        
+    results = []
+    for concurrency in (int(step) for step in args.concurrency.split(",")):
+        result = run_load(
+            concurrency, args.mix, args.duration, args.rate, args.arrival, args.mode,
+            args.url, dataset, args.interval, args.seed,
+        )
+        print_report(result, not args.summary_only)
+        results.append(result)
+        
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
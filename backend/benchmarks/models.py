@@ -0,0 +1,173 @@
+"""
+Model loading benchmark: __slots__ models built from row tuples vs. the
+original dict-per-row ``cls(**row)`` construction.
+
+Run with ``python -m backend.benchmarks.models`` against a scratch database
+(set ``DATABASE_URL``); missing rows are seeded on first run.
+"""
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.app import init_app
+from backend.app.db import execute_query
+from backend.app.models import Item, User
+
+class LegacyItem:
+    """Item as it was before __slots__: a plain class with a ``__dict__``."""
+    
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        user_id: Optional[int] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+    ):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.user_id = user_id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+def legacy_load(limit: int) -> List[LegacyItem]:
+    """
+    Load items the way the models did before, via a dict per row.
+    
+    Args:
+        limit: Number of items
+        
+    Returns:
+        List[LegacyItem]: Items
+    """
+    results = execute_query("SELECT * FROM items ORDER BY id LIMIT ?", (limit,), fetch=True)
+    return [LegacyItem(**result) for result in results]
+
+def compact_load(limit: int) -> List[Item]:
+    """
+    Load items as __slots__ models straight from row tuples.
+    
+    Args:
+        limit: Number of items
+        
+    Returns:
+        List[Item]: Items
+    """
+    query = f"{Item.SELECT} ORDER BY id LIMIT ?"
+    return Item.from_rows(execute_query(query, (limit,), fetch=True, raw=True))
+
+def seed(count: int) -> None:
+    """
+    Make sure at least ``count`` items exist.
+    
+    Args:
+        count: Minimum number of items
+    """
+    existing = execute_query("SELECT COUNT(*) AS n FROM items", fetch_one=True)["n"]
+    if existing >= count:
+        return
+        
+    user = User.get_by_username("bench") or User.create(
+        "bench", "bench@example.com", password_hash="pbkdf2_sha256$bench$bench"
+    )
+    Item.bulk_create(
+        {"name": f"item {i}", "description": f"benchmark item {i}", "user_id": user.id}
+        for i in range(count - existing)
+    )
+
+def _measure(load: Callable[[int], List[Any]], count: int, repeat: int) -> Dict[str, float]:
+    """
+    Time a loader and measure the memory its result holds.
+    
+    Args:
+        load: Loader to measure
+        count: Items per load
+        repeat: Timed runs; the best is reported
+        
+    Returns:
+        Dict[str, float]: Best load time, bytes allocated per item (including
+            field values) and the size of the instance itself
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(count)
+        best = min(best, time.perf_counter() - start)
+        
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = load(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    return {
+        "load_ms": best * 1000,
+        "serialize_ms": _time_to_dict(items),
+        "bytes_per_item": (after - before) / max(len(items), 1),
+        "object_bytes": _object_size(items[0]) if items else 0,
+    }
+
+def _object_size(obj: Any) -> int:
+    """
+    Size of an instance plus its ``__dict__``, excluding field values.
+    
+    Args:
+        obj: Instance
+        
+    Returns:
+        int: Bytes
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def _time_to_dict(items: List[Any]) -> float:
+    """
+    Time converting items to response dicts.
+    
+    Args:
+        items: Loaded items
+        
+    Returns:
+        float: Milliseconds
+    """
+    to_dict = Item.to_dict
+    start = time.perf_counter()
+    [to_dict(item) for item in items]
+    return (time.perf_counter() - start) * 1000
+
+def run(count: int = 100000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Compare legacy and compact model loading.
+    
+    Args:
+        count: Items per load
+        repeat: Timed runs per loader
+        
+    Returns:
+        Dict[str, Dict[str, float]]: Measurements per loader
+    """
+    init_app()
+    seed(count)
+    
+    return {
+        "legacy": _measure(legacy_load, count, repeat),
+        "compact": _measure(compact_load, count, repeat),
+    }
+
+if __name__ == "__main__":
+    results = run()
+    print(
+        f"{'loader':<10} {'load (ms)':>10} {'to_dict (ms)':>13} "
+        f"{'bytes/item':>11} {'object bytes':>13}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['load_ms']:>10.1f} {result['serialize_ms']:>13.1f} "
+            f"{result['bytes_per_item']:>11.0f} {result['object_bytes']:>13}"
+        )
+
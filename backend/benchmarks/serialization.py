@@ -0,0 +1,112 @@
+"""
+Serialization benchmark: precompiled row serializers vs. ``json.dumps`` over
+``to_dict()``.
+
+Run with ``python -m backend.benchmarks.serialization``. Outputs are
+compared before timing, so a mismatch fails the run.
+"""
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from backend.app.api.serializers import item_serializer
+from backend.app.models import Item
+
+# Rows exercising escaping, non-ASCII text and NULLs
+SAMPLE_ROWS = [
+    (1, "plain", "simple description", 7, "2024-01-01 00:00:00", "2024-01-01 00:00:00"),
+    (2, 'quote " and \\ slash', None, 7, "2024-01-01 00:00:00", "2024-01-02 00:00:00"),
+    (3, "café ☃ \U0001f600", "tab\tnewline\n\x7f\x01", 8, "2024-01-03", "2024-01-03"),
+]
+
+def _rows(count: int) -> List[tuple]:
+    """
+    Build ``count`` item rows cycling through the samples.
+    
+    Args:
+        count: Number of rows
+        
+    Returns:
+        List[tuple]: Rows in ``Item.COLUMNS`` order
+    """
+    return [
+        (i,) + SAMPLE_ROWS[i % len(SAMPLE_ROWS)][1:]
+        for i in range(count)
+    ]
+
+def legacy_encode(rows: List[tuple]) -> str:
+    """
+    Encode rows the way the handlers did before, via models and ``to_dict()``.
+    
+    Args:
+        rows: Rows in ``Item.COLUMNS`` order
+        
+    Returns:
+        str: JSON array
+    """
+    return json.dumps([item.to_dict() for item in Item.from_rows(rows)])
+
+def compact_encode(rows: List[tuple]) -> str:
+    """
+    Encode rows with the precompiled serializer.
+    
+    Args:
+        rows: Rows in ``Item.COLUMNS`` order
+        
+    Returns:
+        str: JSON array
+    """
+    return item_serializer.encode_objects(Item.from_rows(rows))
+
+def stream_encode(rows: List[tuple]) -> bytes:
+    """
+    Encode rows straight from tuples, as the export endpoints do.
+    
+    Args:
+        rows: Rows in ``Item.COLUMNS`` order
+        
+    Returns:
+        bytes: JSON array
+    """
+    return b"".join(item_serializer.stream_rows(rows))
+
+def _best(encode: Callable[[List[tuple]], Any], rows: List[tuple], repeat: int) -> float:
+    """
+    Best wall time of ``repeat`` runs, in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(rows)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run(count: int = 100000, repeat: int = 5) -> Dict[str, float]:
+    """
+    Check the encoders agree, then time them.
+    
+    Args:
+        count: Rows per run
+        repeat: Timed runs per encoder
+        
+    Returns:
+        Dict[str, float]: Best time per encoder, in milliseconds
+        
+    Raises:
+        AssertionError: If the outputs differ
+    """
+    rows = _rows(count)
+    expected = legacy_encode(rows)
+    assert compact_encode(rows) == expected, "serializer output differs from json.dumps"
+    assert stream_encode(rows) == expected.encode("utf-8"), "streamed output differs"
+    
+    return {
+        "legacy": _best(legacy_encode, rows, repeat),
+        "serializer": _best(compact_encode, rows, repeat),
+        "serializer (rows)": _best(stream_encode, rows, repeat),
+    }
+
+if __name__ == "__main__":
+    for name, elapsed in run().items():
+        print(f"{name:<20} {elapsed:>10.1f} ms")
+
@@ -0,0 +1,494 @@
+"""
+Micro-benchmark suite for the data layer, models, auth helpers and routes.
+
+Each benchmark is a zero-argument callable. It is calibrated to run for at
+least ``--min-time`` per repeat, and the per-call minimum and median are
+reported. Results are written as JSON and can be compared against a saved
+baseline:
+
+    DATABASE_URL=sqlite:////tmp/bench.db API_TOKEN=bench \\
+        python -m backend.benchmarks.suite --scale 100k --output baseline.json
+    ... make a change ...
+    DATABASE_URL=sqlite:////tmp/bench.db API_TOKEN=bench \\
+        python -m backend.benchmarks.suite --scale 100k --baseline baseline.json
+
+The run exits with status 1 when a benchmark's median is slower than the
+baseline by more than ``--threshold``. The database is populated with the
+deterministic dataset from ``backend.benchmarks.data`` on first use. Write
+benchmarks delete the rows they create, so the dataset stays the same
+between runs.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from backend.app import init_app
+from backend.app.config import get_setting
+from backend.app.api import routes
+from backend.app.api.routes import handle_request
+from backend.app.db import execute_query
+from backend.app.models import Item, User
+from backend.app.utils import (
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    verify_password,
+)
+from backend.benchmarks import data
+
+# Distinct IDs cycled through by lookups, so the database cache sees a spread
+SAMPLE_SIZE = 1024
+
+# Distinct tokens for uncached decoding; larger than the default JWT cache
+TOKEN_POOL_SIZE = 8192
+
+class Benchmark(NamedTuple):
+    """A named operation to time."""
+    
+    name: str
+    fn: Callable[[], Any]
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time a callable.
+    
+    The number of calls per repeat is doubled until one repeat takes at least
+    ``min_time``.
+    
+    Args:
+        fn: Operation to time
+        min_time: Minimum seconds per repeat
+        repeat: Number of timed repeats
+        
+    Returns:
+        Dict[str, float]: Calls per repeat, and the minimum, median and mean
+            time per call in microseconds
+    """
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+        
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number * 1e6)
+        
+    return {
+        "number": number,
+        "min_us": min(timings),
+        "median_us": statistics.median(timings),
+        "mean_us": statistics.fmean(timings),
+    }
+
+def _cycle(values: List[Any]) -> Callable[[], Any]:
+    """
+    Make a callable returning ``values`` round-robin.
+    """
+    return itertools.cycle(values).__next__
+
+def _database_benchmarks(item_ids: List[int]) -> List[Benchmark]:
+    """
+    Benchmarks for ``execute_query``.
+    """
+    next_id = _cycle(item_ids)
+    by_id = f"{Item.SELECT} WHERE id = ?"
+    page = f"{Item.SELECT} WHERE id > ? ORDER BY id LIMIT 50"
+    touch = "UPDATE items SET updated_at = updated_at WHERE id = ?"
+    
+    # Scans without the full-text index and rollups, for comparison with
+    # models.item.search and models.item.count
+    like = f"{Item.SELECT} WHERE name LIKE ? OR description LIKE ? ORDER BY id LIMIT 50"
+    next_pattern = _cycle([f"%{word}%" for word in data.WORDS])
+    
+    return [
+        Benchmark(
+            "db.execute_query.select_by_id",
+            lambda: execute_query(by_id, (next_id(),), fetch_one=True, raw=True),
+        ),
+        Benchmark(
+            "db.execute_query.select_by_id_dict",
+            lambda: execute_query(by_id, (next_id(),), fetch_one=True),
+        ),
+        Benchmark(
+            "db.execute_query.page_50",
+            lambda: execute_query(page, (next_id(),), fetch=True, raw=True),
+        ),
+        Benchmark(
+            "db.execute_query.update",
+            lambda: execute_query(touch, (next_id(),)),
+        ),
+        Benchmark(
+            "db.execute_query.like_scan_50",
+            lambda: execute_query(like, (next_pattern(),) * 2, fetch=True, raw=True),
+        ),
+        Benchmark(
+            "db.execute_query.count_scan",
+            lambda: execute_query("SELECT COUNT(*) FROM items", fetch_one=True, raw=True),
+        ),
+    ]
+
+def _model_benchmarks(user_ids: List[int], item_ids: List[int]) -> List[Benchmark]:
+    """
+    Benchmarks for ``User`` and ``Item`` CRUD.
+    """
+    next_user_id = _cycle(user_ids)
+    next_item_id = _cycle(item_ids)
+    serial = itertools.count()
+    hashed = data.password_hash()
+    user = User.get_by_id(user_ids[0])
+    item = Item.get_by_id(item_ids[0])
+    usernames = _cycle([found.username for found in map(User.get_by_id, user_ids[:64])])
+    words = _cycle(list(data.WORDS))
+    
+    def user_get_by_id() -> Optional[User]:
+        user_id = next_user_id()
+        User.invalidate(user_id)
+        return User.get_by_id(user_id)
+        
+    def user_get_by_username() -> Optional[User]:
+        found = User.get_by_username(usernames())
+        User.invalidate(found.id)
+        return found
+        
+    def user_create_delete() -> None:
+        name = f"bench_{os.getpid()}_{next(serial)}"
+        User.create(name, f"{name}@example.com", password_hash=hashed).delete()
+        
+    def item_get_by_id() -> Optional[Item]:
+        item_id = next_item_id()
+        Item.invalidate(item_id)
+        return Item.get_by_id(item_id)
+        
+    def item_create_delete() -> None:
+        Item.create("benchmark item", user.id, "created by the benchmark suite").delete()
+        
+    return [
+        Benchmark("models.user.get_by_id", user_get_by_id),
+        Benchmark("models.user.get_by_id_cached", lambda: User.get_by_id(user.id)),
+        Benchmark("models.user.get_by_username", user_get_by_username),
+        Benchmark("models.user.get_page", lambda: User.get_page(50, next_user_id())),
+        Benchmark("models.user.create_delete", user_create_delete),
+        Benchmark("models.user.update", lambda: user.update(is_active=user.is_active)),
+        Benchmark("models.item.get_by_id", item_get_by_id),
+        Benchmark("models.item.get_by_id_cached", lambda: Item.get_by_id(item.id)),
+        Benchmark("models.item.get_by_user_id", lambda: Item.get_by_user_id(next_user_id())),
+        Benchmark("models.item.get_page", lambda: Item.get_page(50, next_item_id())),
+        Benchmark("models.item.count", Item.count),
+        Benchmark("models.item.count_by_user_id", lambda: Item.count_by_user_id(next_user_id())),
+        Benchmark(
+            "models.item.get_daily_counts",
+            lambda: Item.get_daily_counts("2024-06-01", "2024-06-30"),
+        ),
+        Benchmark("models.item.search", lambda: Item.search(f"{words()} {words()}", 50)),
+        Benchmark("models.item.search_prefix", lambda: Item.search(words()[:3], 50, prefix=True)),
+        Benchmark("models.item.create_delete", item_create_delete),
+        Benchmark("models.item.update", lambda: item.update(name=item.name)),
+    ]
+
+def _auth_benchmarks() -> List[Benchmark]:
+    """
+    Benchmarks for password hashing and JWT tokens.
+    """
+    hashed = data.password_hash()
+    token = create_access_token({"sub": "bench"})
+    tokens = _cycle([
+        create_access_token({"sub": f"bench-{i}"}) for i in range(TOKEN_POOL_SIZE)
+    ])
+    
+    return [
+        Benchmark("auth.hash_password", lambda: hash_password(data.PASSWORD)),
+        Benchmark("auth.verify_password", lambda: verify_password(data.PASSWORD, hashed)),
+        Benchmark("auth.create_access_token", lambda: create_access_token({"sub": "bench"})),
+        Benchmark("auth.decode_access_token_cached", lambda: decode_access_token(token)),
+        Benchmark("auth.decode_access_token", lambda: decode_access_token(tokens())),
+    ]
+
+def _route_benchmarks(user_ids: List[int], item_ids: List[int]) -> List[Benchmark]:
+    """
+    Benchmarks for ``handle_request``, one per route and method.
+    
+    Create benchmarks delete the created row through the model, and delete
+    benchmarks create the row to delete through the model; both costs are
+    included.
+    """
+    headers = {"Authorization": f"Bearer {get_setting('API_TOKEN')}"}
+    next_user_id = _cycle(user_ids)
+    next_item_id = _cycle(item_ids)
+    serial = itertools.count()
+    hashed = data.password_hash()
+    user_id = user_ids[0]
+    item_id = item_ids[0]
+    words = _cycle(list(data.WORDS))
+    
+    def request(method: str, path: str, body: Any = None) -> Dict[str, Any]:
+        response = handle_request(method, path, headers, json.dumps(body) if body else None)
+        if response["status"] >= 500:
+            raise RuntimeError(f"{method} {path} failed: {response['body']}")
+        if not isinstance(response["body"], (str, bytes)):
+            for _ in response["body"]:
+                pass
+        return response
+        
+    def new_name() -> str:
+        return f"bench_{os.getpid()}_{next(serial)}"
+        
+    def create_user() -> None:
+        name = new_name()
+        response = request(
+            "POST", "/api/users",
+            {"username": name, "email": f"{name}@example.com", "password": data.PASSWORD},
+        )
+        User.get_by_id(json.loads(response["body"])["id"]).delete()
+        
+    def delete_user() -> None:
+        name = new_name()
+        created = User.create(name, f"{name}@example.com", password_hash=hashed)
+        request("DELETE", f"/api/users/{created.id}")
+        
+    def create_item() -> None:
+        response = request("POST", "/api/items", {"name": "benchmark item", "user_id": user_id})
+        Item.get_by_id(json.loads(response["body"])["id"]).delete()
+        
+    def delete_item() -> None:
+        created = Item.create("benchmark item", user_id)
+        request("DELETE", f"/api/items/{created.id}")
+        
+    cases = {
+        ("GET", "/api/health"): lambda: request("GET", "/api/health"),
+        ("GET", "/api/metrics"): lambda: request("GET", "/api/metrics"),
+        ("GET", "/api/slow-queries"): lambda: request("GET", "/api/slow-queries"),
+        ("GET", "/api/stats"): lambda: request("GET", f"/api/stats?user_id={next_user_id()}"),
+        ("GET", "/api/users"): lambda: request("GET", "/api/users?limit=50"),
+        ("POST", "/api/users"): create_user,
+        ("GET", "/api/users/export"): lambda: request("GET", "/api/users/export"),
+        ("GET", "/api/users/{user_id:int}"): lambda: request("GET", f"/api/users/{next_user_id()}"),
+        ("PUT", "/api/users/{user_id:int}"): lambda: request(
+            "PUT", f"/api/users/{user_id}", {"is_active": True}
+        ),
+        ("DELETE", "/api/users/{user_id:int}"): delete_user,
+        ("GET", "/api/items"): lambda: request("GET", "/api/items?limit=50"),
+        ("POST", "/api/items"): create_item,
+        ("GET", "/api/items/export"): lambda: request("GET", "/api/items/export"),
+        ("GET", "/api/items/search"): lambda: request(
+            "GET", f"/api/items/search?q={words()}+{words()}&limit=50"
+        ),
+        ("GET", "/api/items/{item_id:int}"): lambda: request("GET", f"/api/items/{next_item_id()}"),
+        ("PUT", "/api/items/{item_id:int}"): lambda: request(
+            "PUT", f"/api/items/{item_id}", {"name": "benchmark item"}
+        ),
+        ("DELETE", "/api/items/{item_id:int}"): delete_item,
+        ("POST", "/api/batch"): lambda: request("POST", "/api/batch?atomic=1", [
+            {"method": "PUT", "path": f"/api/items/{next_item_id()}", "body": {"name": words()}}
+            for _ in range(10)
+        ]),
+    }
+    
+    # Keep the suite in step with the route table
+    for template, handlers in routes.ROUTES:
+        for method in handlers:
+            if (method, template) not in cases:
+                print(f"warning: no benchmark for {method} {template}", file=sys.stderr)
+                
+    return [Benchmark(f"api.{method} {template}", fn) for (method, template), fn in cases.items()]
+
+def build_benchmarks(seed: int = 0) -> List[Benchmark]:
+    """
+    Build all benchmarks against the populated database.
+    
+    Args:
+        seed: Seed for choosing the sampled IDs
+        
+    Returns:
+        List[Benchmark]: Benchmarks
+    """
+    rng = random.Random(seed)
+    user_ids = [row[0] for row in execute_query("SELECT id FROM users", fetch=True, raw=True)]
+    item_ids = [row[0] for row in execute_query("SELECT id FROM items", fetch=True, raw=True)]
+    user_ids = rng.sample(user_ids, min(SAMPLE_SIZE, len(user_ids)))
+    item_ids = rng.sample(item_ids, min(SAMPLE_SIZE, len(item_ids)))
+    
+    benchmarks = _database_benchmarks(item_ids)
+    benchmarks += _model_benchmarks(user_ids, item_ids)
+    benchmarks += _auth_benchmarks()
+    if get_setting("API_TOKEN"):
+        benchmarks += _route_benchmarks(user_ids, item_ids)
+    else:
+        print("warning: API_TOKEN is not set, skipping route benchmarks", file=sys.stderr)
+    return benchmarks
+
+def run(
+    scale: str = "1k",
+    seed: int = 0,
+    select: Optional[List[str]] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    """
+    Populate the database if needed and run the suite.
+    
+    Args:
+        scale: Dataset scale, see ``data.SCALES``
+        seed: Dataset seed
+        select: Only run benchmarks whose name contains one of these substrings
+        min_time: Minimum seconds per repeat
+        repeat: Number of timed repeats
+        
+    Returns:
+        Dict[str, Any]: ``{"meta": {...}, "results": {name: timings}}``
+    """
+    init_app()
+    counts = data.populate(data.resolve_scale(scale), seed)
+    
+    results = {}
+    for benchmark in build_benchmarks(seed):
+        if select and not any(pattern in benchmark.name for pattern in select):
+            continue
+        results[benchmark.name] = measure(benchmark.fn, min_time, repeat)
+        print(f"{benchmark.name:<45} {results[benchmark.name]['median_us']:>12.1f} us", flush=True)
+        
+    return {
+        "meta": {
+            "scale": scale,
+            "seed": seed,
+            **counts,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """
+    Compare median timings against a baseline.
+    
+    Args:
+        results: Output of ``run``
+        baseline: Output of an earlier ``run``
+        threshold: Relative slowdown counted as a regression, e.g. 0.1 for 10%
+        
+    Returns:
+        List[Dict[str, Any]]: Per benchmark: ``name``, ``baseline_us``,
+            ``current_us``, ``change`` (relative) and ``verdict``
+            (``regression``, ``improvement``, ``ok``, ``new`` or ``missing``)
+    """
+    current = results["results"]
+    previous = baseline["results"]
+    rows = []
+    
+    for name in sorted(set(current) | set(previous)):
+        if name not in previous or name not in current:
+            rows.append({
+                "name": name,
+                "baseline_us": previous.get(name, {}).get("median_us"),
+                "current_us": current.get(name, {}).get("median_us"),
+                "change": None,
+                "verdict": "new" if name not in previous else "missing",
+            })
+            continue
+            
+        before = previous[name]["median_us"]
+        after = current[name]["median_us"]
+        change = after / before - 1 if before else 0.0
+        if change > threshold:
+            verdict = "regression"
+        elif change < -threshold:
+            verdict = "improvement"
+        else:
+            verdict = "ok"
+        rows.append({
+            "name": name,
+            "baseline_us": before,
+            "current_us": after,
+            "change": change,
+            "verdict": verdict,
+        })
+        
+    return rows
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    """
+    Print a comparison table.
+    
+    Args:
+        rows: Output of ``compare``
+    """
+    print(f"{'benchmark':<45} {'baseline (us)':>14} {'current (us)':>14} {'change':>8}  verdict")
+    for row in rows:
+        baseline = f"{row['baseline_us']:.1f}" if row["baseline_us"] is not None else "-"
+        current = f"{row['current_us']:.1f}" if row["current_us"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        print(f"{row['name']:<45} {baseline:>14} {current:>14} {change:>8}  {row['verdict']}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the suite from the command line.
+    
+    Args:
+        argv: Command line arguments
+        
+    Returns:
+        int: Exit status, 1 if a regression was found
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.suite")
+    parser.add_argument("--scale", default="1k", help="dataset scale: 1k, 100k, 1m or a count")
+    parser.add_argument("--seed", type=int, default=0, help="dataset seed")
+    parser.add_argument("-k", dest="select", action="append", help="only run matching benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="regression threshold")
+    args = parser.parse_args(argv)
+    
+    results = run(args.scale, args.seed, args.select, args.min_time, args.repeat)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            
+    if not args.baseline:
+        return 0
+        
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    for key in ("scale", "seed"):
+        if baseline["meta"].get(key) != results["meta"][key]:
+            print(f"warning: baseline {key} differs: {baseline['meta'].get(key)}", file=sys.stderr)
+            
+    if args.select:
+        # Benchmarks left out by -k are not missing
+        baseline["results"] = {
+            name: timings for name, timings in baseline["results"].items()
+            if any(pattern in name for pattern in args.select)
+        }
+        
+    rows = compare(results, baseline, args.threshold)
+    print()
+    print_comparison(rows)
+    return 1 if any(row["verdict"] == "regression" for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
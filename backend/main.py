@@ -8,12 +8,9 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.app import init_app
-from backend.app.utils import logger
+from backend.app.server import serve
 
 if __name__ == "__main__":
-    # Initialize application
-    init_app()
-    
-    logger.info("Backend application started")
+    # Initialize the application and serve the API
+    serve()
 
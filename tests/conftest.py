@@ -0,0 +1,69 @@
+"""
+Shared fixtures for the backend tests.
+
+The tests run against one SQLite database in a temporary directory. The
+environment is set before the first settings read, so a developer's ``.env``
+cannot point them at a real database.
+"""
+import os
+import tempfile
+from typing import Iterator
+
+import pytest
+
+# Scratch directory for the database and logs, removed at exit
+_SCRATCH = tempfile.TemporaryDirectory(prefix="backend-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_SCRATCH.name}/app.db",
+    "LOG_FILE": os.path.join(_SCRATCH.name, "logs", "backend.log"),
+    "LOG_LEVEL": "WARNING",
+    "API_TOKEN": "test-token",
+    "JWT_SECRET": "test-secret",
+    "API_JSON_ENCODER": "stdlib",
+    "DB_SLOW_QUERY_MS": "0",
+    "METRICS_ENABLED": "false",
+})
+
+from backend.app.db import execute_query, init_db
+from backend.app.models import Item, User
+
+@pytest.fixture(scope="session")
+def schema() -> None:
+    """
+    Create the schema once per test run.
+    """
+    init_db()
+
+def _reset() -> None:
+    """
+    Delete all rows and empty the model caches.
+    """
+    # Items go with their users (ON DELETE CASCADE); the triggers keep the rollups in step
+    execute_query("DELETE FROM users")
+    for cache in (User.cache, User.key_cache, Item.cache):
+        cache.clear()
+
+@pytest.fixture
+def db(schema: None) -> Iterator[None]:
+    """
+    Give a test empty tables and empty model caches.
+    """
+    _reset()
+    yield
+    _reset()
+
+@pytest.fixture
+def user(db: None) -> User:
+    """
+    Create a user without hashing a password.
+    """
+    return User.create("alice", "alice@example.com", password_hash="not-a-hash")
+
+@pytest.fixture
+def headers() -> dict:
+    """
+    Headers authenticating with the API token.
+    """
+    return {"Authorization": "Bearer test-token"}
+
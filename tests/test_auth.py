@@ -0,0 +1,65 @@
+"""
+Tests for JWT verification and the token caches.
+"""
+from typing import Iterator
+
+import jwt
+import pytest
+
+from backend.app.config import reload_settings
+from backend.app.utils import auth
+from backend.app.utils.auth import create_access_token, decode_access_token
+
+@pytest.fixture(autouse=True)
+def token_caches(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """
+    Start with empty token caches and restore the secret afterwards.
+    """
+    for cache in auth._get_token_caches():
+        cache.clear()
+    yield
+    monkeypatch.setenv("JWT_SECRET", "test-secret")
+    reload_settings()
+
+def _set_secret(monkeypatch: pytest.MonkeyPatch, secret: str) -> None:
+    monkeypatch.setenv("JWT_SECRET", secret)
+    reload_settings()
+
+def test_cached_token_is_rejected_after_secret_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = create_access_token({"sub": "alice"})
+    assert decode_access_token(token)[0]
+    assert decode_access_token(token)[0]
+    
+    _set_secret(monkeypatch, "rotated-secret")
+    
+    assert decode_access_token(token) == (False, None, "Invalid token")
+
+def test_decode_racing_a_secret_change_caches_nothing_usable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    token = create_access_token({"sub": "alice"})
+    decode = jwt.decode
+    
+    def rotate_during_decode(*args, **kwargs) -> dict:
+        # Another thread sees the new secret while this decode uses the old one
+        monkeypatch.setattr(jwt, "decode", decode)
+        _set_secret(monkeypatch, "rotated-secret")
+        decode_access_token(create_access_token({"sub": "bob"}))
+        return decode(*args, **kwargs)
+        
+    monkeypatch.setattr(jwt, "decode", rotate_during_decode)
+    assert decode_access_token(token)[0]
+    
+    assert decode_access_token(token) == (False, None, "Invalid token")
+
+def test_bad_signature_is_not_cached() -> None:
+    token = jwt.encode({"sub": "alice"}, "another-secret", algorithm="HS256")
+    
+    assert decode_access_token(token) == (False, None, "Invalid token")
+    assert auth.get_token_cache_stats()["invalid"]["size"] == 0
+
+def test_malformed_token_is_cached() -> None:
+    assert decode_access_token("not.a.token") == (False, None, "Invalid token")
+    assert decode_access_token("not.a.token") == (False, None, "Invalid token")
+    assert auth.get_token_cache_stats()["invalid"]["size"] == 1
+
@@ -0,0 +1,74 @@
+"""
+Tests for the model caches across processes.
+"""
+import subprocess
+import sys
+import textwrap
+
+from backend.app.db import Generations
+from backend.app.models import Item, User
+
+def run_in_other_process(code: str) -> None:
+    """
+    Run code in a separate interpreter using the same database.
+    """
+    subprocess.run([sys.executable, "-c", textwrap.dedent(code)], check=True)
+
+def test_generations_are_shared_through_the_file(tmp_path) -> None:
+    path = str(tmp_path / "app.db-gen")
+    first = Generations(path, ("items",), slots=8)
+    second = Generations(path, ("items",), slots=8)
+    before = first.get("items", 3)
+    
+    second.bump("items", 3)
+    assert first.get("items", 3) != before
+    assert first.get("items", 4) == second.get("items", 4)
+    
+    other = first.get("items", 4)
+    second.bump("items")
+    assert first.get("items", 4) != other
+
+def test_item_write_in_other_process_expires_cached_row(user: User) -> None:
+    item = Item.create("one", user.id)
+    assert Item.get_by_id(item.id).name == "one"
+    assert Item.cache.get(item.id) is not None
+    
+    run_in_other_process(f"""
+        from backend.app.models import Item
+        Item.get_by_id({item.id}).update(name="two")
+    """)
+    
+    assert Item.get_by_id(item.id).name == "two"
+
+def test_user_writes_in_other_process_expire_cached_rows(user: User) -> None:
+    item = Item.create("one", user.id)
+    assert User.get_by_username("alice").id == user.id
+    assert User.get_by_username("alice").id == user.id
+    assert Item.get_by_id(item.id) is not None
+    
+    run_in_other_process(f"""
+        from backend.app.models import User
+        User.get_by_id({user.id}).update(username="carol")
+    """)
+    
+    assert User.get_by_username("alice") is None
+    assert User.get_by_id(user.id).username == "carol"
+    
+    run_in_other_process(f"""
+        from backend.app.models import User
+        User.get_by_id({user.id}).delete()
+    """)
+    
+    assert User.get_by_id(user.id) is None
+    assert Item.get_by_id(item.id) is None
+
+def test_writes_in_this_process_expire_cached_rows(user: User) -> None:
+    item = Item.create("one", user.id)
+    Item.get_by_id(item.id)
+    
+    Item.bulk_update([{"id": item.id, "name": "two"}])
+    assert Item.get_by_id(item.id).name == "two"
+    
+    Item.bulk_delete([item.id])
+    assert Item.get_by_id(item.id) is None
+
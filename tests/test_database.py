@@ -0,0 +1,145 @@
+"""
+Tests for transactions, bulk writes and constraint errors.
+"""
+import threading
+
+import pytest
+
+from backend.app.db import (
+    ConstraintViolation,
+    execute_query,
+    get_pool,
+    in_transaction,
+    on_commit,
+    transaction
+)
+from backend.app.models import Item, User
+
+def _item_names() -> list:
+    return [row["name"] for row in execute_query("SELECT name FROM items ORDER BY id", fetch=True)]
+
+def test_transaction_commits(user: User) -> None:
+    with transaction():
+        Item.create("one", user.id)
+        Item.create("two", user.id)
+        assert in_transaction()
+        
+    assert not in_transaction()
+    assert _item_names() == ["one", "two"]
+
+def test_transaction_rolls_back_on_error(user: User) -> None:
+    with pytest.raises(RuntimeError):
+        with transaction():
+            Item.create("one", user.id)
+            raise RuntimeError("boom")
+            
+    assert _item_names() == []
+
+def test_nested_transaction_rolls_back_to_savepoint(user: User) -> None:
+    with transaction():
+        Item.create("outer", user.id)
+        with pytest.raises(RuntimeError):
+            with transaction():
+                Item.create("inner", user.id)
+                raise RuntimeError("boom")
+        Item.create("after", user.id)
+        
+    assert _item_names() == ["outer", "after"]
+
+def test_bulk_create_returns_ids_across_chunks(user: User) -> None:
+    items = [{"name": f"item {i}", "user_id": user.id} for i in range(1203)]
+    ids = Item.bulk_create(items, chunk_size=100)
+    
+    assert len(ids) == 1203
+    rows = execute_query("SELECT id, name FROM items ORDER BY id", fetch=True)
+    assert [row["id"] for row in rows] == ids
+    assert [row["name"] for row in rows] == [item["name"] for item in items]
+
+def test_bulk_create_rolls_back_batch_on_duplicate(db: None) -> None:
+    users = [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+        for i in range(250)
+    ]
+    users.append({"username": "user7", "email": "other@example.com", "password_hash": "x"})
+    
+    with pytest.raises(ConstraintViolation) as error:
+        User.bulk_create(users, chunk_size=100)
+        
+    assert error.value.kind == "unique"
+    assert error.value.columns == ("username",)
+    assert User.count() == 0
+
+def test_bulk_update_requires_id(user: User) -> None:
+    item = Item.create("one", user.id)
+    
+    with pytest.raises(ValueError, match="each update requires an id"):
+        Item.bulk_update([{"id": item.id, "name": "two"}, {"name": "three"}])
+        
+    assert Item.get_by_id(item.id).name == "one"
+
+def test_unique_violation(user: User) -> None:
+    with pytest.raises(ConstraintViolation) as error:
+        User.create("bob", user.email, password_hash="x")
+        
+    assert error.value.kind == "unique"
+    assert error.value.columns == ("email",)
+
+def test_foreign_key_violation(db: None) -> None:
+    with pytest.raises(ConstraintViolation) as error:
+        Item.create("orphan", 12345)
+        
+    assert error.value.kind == "foreign key"
+
+def test_on_commit_runs_after_commit_only(db: None) -> None:
+    calls = []
+    with transaction():
+        on_commit(calls.append, "committed")
+        assert calls == []
+    assert calls == ["committed"]
+    
+    with pytest.raises(RuntimeError):
+        with transaction():
+            on_commit(calls.append, "rolled back")
+            raise RuntimeError("boom")
+    assert calls == ["committed"]
+    
+    on_commit(calls.append, "immediate")
+    assert calls == ["committed", "immediate"]
+
+def _read_in_thread(item_id: int) -> None:
+    thread = threading.Thread(target=Item.get_by_id, args=(item_id,))
+    thread.start()
+    thread.join()
+
+def test_user_delete_clears_item_cache_on_commit(user: User) -> None:
+    item = Item.create("one", user.id)
+    
+    with transaction():
+        user.delete()
+        # Still committed, so another thread caches it again until the commit
+        _read_in_thread(item.id)
+        assert Item.cache.get(item.id) is not None
+        
+    assert Item.get_by_id(item.id) is None
+
+def test_invalidate_in_transaction_drops_entry_on_commit(user: User) -> None:
+    item = Item.create("one", user.id)
+    
+    with transaction():
+        item.update(name="two")
+        assert Item.get_by_id(item.id).name == "two"
+        _read_in_thread(item.id)
+        
+    assert Item.get_by_id(item.id).name == "two"
+
+def test_open_streams_do_not_hold_pooled_connections(user: User) -> None:
+    Item.bulk_create([{"name": f"item {i}", "user_id": user.id} for i in range(3)])
+    streams = [Item.iter_rows(batch_size=1) for _ in range(get_pool().max_size + 1)]
+    for stream in streams:
+        next(stream)
+        
+    assert get_pool().stats()["in_use"] == 0
+    assert len(_item_names()) == 3
+    for stream in streams:
+        assert len(list(stream)) == 2
+
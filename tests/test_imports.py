@@ -0,0 +1,83 @@
+"""
+Tests that importing the backend packages does no setup work.
+
+Each module is imported in a fresh interpreter whose database, log and
+metrics paths point into an empty scratch directory. Reading settings,
+starting threads, creating files and loading modules that are only needed
+once a feature is used all belong in ``init_app`` or on first use.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules that are only imported when the feature that needs them is used
+DEFERRED_MODULES = ("asyncio", "jwt", "multiprocessing", "prometheus_client")
+
+# Repository root, so the child interpreter can import the backend package
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs in the child interpreter: python -c PROBE module deferred_json
+PROBE = """
+import json, sys, threading
+module, deferred = sys.argv[1], json.loads(sys.argv[2])
+threads = threading.active_count()
+__import__(module)
+from backend.app.config import config
+print(json.dumps({
+    "threads": threading.active_count() - threads,
+    "deferred": [name for name in deferred if name in sys.modules],
+    "settings_read": config._dotenv_loaded or bool(config._config),
+}))
+"""
+
+def _probe(module: str, scratch: Path) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(ROOT), env.get("PYTHONPATH"))))
+    env["DATABASE_URL"] = f"sqlite:///{scratch}/data/app.db"
+    env["LOG_FILE"] = str(scratch / "logs" / "backend.log")
+    env["PROMETHEUS_MULTIPROC_DIR"] = str(scratch / "prometheus")
+    
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, module, json.dumps(DEFERRED_MODULES)],
+        cwd=scratch,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+@pytest.fixture(scope="module", params=["backend.app", "backend.app.models", "backend.app.api"])
+def imported(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> tuple:
+    """
+    Import a module once and report what the import did.
+    """
+    scratch = tmp_path_factory.mktemp("import")
+    report = _probe(request.param, scratch)
+    report["files"] = sorted(str(path.relative_to(scratch)) for path in scratch.rglob("*"))
+    return request.param, report
+
+def test_import_reads_no_settings(imported: tuple) -> None:
+    module, report = imported
+    
+    assert not report["settings_read"], f"importing {module} read settings"
+
+def test_import_starts_no_threads(imported: tuple) -> None:
+    module, report = imported
+    
+    assert report["threads"] == 0, f"importing {module} started threads"
+
+def test_import_creates_no_files(imported: tuple) -> None:
+    module, report = imported
+    
+    assert report["files"] == [], f"importing {module} created files"
+
+def test_import_defers_optional_modules(imported: tuple) -> None:
+    module, report = imported
+    
+    assert report["deferred"] == [], f"importing {module} loaded deferred modules"
+
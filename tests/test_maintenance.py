@@ -0,0 +1,112 @@
+"""
+Tests for the trigger-maintained full-text index and rollup tables.
+"""
+from backend.app.db import (
+    check_rollups,
+    check_search_index,
+    execute_query,
+    rebuild_rollups,
+    rebuild_search_index,
+    transaction
+)
+from backend.app.models import Item, User
+
+def _populate() -> tuple:
+    alice = User.create("alice", "alice@example.com", password_hash="x")
+    bob = User.create("bob", "bob@example.com", password_hash="x")
+    items = [
+        Item.create("red widget", alice.id, "a small red widget"),
+        Item.create("blue gadget", alice.id, "gadget for a widget"),
+        Item.create("green sprocket", bob.id),
+    ]
+    return alice, bob, items
+
+def test_search_follows_inserts_updates_and_deletes(db: None) -> None:
+    alice, bob, (widget, gadget, sprocket) = _populate()
+    
+    hits, _ = Item.search("widget")
+    assert [hit.id for hit in hits] == [widget.id, gadget.id]
+    
+    widget.update(name="red thing", description="nothing to see")
+    sprocket.update(description="works with any widget")
+    gadget.delete()
+    
+    hits, _ = Item.search("widget")
+    assert [hit.id for hit in hits] == [sprocket.id]
+    assert Item.search("thing")[0][0].id == widget.id
+    assert check_search_index()
+
+def test_search_pages_with_cursor(db: None) -> None:
+    alice = User.create("alice", "alice@example.com", password_hash="x")
+    ids = Item.bulk_create([{"name": f"widget {i}", "user_id": alice.id} for i in range(7)])
+    
+    seen = []
+    cursor = None
+    while True:
+        hits, cursor = Item.search("widget", limit=3, cursor=cursor)
+        seen += [hit.id for hit in hits]
+        if cursor is None:
+            break
+            
+    assert sorted(seen) == ids
+
+def test_search_prefix(db: None) -> None:
+    _populate()
+    
+    assert Item.search("spro")[0] == []
+    assert [hit.name for hit in Item.search("spro", prefix=True)[0]] == ["green sprocket"]
+
+def test_search_snippet_is_escaped(user: User) -> None:
+    Item.create("<script>alert(1)</script> widget", user.id, 'a "quoted" & widget')
+    
+    hits, _ = Item.search("widget")
+    assert hits[0].snippet == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>widget</mark>"
+    assert hits[0].name == "<script>alert(1)</script> widget"
+
+def test_search_index_rebuild(db: None) -> None:
+    _populate()
+    rebuild_search_index()
+    
+    assert check_search_index()
+    assert len(Item.search("widget")[0]) == 2
+
+def test_rollups_follow_writes(db: None) -> None:
+    alice, bob, (widget, gadget, sprocket) = _populate()
+    
+    assert User.count() == 2
+    assert Item.count() == 3
+    assert Item.count_by_user_id(alice.id) == 2
+    
+    sprocket.update(user_id=alice.id)
+    with transaction():
+        gadget.delete()
+    bob.delete()
+    
+    assert User.count() == 1
+    assert Item.count() == 2
+    assert Item.count_by_user_id(alice.id) == 2
+    assert Item.count_by_user_id(bob.id) == 0
+    assert not any(check_rollups().values())
+
+def test_rollups_rolled_back_with_transaction(db: None) -> None:
+    alice, _, _ = _populate()
+    try:
+        with transaction():
+            Item.create("extra", alice.id)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+        
+    assert Item.count() == 3
+    assert not any(check_rollups().values())
+
+def test_rollups_detect_and_repair_drift(db: None) -> None:
+    _populate()
+    execute_query("UPDATE table_counts SET row_count = row_count + 5 WHERE name = 'items'")
+    
+    assert check_rollups()["table_counts"] == 1
+    
+    rebuild_rollups()
+    assert not any(check_rollups().values())
+    assert Item.count() == 3
+
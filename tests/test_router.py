@@ -0,0 +1,61 @@
+"""
+Tests for the compiled route table.
+"""
+import pytest
+
+from backend.app.api.router import Router
+from backend.app.api.routes import router
+
+def _handler(*args, **kwargs) -> dict:
+    return {}
+
+def test_static_route() -> None:
+    match = router.match("GET", "/api/items")
+    
+    assert match.status == 200
+    assert match.template == "/api/items"
+    assert match.params == {}
+
+def test_static_segment_wins_over_parameter() -> None:
+    assert router.match("GET", "/api/items/export").template == "/api/items/export"
+    assert router.match("GET", "/api/items/42").template == "/api/items/{item_id:int}"
+
+def test_int_parameter_is_converted() -> None:
+    match = router.match("PUT", "/api/users/42")
+    
+    assert match.status == 200
+    assert match.params == {"user_id": 42}
+
+@pytest.mark.parametrize("segment", ["abc", "-1", "4.2", "1e3", "²", "١"])
+def test_invalid_int_parameter_is_not_found(segment: str) -> None:
+    assert router.match("GET", f"/api/items/{segment}").status == 404
+
+def test_unknown_path_is_not_found() -> None:
+    assert router.match("GET", "/api/nothing").status == 404
+    assert router.match("GET", "/api/items/1/extra").status == 404
+
+def test_unsupported_method_lists_allowed_methods() -> None:
+    match = router.match("PATCH", "/api/items/1")
+    
+    assert match.status == 405
+    assert set(match.allowed) == {"GET", "PUT", "DELETE"}
+    assert router.match("DELETE", "/api/items").status == 405
+
+def test_duplicate_route_is_rejected() -> None:
+    compiled = Router()
+    compiled.add("/api/things/{thing_id:int}", {"GET": _handler})
+    
+    with pytest.raises(ValueError):
+        compiled.add("/api/things/{thing_id:int}", {"PUT": _handler})
+    with pytest.raises(ValueError):
+        compiled.add("/api/things/{other_id:int}/parts", {"GET": _handler})
+    with pytest.raises(ValueError):
+        compiled.add("/api/things/{thing_id:float}/parts", {"GET": _handler})
+
+@pytest.mark.parametrize("segment", [str(2**63), "99999999999999999999999"])
+def test_int_parameter_out_of_range_is_not_found(segment: str) -> None:
+    assert router.match("GET", f"/api/items/{segment}").status == 404
+
+def test_int_parameter_at_limit_is_converted() -> None:
+    assert router.match("GET", f"/api/items/{2**63 - 1}").params == {"item_id": 2**63 - 1}
+
@@ -0,0 +1,115 @@
+"""
+Tests for request handling and the batch endpoint.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from backend.app.api.pagination import encode_cursor
+from backend.app.api.routes import handle_request
+from backend.app.models import Item, User
+
+HEADERS = {"Authorization": "Bearer test-token"}
+
+def request(method: str, path: str, body: Any = None) -> Dict[str, Any]:
+    return handle_request(method, path, HEADERS, json.dumps(body) if body is not None else None)
+
+def body(response: Dict[str, Any]) -> Optional[Any]:
+    return json.loads(response["body"]) if response["body"] else None
+
+def test_requires_token(db: None) -> None:
+    assert handle_request("GET", "/api/items", {})["status"] == 401
+    assert handle_request("GET", "/api/items", {"Authorization": "Bearer nope"})["status"] == 401
+
+def test_not_found_and_method_not_allowed(db: None) -> None:
+    assert request("GET", "/api/items/abc")["status"] == 404
+    assert request("GET", "/api/items/²")["status"] == 404
+    
+    response = request("PATCH", "/api/items/1")
+    assert response["status"] == 405
+    assert response["headers"]["Allow"] == "GET, PUT, DELETE"
+
+def test_out_of_range_ids_are_rejected(db: None) -> None:
+    huge = "99999999999999999999999"
+    cursor = encode_cursor(2**70)
+    
+    assert request("GET", f"/api/items/{huge}")["status"] == 404
+    assert request("GET", f"/api/stats?user_id={huge}")["status"] == 400
+    assert body(request("GET", f"/api/items?after={cursor}")) == {
+        "error": f"Invalid cursor: {cursor}"
+    }
+    assert request("GET", f"/api/users?after={cursor}")["status"] == 400
+
+def test_item_round_trip(user: User) -> None:
+    created = request("POST", "/api/items", {"name": "one", "user_id": user.id})
+    assert created["status"] == 201
+    item_id = body(created)["id"]
+    
+    assert request("PUT", f"/api/items/{item_id}", {"name": "two"})["status"] == 200
+    assert body(request("GET", f"/api/items/{item_id}"))["name"] == "two"
+    assert request("DELETE", f"/api/items/{item_id}")["status"] == 204
+    assert request("GET", f"/api/items/{item_id}")["status"] == 404
+
+def test_batch_runs_operations_in_order(user: User) -> None:
+    item = Item.create("one", user.id)
+    response = request("POST", "/api/batch", [
+        {"method": "PUT", "path": f"/api/items/{item.id}", "body": {"name": "two"}},
+        {"method": "GET", "path": f"/api/items/{item.id}"},
+        {"method": "GET", "path": "/api/items/999999"},
+        {"method": "DELETE", "path": f"/api/items/{item.id}"},
+    ])
+    
+    assert response["status"] == 200
+    results = body(response)
+    assert [result["status"] for result in results] == [200, 200, 404, 204]
+    assert results[1]["body"]["name"] == "two"
+    assert results[3]["body"] is None
+    assert Item.get_by_id(item.id) is None
+
+def test_atomic_batch_commits(user: User) -> None:
+    response = request("POST", "/api/batch?atomic=1", [
+        {"method": "POST", "path": "/api/items", "body": {"name": "one", "user_id": user.id}},
+        {"method": "POST", "path": "/api/items", "body": {"name": "two", "user_id": user.id}},
+    ])
+    
+    assert response["status"] == 200
+    assert [result["status"] for result in body(response)] == [201, 201]
+    assert Item.count() == 2
+
+def test_atomic_batch_rolls_back_on_failure(user: User) -> None:
+    item = Item.create("one", user.id)
+    Item.get_by_id(item.id)
+    
+    response = request("POST", "/api/batch?atomic=1", [
+        {"method": "PUT", "path": f"/api/items/{item.id}", "body": {"name": "two"}},
+        {"method": "POST", "path": "/api/items", "body": {"name": "new", "user_id": user.id}},
+        {"method": "DELETE", "path": "/api/items/999999"},
+    ])
+    
+    assert response["status"] == 404
+    assert body(response)["index"] == 2
+    assert body(response)["result"]["status"] == 404
+    assert Item.count() == 1
+    assert Item.get_by_id(item.id).name == "one"
+    assert body(request("GET", f"/api/items/{item.id}"))["name"] == "one"
+
+def test_batch_rejects_invalid_operations(db: None) -> None:
+    invalid = [
+        {},
+        [],
+        ["GET /api/items"],
+        [{"method": "GET"}],
+        [{"method": "GET", "path": "items"}],
+        [{"method": "PUT", "path": "/api/items/1", "body": [1]}],
+        [{"method": "POST", "path": "/api/batch"}],
+        [{"method": "GET", "path": "/api/health"}] * 101,
+    ]
+    for operations in invalid:
+        assert request("POST", "/api/batch", operations)["status"] == 400, operations
+
+def test_batch_rejects_streamed_responses(db: None) -> None:
+    response = request("POST", "/api/batch", [{"method": "GET", "path": "/api/items/export"}])
+    
+    assert body(response) == [
+        {"status": 400, "body": {"error": "Streaming responses cannot be batched"}}
+    ]
+
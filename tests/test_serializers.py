@@ -0,0 +1,78 @@
+"""
+Tests for the row-to-JSON serializers.
+"""
+import json
+
+import pytest
+
+from backend.app.api.serializers import item_serializer, user_serializer
+from backend.app.config import reload_settings
+from backend.app.models import Item, User
+
+# Values that exercise the escaping and number formatting of json.dumps
+_TEXT = ["plain", "", 'quote " and \\ backslash', "tab\tnewline\n", "ünïcödé ✓", " ", "😀"]
+
+def _items() -> list:
+    return [
+        Item(id=i, name=text, description=None if i % 2 else text, user_id=7,
+             created_at="2026-01-01 00:00:00", updated_at="2026-01-02 00:00:00")
+        for i, text in enumerate(_TEXT)
+    ]
+
+def test_encode_objects_matches_json_dumps() -> None:
+    items = _items()
+    
+    assert item_serializer.encode_objects(items) == json.dumps([item.to_dict() for item in items])
+
+def test_encode_object_matches_json_dumps() -> None:
+    user = User(id=3, username="bob", email="bob@example.com", is_active=True, is_admin=0,
+                created_at="2026-01-01 00:00:00", updated_at=None)
+                
+    assert user_serializer.encode_object(user) == json.dumps(user.to_dict())
+
+def test_encode_row_matches_json_dumps() -> None:
+    for item in _items():
+        row = tuple(getattr(item, column) for column in Item.COLUMNS)
+        
+        assert item_serializer.encode_row(row) == json.dumps(item.to_dict())
+
+def test_mixed_column_types_match_json_dumps() -> None:
+    items = _items()
+    items[1].user_id = 1.5
+    items[2].user_id = None
+    items[3].user_id = float("nan")
+    
+    assert item_serializer.encode_objects(items) == json.dumps([item.to_dict() for item in items])
+
+def test_encode_page() -> None:
+    items = _items()[:2]
+    
+    assert json.loads(item_serializer.encode_page(items, "abc")) == {
+        "data": [item.to_dict() for item in items],
+        "next_cursor": "abc",
+    }
+
+def test_stream_rows_matches_json_dumps() -> None:
+    items = _items()
+    rows = [tuple(getattr(item, column) for column in Item.COLUMNS) for item in items]
+    body = b"".join(item_serializer.stream_rows(rows, batch_size=3)).decode("utf-8")
+    
+    assert body == json.dumps([item.to_dict() for item in items])
+    assert b"".join(item_serializer.stream_rows([])) == b"[]"
+
+def test_encoder_follows_settings_reload(monkeypatch: pytest.MonkeyPatch) -> None:
+    item = _items()[0]
+    assert item_serializer.encode_object(item) == json.dumps(item.to_dict())
+    
+    monkeypatch.setenv("API_JSON_ENCODER", "orjson")
+    try:
+        assert "api_json_encoder" in reload_settings()
+        assert item_serializer.encode_object(item) == json.dumps(
+            item.to_dict(), separators=(",", ":")
+        )
+    finally:
+        monkeypatch.setenv("API_JSON_ENCODER", "stdlib")
+        reload_settings()
+        
+    assert item_serializer.encode_object(item) == json.dumps(item.to_dict())
+
@@ -0,0 +1,83 @@
+"""
+Tests for request body handling in the HTTP server.
+"""
+import json
+import socket
+import threading
+from typing import Iterator, Tuple
+
+import pytest
+
+from backend.app.server import WorkerServer
+
+@pytest.fixture(scope="module")
+def server(schema: None) -> Iterator[Tuple[str, int]]:
+    """
+    Serve the API from a worker server on a free local port.
+    """
+    listen_socket = socket.create_server(("127.0.0.1", 0))
+    worker = WorkerServer(listen_socket, max_body_bytes=64)
+    thread = threading.Thread(target=worker.serve_forever)
+    thread.start()
+    yield listen_socket.getsockname()[:2]
+    worker.shutdown()
+    worker.server_close()
+    thread.join()
+    listen_socket.close()
+
+def _request(address: Tuple[str, int], head: str, body: bytes = b"") -> Tuple[int, dict, bytes]:
+    with socket.create_connection(address, timeout=5) as connection:
+        connection.sendall(head.encode("latin-1") + b"\r\n" + body)
+        response = connection.makefile("rb")
+        status = int(response.readline().split()[1])
+        headers = {}
+        for line in iter(response.readline, b"\r\n"):
+            name, value = line.decode("latin-1").split(":", 1)
+            headers[name.lower()] = value.strip()
+        return status, headers, response.read(int(headers["content-length"]))
+
+def _post(address: Tuple[str, int], length: str, body: bytes = b"") -> Tuple[int, dict, bytes]:
+    return _request(
+        address,
+        "POST /api/users HTTP/1.1\r\n"
+        "Host: localhost\r\n"
+        "Authorization: Bearer test-token\r\n"
+        f"Content-Length: {length}\r\n",
+        body,
+    )
+
+@pytest.mark.parametrize("length", ["abc", "-1", "+5", "1_0", "²"])
+def test_invalid_content_length_is_bad_request(server: Tuple[str, int], length: str) -> None:
+    status, headers, body = _post(server, length)
+    
+    assert status == 400
+    assert json.loads(body) == {"error": "Invalid Content-Length"}
+    assert headers["connection"] == "close"
+
+def test_large_body_is_rejected(server: Tuple[str, int]) -> None:
+    status, headers, body = _post(server, "65", b"x" * 65)
+    
+    assert status == 413
+    assert json.loads(body) == {"error": "Request body too large"}
+    assert headers["connection"] == "close"
+
+def test_non_utf8_body_is_bad_request(server: Tuple[str, int]) -> None:
+    status, headers, body = _post(server, "4", b"\xff\xfe{}")
+    
+    assert status == 400
+    assert json.loads(body) == {"error": "Request body is not valid UTF-8"}
+
+def test_valid_body_is_dispatched(server: Tuple[str, int], db: None) -> None:
+    data = b'{"name": "x"}'
+    status, headers, body = _request(
+        server,
+        "PUT /api/items/1 HTTP/1.1\r\n"
+        "Host: localhost\r\n"
+        "Authorization: Bearer test-token\r\n"
+        f"Content-Length: {len(data)}\r\n",
+        data,
+    )
+    
+    assert status == 404
+    assert "connection" not in headers
+